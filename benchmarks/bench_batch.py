@@ -0,0 +1,84 @@
+"""
+bench_batch.py - Vise filtriranih pogleda iz jednog kompajliranja (ras2cal.batch)
+
+Pravi po jedan pogled (JSON + HTML) za svakog nastavnika sintetickog
+rasporeda i mjeri:
+    - ranije: parsiranje, filtriranje i kompajliranje za svaki pogled
+      (kao zaseban poziv tt2cal.py sa --teacher), na uzorku pogleda
+      i procijenjeno za sve
+    - batch: jedno parsiranje i kompajliranje, pa run_batch za sve poglede
+Provjerava da oba nacina daju iste JSON fajlove za uzorak.
+
+Upotreba (iz korijena repozitorija):
+    python benchmarks/bench_batch.py [broj_linija] [uzorak] [procesa]
+"""
+import contextlib
+import filecmp
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.bench_memory import compile_model  # noqa: E402
+from benchmarks.synthetic import generate  # noqa: E402
+from ras2cal.batch import load_manifest, run_batch, write_outputs  # noqa: E402
+from ras2cal.lexer import Lexer  # noqa: E402
+from ras2cal.parser import Parser  # noqa: E402
+from ras2cal.query import AssignmentIndex, Term  # noqa: E402
+
+META = {"calendar_name": "Bench", "start": "2025-10-06", "end": "2026-01-19",
+        "holidays": []}
+MANIFEST = {"json_format": "compact",
+            "views": [{"each": "teacher", "json": "batch/{key}.json",
+                       "html": "batch/{key}"}]}
+
+
+def parse(text):
+    with contextlib.redirect_stderr(io.StringIO()):
+        return Parser(Lexer(text)).parse()
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    sample = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    jobs = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    text = generate(lines)
+
+    with tempfile.TemporaryDirectory() as root:
+        start = time.perf_counter()
+        ast = parse(text)
+        model = compile_model(ast)
+        index = AssignmentIndex(ast)
+        views = load_manifest(MANIFEST, index, root)
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_batch(views, model, index, META, "Bench", jobs)
+        batch = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for view in views[:sample]:
+            single = AssignmentIndex(parse(text)).filter(
+                Term('teacher', (('exact', view.name),)))
+            key = ''.join(view.name.split())
+            write_outputs(compile_model(single), single,
+                          {'json': os.path.join(root, 'single', f"{key}.json"),
+                           'html': os.path.join(root, 'single', key)},
+                          META, "Bench", 'compact')
+        per_view = (time.perf_counter() - start) / sample
+
+        same = all(filecmp.cmp(os.path.join(root, 'batch', f"{key}.json"),
+                               os.path.join(root, 'single', f"{key}.json"), shallow=False)
+                   for key in (''.join(v.name.split()) for v in views[:sample]))
+
+    print(f"Linija: {lines:,}, pogleda (nastavnika): {len(views)}, procesa: {jobs}")
+    print(f"  pogled po pogled:  {per_view:7.3f} s/pogled, "
+          f"~{per_view * len(views):8.1f} s za sve (uzorak {sample})")
+    print(f"  batch:             {batch:7.3f} s za sve  "
+          f"({per_view * len(views) / batch:.0f}x, "
+          f"{'isti JSON' if same else 'RAZLICIT JSON'})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+bench_columnar.py - Kolonski prikaz evenata (ras2cal.columnar)
+
+Mjeri konverziju IR -> ColumnarSchedule -> IR, memoriju po eventu u oba
+prikaza (tracemalloc) i provjerava da povratna konverzija daje iste evente.
+
+Upotreba (iz korijena repozitorija):
+    python benchmarks/bench_columnar.py [broj_linija]
+"""
+import contextlib
+import gc
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.bench_memory import compile_model, retained  # noqa: E402
+from benchmarks.synthetic import generate  # noqa: E402
+from ras2cal import columnar  # noqa: E402
+from ras2cal.columnar import ColumnarSchedule  # noqa: E402
+from ras2cal.compiler import _signature  # noqa: E402
+from ras2cal.lexer import Lexer  # noqa: E402
+from ras2cal.parser import Parser  # noqa: E402
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with contextlib.redirect_stderr(io.StringIO()):
+        ast = Parser(Lexer(generate(lines))).parse()
+
+    tracemalloc.start()
+    model, model_bytes = retained(lambda: compile_model(ast))
+    cs, cs_bytes = retained(lambda: ColumnarSchedule.from_model(model))
+    tracemalloc.stop()
+    del cs
+    gc.collect()
+
+    cs, to_columns = timed(lambda: ColumnarSchedule.from_model(model))
+    back, to_model = timed(cs.to_model)
+    _, transpose = timed(lambda: [cs.events_by(name) for name in cs.MEMBERSHIPS])
+    same = list(map(_signature, back.events)) == list(map(_signature, model.events))
+
+    n = len(model.events)
+    backend = 'numpy' if columnar.np is not None else 'array.array'
+    print(f"Linija: {lines:,}, evenata: {n:,}, backend: {backend}")
+    print(f"  IR (Event objekti): {model_bytes / n:6.0f} B/event")
+    print(f"  kolonski:           {cs_bytes / n:6.0f} B/event")
+    print(f"  IR -> kolone: {to_columns:6.3f} s, kolone -> IR: {to_model:6.3f} s, "
+          f"obrnuto clanstvo: {transpose:6.3f} s")
+    print(f"  povratna konverzija daje iste evente: {'da' if same else 'NE'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+bench_compiler.py - Linearnost kompajliranja (AST -> IR)
+
+Mjeri vrijeme ScheduleCompiler.compile() za sinteticke rasporede rastuce
+velicine. Vrijeme po iskazu nastave treba ostati priblizno konstantno
+kako ulaz raste (razrjesavanje termina i datuma su lookup-i u tablicama).
+
+Upotreba (iz korijena repozitorija):
+    python benchmarks/bench_compiler.py [broj_linija]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.bench_memory import compile_model  # noqa: E402
+from benchmarks.synthetic import generate  # noqa: E402
+from ras2cal.lexer import Lexer  # noqa: E402
+from ras2cal.parser import Parser  # noqa: E402
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print("Sinteticki raspored:")
+    for size in (lines // 8, lines // 4, lines // 2, lines):
+        with contextlib.redirect_stderr(io.StringIO()):
+            ast = Parser(Lexer(generate(size))).parse()
+        start = time.perf_counter()
+        model = compile_model(ast)
+        seconds = time.perf_counter() - start
+        n = len(model.events)
+        print(f"  {size:>9,} linija: {n:9,} evenata  {seconds:7.3f} s  "
+              f"{seconds / n * 1e6:6.2f} us/event")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+bench_conflicts.py - Detekcija konflikata (ras2cal.conflicts)
+
+Mjeri find_conflicts() po vrsti entiteta na sintetickom rasporedu rastuce
+velicine. Sinteticki raspored je nasumican, pa ima mnogo vise konflikata
+od stvarnog; vrijeme zato ukljucuje i gradjenje izvjestaja za svaki.
+
+Upotreba (iz korijena repozitorija):
+    python benchmarks/bench_conflicts.py [broj_linija]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.bench_memory import compile_model  # noqa: E402
+from benchmarks.synthetic import generate  # noqa: E402
+from ras2cal.columnar import ColumnarSchedule  # noqa: E402
+from ras2cal.conflicts import KINDS, find_conflicts  # noqa: E402
+from ras2cal.lexer import Lexer  # noqa: E402
+from ras2cal.parser import Parser  # noqa: E402
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for size in (lines // 4, lines // 2, lines):
+        with contextlib.redirect_stderr(io.StringIO()):
+            ast = Parser(Lexer(generate(size))).parse()
+        model = compile_model(ast)
+        start = time.perf_counter()
+        columns = ColumnarSchedule.from_model(model)
+        print(f"{size:,} linija, {len(model.events):,} evenata "
+              f"(kolone: {time.perf_counter() - start:.3f} s)")
+        for kind in KINDS:
+            start = time.perf_counter()
+            conflicts = find_conflicts(model, (kind,), columns)
+            seconds = time.perf_counter() - start
+            print(f"  {kind:>8}: {len(conflicts):9,} konflikata  {seconds:7.3f} s  "
+                  f"{seconds / len(model.events) * 1e6:6.2f} us/event")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+bench_grid.py - Matrica grid generatora (vrijeme -> slot, dan -> kolona)
+
+Mjeri gradjenje matrica svih nastavnika u GridGenerator-u naspram
+ranije implementacije (strptime i linearna pretraga slotova za svako
+vrijeme, days.index za dan, rjecnik (dan, slot) popunjen za svaku
+celiju), provjerava da obje daju iste celije, te mjeri cijeli -g izlaz.
+
+Upotreba (iz korijena repozitorija):
+    python benchmarks/bench_grid.py [broj_linija]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.bench_memory import compile_model  # noqa: E402
+from benchmarks.synthetic import generate  # noqa: E402
+from ras2cal.generators import GridGenerator  # noqa: E402
+from ras2cal.lexer import Lexer  # noqa: E402
+from ras2cal.parser import Parser  # noqa: E402
+
+
+# ---------------------------------------------------------------------------
+# Ranija implementacija (referenca)
+# ---------------------------------------------------------------------------
+
+def legacy_slot_index(gen, slots, time_str):
+    time = datetime.strptime(time_str, "%H:%M")
+    for idx, slot in enumerate(slots):
+        if abs((time - slot).total_seconds()) < gen.slot_duration * 60:
+            return idx
+    return -1
+
+
+def legacy_matrix(gen, slots, events):
+    matrix = {}
+    for day_idx in range(len(gen.days)):
+        for slot_idx in range(len(gen.time_slots)):
+            matrix[(day_idx, slot_idx)] = []
+    for event in events:
+        day = event['datum']
+        if day not in gen.days:
+            continue
+        day_idx = gen.days.index(day)
+        start_idx = legacy_slot_index(gen, slots, event['vrijeme_start'])
+        end_idx = legacy_slot_index(gen, slots, event['vrijeme_kraj'])
+        if start_idx == -1:
+            continue
+        end_bound = end_idx + 1 if end_idx != -1 else start_idx + 1
+        for idx in range(start_idx, min(end_bound, len(gen.time_slots))):
+            matrix[(day_idx, idx)].append(event)
+    return matrix
+
+
+# ---------------------------------------------------------------------------
+
+def by_teacher(model):
+    teachers = {}
+    for event in model.prepared().condensed_merged:
+        teachers.setdefault(event['osoba'], []).append(event)
+    return teachers
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    with contextlib.redirect_stderr(io.StringIO()):
+        ast = Parser(Lexer(generate(lines))).parse()
+    model = compile_model(ast)
+    model.base_time, model.slot_duration, model.slots_per_index = '08:00', 30, 2
+    teachers = by_teacher(model)
+    rows = sum(len(events) for events in teachers.values())
+
+    with tempfile.TemporaryDirectory() as root:
+        gen = GridGenerator(model, root)
+        slots = [datetime.strptime(s['time'], "%H:%M") for s in gen.time_slots]
+
+        start = time.perf_counter()
+        old = {t: legacy_matrix(gen, slots, events) for t, events in teachers.items()}
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        gen = GridGenerator(model, root)
+        slotting = time.perf_counter() - start
+
+        start = time.perf_counter()
+        new = {t: gen._build_schedule_matrix(events) for t, events in teachers.items()}
+        current = time.perf_counter() - start
+
+        n_days = len(gen.days)
+        for teacher, matrix in old.items():
+            for (day_idx, slot_idx), cell in matrix.items():
+                if cell != (new[teacher][slot_idx * n_days + day_idx] or []):
+                    sys.exit(f"Razlika u celiji {teacher} ({day_idx}, {slot_idx})")
+
+        start = time.perf_counter()
+        GridGenerator(model, os.path.join(root, 'grid')).generate()
+        full = time.perf_counter() - start
+
+    print(f"Linija: {lines:,}, evenata: {len(model.events):,}, "
+          f"nastavnika: {len(teachers):,}, redova: {rows:,}")
+    print(f"  slotova: {len(gen.time_slots)}, dana: {n_days}, celija po nastavniku: "
+          f"{len(gen.time_slots) * n_days}")
+    print(f"  slotovi (__init__): {slotting:6.3f} s")
+    print(f"  matrice (ranije):  {legacy:7.3f} s")
+    print(f"  matrice (sada):    {current:7.3f} s  ({legacy / current:.1f}x), iste celije")
+    print(f"  cijeli -g izlaz:   {full:7.3f} s")
+
+
+if __name__ == '__main__':
+    main()
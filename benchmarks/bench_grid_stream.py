@@ -0,0 +1,99 @@
+"""
+bench_grid_stream.py - Grid izvjestaj: upis sekcija redom i pool procesa
+
+Mjeri vrsnu memoriju (tracemalloc) grid generatora koji sekcije
+nastavnika upisuje u fajl jednu po jednu, naspram ranijeg sastavljanja
+cijelog dokumenta u jednom stringu, te vrijeme generisanja za 1..N
+procesa (izlaz mora biti isti) i sa fajlovima po nastavniku (split).
+
+Upotreba (iz korijena repozitorija):
+    python benchmarks/bench_grid_stream.py [broj_linija] [procesa]
+"""
+import contextlib
+import filecmp
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.bench_memory import compile_model  # noqa: E402
+from benchmarks.synthetic import generate  # noqa: E402
+from ras2cal.generators import GridGenerator  # noqa: E402
+from ras2cal.lexer import Lexer  # noqa: E402
+from ras2cal.parser import Parser  # noqa: E402
+
+
+def legacy_document(gen, events):
+    """Ranije: cijeli dokument kao jedan string, upisan na kraju."""
+    teachers_events = {}
+    for event in events:
+        teachers_events.setdefault(event['osoba'], []).append(event)
+    sorted_teachers = sorted(teachers_events)
+    html = gen._generate_html_header()
+    for i, teacher in enumerate(sorted_teachers):
+        matrix = gen._build_schedule_matrix(teachers_events[teacher])
+        html += gen._generate_teacher_section(teacher, matrix, i, len(sorted_teachers))
+    html += gen._generate_html_footer()
+    with open(os.path.join(gen.output_dir, 'legacy.html'), 'w', encoding='utf-8') as f:
+        f.write(html)
+
+
+def peak(func):
+    """Vrsna alocirana memorija (MB) tokom poziva."""
+    tracemalloc.start()
+    func()
+    _, top = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return top / 1e6
+
+
+def timed(model, directory, **options):
+    start = time.perf_counter()
+    GridGenerator(model, directory, **options).generate()
+    return time.perf_counter() - start
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    max_jobs = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    with contextlib.redirect_stderr(io.StringIO()):
+        ast = Parser(Lexer(generate(lines))).parse()
+    model = compile_model(ast)
+    model.base_time, model.slot_duration, model.slots_per_index = '08:00', 30, 2
+    events = model.prepared().condensed_merged
+
+    with tempfile.TemporaryDirectory() as root:
+        base = os.path.join(root, 'j1')
+        os.makedirs(base)
+        gen = GridGenerator(model, base)
+        legacy_mb = peak(lambda: legacy_document(gen, events))
+        stream_mb = peak(lambda: GridGenerator(model, base).generate())
+        size = sum(os.path.getsize(os.path.join(base, name)) for name in os.listdir(base)
+                   if name.startswith('grid_')) / 1e6
+
+        print(f"Linija: {lines:,}, evenata: {len(model.events):,}, "
+              f"nastavnika: {len({e['osoba'] for e in events}):,}, izvjestaj: {size:.1f} MB")
+        print(f"  {'vrsna memorija, cijeli dokument:':<36}{legacy_mb:7.1f} MB")
+        print(f"  {'vrsna memorija, sekcija po sekcija:':<36}{stream_mb:7.1f} MB")
+
+        reference = None
+        for jobs in range(1, max_jobs + 1):
+            directory = os.path.join(root, f"j{jobs}")
+            seconds = timed(model, directory, jobs=jobs)
+            (name,) = [n for n in os.listdir(directory) if n.startswith('grid_')]
+            if reference is None:
+                reference = os.path.join(directory, name)
+            elif not filecmp.cmp(reference, os.path.join(directory, name), shallow=False):
+                sys.exit(f"Razlicit izlaz za {jobs} procesa")
+            print(f"  {f'-J {jobs}:':<36}{seconds:7.3f} s")
+
+        seconds = timed(model, os.path.join(root, 'split'), jobs=max_jobs, split=True)
+        print(f"  {f'-J {max_jobs} --grid-split:':<36}{seconds:7.3f} s")
+
+
+if __name__ == '__main__':
+    main()
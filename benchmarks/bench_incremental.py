@@ -0,0 +1,66 @@
+"""
+bench_incremental.py - Inkrementalno kompajliranje i stabilnost UID-ova
+
+Kompajlira sinteticki raspored, zatim ubacuje jedan iskaz nastave na
+pocetak, mijenja termin jednog, brise jedan i premjesta jedan iskaz na
+kraj, pa poredi puno kompajliranje sa ScheduleCompiler.compile_incremental().
+Provjerava da oba daju iste evente (sadrzaj) i koliko UID-ova je ostalo isto.
+
+Upotreba (iz korijena repozitorija):
+    python benchmarks/bench_incremental.py [broj_linija]
+"""
+import contextlib
+import copy
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.bench_memory import compile_model  # noqa: E402
+from benchmarks.synthetic import generate  # noqa: E402
+from ras2cal.compiler import ScheduleCompiler, _signature  # noqa: E402
+from ras2cal.lexer import Lexer  # noqa: E402
+from ras2cal.parser import Parser  # noqa: E402
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with contextlib.redirect_stderr(io.StringIO()):
+        ast = Parser(Lexer(generate(lines))).parse()
+    previous = compile_model(ast)
+
+    # Cetiri izmjene: novi iskaz na pocetku, promijenjen termin, obrisan
+    # iskaz i premjesten iskaz (samo redoslijed, bez promjene u razlici)
+    assignments = ast.assignments
+    inserted = copy.copy(assignments[len(assignments) // 2])
+    inserted.subject = 'Novi Predmet'
+    assignments.insert(0, inserted)
+    assignments[len(assignments) // 3].slots = assignments[len(assignments) // 3].slots[:1]
+    del assignments[-1]
+    assignments.append(assignments.pop(len(assignments) // 4))
+
+    full, full_time = timed(lambda: compile_model(ast))
+    (model, delta), inc_time = timed(lambda: ScheduleCompiler(ast).compile_incremental(previous))
+
+    same = list(map(_signature, model.events)) == list(map(_signature, full.events))
+    stable = len({e.uid for e in previous.events} & {e.uid for e in model.events})
+
+    print(f"Linija: {lines:,}, evenata: {len(model.events):,}")
+    print(f"  puno kompajliranje:        {full_time:7.3f} s")
+    print(f"  inkrementalno:             {inc_time:7.3f} s  "
+          f"(ponovo kompajlirano {delta.recompiled:,} iskaza)")
+    print(f"  razlika: +{len(delta.added)} -{len(delta.removed)} ~{len(delta.changed)}, "
+          f"isti UID: {stable:,}/{len(previous.events):,}, "
+          f"jednako punom kompajliranju: {'da' if same else 'NE'}")
+
+
+if __name__ == '__main__':
+    main()
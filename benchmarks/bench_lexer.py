@@ -0,0 +1,110 @@
+"""
+bench_lexer.py - Brzina leksicke analize (tokena u sekundi)
+
+Poredi Lexer sa ranijom implementacijom (alternacija svih pravila iz
+Lexer.RULES kroz re.finditer) na sintetickom rasporedu i provjerava da
+oba daju identican niz tokena (tip i vrijednost; linije se razlikuju jer
+ranija implementacija nije brojala nove redove unutar /* */ komentara).
+Mjeri i vrsni memorijski otisak liste tokena naspram lijenog citanja.
+
+Upotreba (iz korijena repozitorija):
+    python benchmarks/bench_lexer.py [broj_linija]
+"""
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.synthetic import generate  # noqa: E402
+from ras2cal.lexer import Lexer, Token  # noqa: E402
+
+# Rubni slucajevi koje alternacija pravila tretira na specifican nacin
+EDGE_CASES = [
+    "12je dan broj 1.",
+    "je-x JE DAN BROJ 3 je  dan broj",
+    "a//b c // komentar\nd /* x\ny */ e/f -g",
+    "u prostoriji uprostoriji u  prostoriji prostoriji_1",
+    "ſemestar SEMESTAR Semestar tacno u terminu1 tacno u terminu",
+    "01.02.2025x 123.45.6789 1.2 ivan i Ivan I",
+    "Čedo je nastavnik. Đuro je tip nastave x prioriteta 3.",
+    "x:y (z) \"q\" je! je? je;",
+]
+
+
+def legacy_tokens(text):
+    """Tokenizacija kakva je bila prije tabele kljucnih rijeci."""
+    tokens = []
+    line_num = 1
+    regex = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in Lexer.RULES)
+    for mo in re.finditer(regex, text, re.IGNORECASE):
+        kind = mo.lastgroup
+        if kind == 'NEWLINE':
+            line_num += 1
+        elif kind not in ('SKIP', 'COMMENT'):
+            tokens.append(Token(kind, mo.group(), line_num))
+    return tokens
+
+
+def as_tuples(tokens):
+    return [(t.type, t.value) for t in tokens]
+
+
+def check_positions(text, tokens):
+    """Svaki token mora stajati tacno na svojoj liniji i koloni."""
+    lines = text.split('\n')
+    for t in tokens:
+        line = lines[t.line - 1]
+        assert line.startswith(t.value, t.column - 1), (t, line)
+
+
+def peak_memory(fn):
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def drain(iterable):
+    count = 0
+    for _ in iterable:
+        count += 1
+    return count
+
+
+def timed(fn, text):
+    start = time.perf_counter()
+    tokens = fn(text)
+    return tokens, time.perf_counter() - start
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for case in EDGE_CASES:
+        assert as_tuples(Lexer(case).tokens) == as_tuples(legacy_tokens(case)), case
+        check_positions(case, Lexer(case))
+
+    text = generate(lines)
+    new, t_new = timed(lambda s: Lexer(s).tokens, text)
+    old, t_old = timed(legacy_tokens, text)
+    assert as_tuples(new) == as_tuples(old), "Nizovi tokena se razlikuju"
+    check_positions(text, new)
+    del new, old
+
+    n_tokens, t_stream = timed(lambda s: drain(Lexer(s)), text)
+    mem_list = peak_memory(lambda: Lexer(text).tokens)
+    mem_stream = peak_memory(lambda: drain(Lexer(text)))
+
+    print(f"Linija: {lines}, tokena: {n_tokens}")
+    print(f"  ranije (alternacija pravila): {t_old:7.3f} s  {n_tokens / t_old:12,.0f} tokena/s")
+    print(f"  Lexer (tabela kljucnih rijeci): {t_new:7.3f} s  {n_tokens / t_new:12,.0f} tokena/s")
+    print(f"  Lexer (lijeno, bez liste):    {t_stream:7.3f} s  {n_tokens / t_stream:12,.0f} tokena/s")
+    print(f"  ubrzanje: {t_old / t_new:.2f}x")
+    print(f"Vrsna memorija: lista tokena {mem_list / 2**20:.1f} MiB, lijeno {mem_stream / 2**20:.3f} MiB")
+
+
+if __name__ == '__main__':
+    main()
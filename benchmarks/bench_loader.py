@@ -0,0 +1,85 @@
+"""
+bench_loader.py - Ucitavanje projekta od vise .ras fajlova (kes i paralelno parsiranje)
+
+Generise projekat sa glavnim fajlom koji UVEZI-ima N sintetickih fajlova
+(npr. jedan po odsjeku) i mjeri:
+    - hladno ucitavanje bez kesa, serijski i sa pool-om procesa
+    - ucitavanje sa toplim kesom
+    - ponovno ucitavanje nakon izmjene jednog fajla
+Provjerava i da svi nacini daju isti AST.
+
+Upotreba (iz korijena repozitorija):
+    python benchmarks/bench_loader.py [broj_fajlova] [linija_po_fajlu] [procesa]
+"""
+import contextlib
+import gc
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.synthetic import generate  # noqa: E402
+from ras2cal.loader import load_schedule  # noqa: E402
+
+
+def make_project(root, files, lines):
+    names = []
+    for i in range(files):
+        name = f"odsjek{i}.ras"
+        with open(os.path.join(root, name), 'w', encoding='utf-8') as f:
+            f.write(generate(lines, seed=i))
+        names.append(name)
+    main = os.path.join(root, 'raspored.ras')
+    with open(main, 'w', encoding='utf-8') as f:
+        f.write("".join(f"UVEZI: {name}\n" for name in names))
+    return main
+
+
+def timed_load(path, **kwargs):
+    """Vraca (sazetak AST-a, sekunde); AST se odmah oslobadja da svako
+    mjerenje krene od praznog heap-a, kao zasebno pokretanje tt2cal.py."""
+    gc.collect()
+    start = time.perf_counter()
+    with contextlib.redirect_stderr(io.StringIO()):
+        schedule = load_schedule(path, **kwargs)
+    seconds = time.perf_counter() - start
+    return summary(schedule), seconds
+
+
+def summary(schedule):
+    return (repr(schedule), [vars(a) for a in schedule.assignments])
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    lines = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    jobs = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1)
+
+    with tempfile.TemporaryDirectory() as root:
+        main_path = make_project(root, files, lines)
+        cache = os.path.join(root, 'cache')
+
+        serial, t_serial = timed_load(main_path)
+        parallel, t_parallel = timed_load(main_path, jobs=jobs)
+        _, t_cold = timed_load(main_path, cache_dir=cache, jobs=jobs)
+        warm, t_warm = timed_load(main_path, cache_dir=cache)
+
+        with open(os.path.join(root, 'odsjek0.ras'), 'a', encoding='utf-8') as f:
+            f.write("NoviNastavnik je nastavnik.\n")
+        _, t_edit = timed_load(main_path, cache_dir=cache)
+
+    assert serial == parallel == warm, "AST se razlikuje"
+
+    print(f"Projekat: {files} fajlova x {lines:,} linija, {jobs} procesa")
+    print(f"  bez kesa, serijski:       {t_serial:7.3f} s")
+    print(f"  bez kesa, paralelno:      {t_parallel:7.3f} s  ({t_serial / t_parallel:.2f}x)")
+    print(f"  prazan kes (+ upis):      {t_cold:7.3f} s")
+    print(f"  topli kes:                {t_warm:7.3f} s  ({t_serial / t_warm:.2f}x)")
+    print(f"  izmijenjen jedan fajl:    {t_edit:7.3f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+bench_memory.py - Memorija AST-a i IR-a (tracemalloc)
+
+Parsira i kompajlira sinteticki raspored i mjeri koliko memorije ostaje
+zauzeto po AssignmentNode-u (AST), po Event-u (IR) i po tokenu kad se
+tokeni materijalizuju u listu.
+
+Uz --baseline REV ista mjerenja se prvo rade nad ras2cal/ iz te git
+revizije (npr. commit prije uvodjenja __slots__), pa se vide vrijednosti
+prije i poslije izmjene.
+
+Upotreba (iz korijena repozitorija):
+    python benchmarks/bench_memory.py [broj_linija] [--baseline REV]
+"""
+import contextlib
+import gc
+import io
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+# Stablo ras2cal/ iz druge revizije (postavlja ga baseline() za podproces)
+if os.environ.get('BENCH_MEMORY_TREE'):
+    sys.path.insert(0, os.environ['BENCH_MEMORY_TREE'])
+
+from benchmarks.synthetic import generate  # noqa: E402
+from ras2cal.compiler import ScheduleCompiler  # noqa: E402
+from ras2cal.lexer import Lexer  # noqa: E402
+from ras2cal.parser import Parser  # noqa: E402
+
+
+def retained(fn):
+    """Vraca (rezultat, bajtova koji ostaju zauzeti nakon poziva fn)."""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    gc.collect()
+    return result, tracemalloc.get_traced_memory()[0] - before
+
+
+def parse(text):
+    with contextlib.redirect_stderr(io.StringIO()):
+        return Parser(Lexer(text)).parse()
+
+
+def compile_model(ast):
+    ast.base_time = '08:00'
+    ast.slot_duration = 30
+    ast.slots_per_index = 2
+    ast.default_types = {}
+    return ScheduleCompiler(ast).compile()
+
+
+def baseline(revision, lines):
+    """Pokrece mjerenje u podprocesu nad ras2cal/ iz date git revizije."""
+    archive = subprocess.run(['git', '-C', ROOT, 'archive', revision, 'ras2cal'],
+                             capture_output=True, check=True).stdout
+    with tempfile.TemporaryDirectory() as tree:
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            tar.extractall(tree)
+        subprocess.run([sys.executable, os.path.abspath(__file__), str(lines)],
+                       env=dict(os.environ, BENCH_MEMORY_TREE=tree), check=True)
+
+
+def main():
+    args = sys.argv[1:]
+    revision = None
+    if '--baseline' in args:
+        pos = args.index('--baseline')
+        revision = args[pos + 1]
+        del args[pos:pos + 2]
+    lines = int(args[0]) if args else 100_000
+
+    if revision:
+        print(f"Revizija {revision}:")
+        sys.stdout.flush()
+        baseline(revision, lines)
+        print("Tekuce stablo:")
+    measure(lines)
+
+
+def measure(lines):
+    text = generate(lines)
+
+    tracemalloc.start()
+    tokens, token_bytes = retained(lambda: Lexer(text).tokens)
+    n_tokens = len(tokens)
+    del tokens
+    ast, ast_bytes = retained(lambda: parse(text))
+    model, model_bytes = retained(lambda: compile_model(ast))
+    tracemalloc.stop()
+
+    n_assignments = len(ast.assignments)
+    n_events = len(model.events)
+    print(f"Linija: {lines:,}, tokena: {n_tokens:,}, iskaza nastave: {n_assignments:,}, evenata: {n_events:,}")
+    print(f"  lista tokena: {token_bytes / 2**20:8.1f} MiB  {token_bytes / n_tokens:6.0f} B/token")
+    print(f"  AST:          {ast_bytes / 2**20:8.1f} MiB  {ast_bytes / n_assignments:6.0f} B/iskaz nastave")
+    print(f"  IR:           {model_bytes / 2**20:8.1f} MiB  {model_bytes / n_events:6.0f} B/event")
+
+
+if __name__ == '__main__':
+    main()
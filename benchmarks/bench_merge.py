@@ -0,0 +1,118 @@
+"""
+bench_merge.py - Spajanje evenata (utils.merge_events, utils.condense_teachers)
+
+Mjeri spajanje na ulazima gdje se mnogo redova slijeva u mali broj
+kljuceva (npr. zajednicka nastava za mnogo grupa), naspram ranije
+implementacije (provjera podstringa i liste pri svakom spajanju), te
+provjerava da obje daju isti izlaz. Imena predmeta su fiksne duzine, pa
+se provjera podstringa i tacno poredjenje ne razlikuju.
+
+Upotreba (iz korijena repozitorija):
+    python benchmarks/bench_merge.py [broj_redova] [broj_kljuceva]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ras2cal.utils import condense_teachers, merge_events  # noqa: E402
+
+
+def legacy_merge_events(events):
+    """Ranija implementacija (referenca)."""
+    merged_map = {}
+    for e in events:
+        key = (e['datum'], e['vrijeme_start'], e['vrijeme_kraj'], e['osoba'])
+        if key in merged_map:
+            existing = merged_map[key]
+            if e['predmet'] not in existing['predmet']:
+                existing['predmet'] += " / " + e['predmet']
+            for sublist in e['grupe']:
+                if sublist not in existing['grupe']:
+                    existing['grupe'].append(sublist)
+            if e['tip'] not in existing['tip']:
+                existing['tip'] += "/" + e['tip']
+            existing['prostorija'] = sorted(set(existing['prostorija']) | set(e['prostorija']))
+        else:
+            merged_map[key] = e.copy()
+            merged_map[key]['grupe'] = list(e['grupe'])
+    return list(merged_map.values())
+
+
+def legacy_condense_teachers(data):
+    """Ranija implementacija (referenca)."""
+    grouped = {}
+    for item in data:
+        key = (item['datum'], item['vrijeme_start'], item['vrijeme_kraj'],
+               item['predmet'], tuple(tuple(sub) for sub in item['grupe']),
+               tuple(sorted(item['prostorija'])), item['tip'])
+        if key not in grouped:
+            grouped[key] = item.copy()
+            grouped[key]['teachers'] = list(item['teachers'])
+        else:
+            current = grouped[key]['teachers']
+            for t in item['teachers']:
+                if t not in current:
+                    current.append(t)
+    return list(grouped.values())
+
+
+def make_rows(count, keys, seed=1):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        k = rng.randrange(keys)
+        rows.append({
+            'predmet': f"Predmet {rng.randrange(1000):03d}",
+            'tip': rng.choice('PVLT'),
+            'grupe': [[f"G{rng.randrange(5000):04d}"]],
+            'prostorija': [f"R{rng.randrange(500):03d}"],
+            'datum': f"Dan{k % 5}",
+            'vrijeme_start': f"{8 + k % 10:02d}:00",
+            'vrijeme_kraj': f"{9 + k % 10:02d}:00",
+            'osoba': f"Nastavnik{k:03d}",
+            'teachers': [f"Nastavnik{k:03d}"],
+        })
+    return rows
+
+
+def make_condense_rows(count, keys, seed=2):
+    rng = random.Random(seed)
+    return [{
+        'predmet': "Predmet 001", 'tip': 'P', 'grupe': [["G1"]], 'prostorija': ["R1"],
+        'datum': f"Dan{k}", 'vrijeme_start': "08:00", 'vrijeme_kraj': "09:00",
+        'teachers': [f"Nastavnik{rng.randrange(20000):05d}"],
+    } for k in (rng.randrange(keys) for _ in range(count))]
+
+
+def timed(fn, rows):
+    start = time.perf_counter()
+    result = fn(rows)
+    return result, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    keys = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    rows = make_rows(count, keys)
+    new, t_new = timed(merge_events, rows)
+    old, t_old = timed(legacy_merge_events, rows)
+    print(f"merge_events: {count:,} redova -> {keys} kljuceva")
+    print(f"  ranije:  {t_old:7.3f} s")
+    print(f"  sada:    {t_new:7.3f} s  ({t_old / t_new:.0f}x, "
+          f"{'isti izlaz' if new == old else 'RAZLICIT izlaz'})")
+
+    rows = make_condense_rows(count, keys)
+    new, t_new = timed(condense_teachers, rows)
+    old, t_old = timed(legacy_condense_teachers, rows)
+    print(f"condense_teachers: {count:,} redova -> {keys} kljuceva")
+    print(f"  ranije:  {t_old:7.3f} s")
+    print(f"  sada:    {t_new:7.3f} s  ({t_old / t_new:.0f}x, "
+          f"{'isti izlaz' if new == old else 'RAZLICIT izlaz'})")
+
+
+if __name__ == '__main__':
+    main()
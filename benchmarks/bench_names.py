@@ -0,0 +1,82 @@
+"""
+bench_names.py - Formatiranje imena (format_camel_case, format_subject_name)
+
+Mjeri formatiranje svih imena iz iskaza nastave sintetickog rasporeda sa i
+bez memoizacije (__wrapped__ zaobilazi LRU kes), te ukupno vrijeme
+parsiranja i kompajliranja u kojem se ta imena formatiraju.
+
+Upotreba (iz korijena repozitorija):
+    python benchmarks/bench_names.py [broj_linija]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.bench_memory import compile_model  # noqa: E402
+from benchmarks.synthetic import generate  # noqa: E402
+from ras2cal import utils  # noqa: E402
+from ras2cal.lexer import Lexer  # noqa: E402
+from ras2cal.parser import Parser  # noqa: E402
+
+
+def timed(fn, repeat=3):
+    """Najbolje vrijeme od nekoliko ponavljanja; vraca (rezultat, sekunde)."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def format_all(teachers, subjects, camel, subject_words):
+    for name in teachers:
+        camel(name)
+    for name in subjects:
+        subject_words(name[1:])
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    tokens = Lexer(generate(lines)).tokens
+
+    # Imena onako kako se pojavljuju u iskazima nastave (sa ponavljanjima)
+    teachers, subjects = [], []
+    for i, tok in enumerate(tokens):
+        if tok.type == 'PREDAJE':
+            j = i - 1
+            while j >= 0 and tokens[j].type == 'ID':
+                if tokens[j].value != 'i':
+                    teachers.append(tokens[j].value)
+                j -= 1
+            if i + 1 < len(tokens):
+                subjects.append(tokens[i + 1].value)
+    calls = len(teachers) + len(subjects)
+    distinct = len(set(teachers)) + len(set(subjects))
+
+    camel = utils.format_camel_case
+    subject_words = utils._split_subject_words
+    _, plain = timed(lambda: format_all(teachers, subjects,
+                                        camel.__wrapped__, subject_words.__wrapped__))
+    _, memo = timed(lambda: format_all(teachers, subjects, camel, subject_words))
+
+    print(f"Linija: {lines:,}, formatiranja: {calls:,}, razlicitih imena: {distinct:,}")
+    print(f"  bez kesa: {plain:7.3f} s  {plain / calls * 1e6:6.2f} us/ime")
+    print(f"  sa kesom: {memo:7.3f} s  {memo / calls * 1e6:6.2f} us/ime")
+
+    def parse():
+        with contextlib.redirect_stderr(io.StringIO()):
+            return Parser(tokens).parse()
+
+    ast, parse_time = timed(parse)
+    _, compile_time = timed(lambda: compile_model(ast))
+    print(f"  parsiranje: {parse_time:7.3f} s, kompajliranje: {compile_time:7.3f} s")
+
+
+if __name__ == '__main__':
+    main()
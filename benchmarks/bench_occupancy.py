@@ -0,0 +1,79 @@
+"""
+bench_occupancy.py - Indeks zauzetosti (ras2cal.occupancy)
+
+Mjeri gradjenje OccupancyIndex-a i latenciju upita (slobodne prostorije,
+zajednicki slobodni termini, zauzetost) i poredi slobodne prostorije sa
+direktnom provjerom preklapanja po eventima.
+
+Upotreba (iz korijena repozitorija):
+    python benchmarks/bench_occupancy.py [broj_linija]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.bench_memory import compile_model  # noqa: E402
+from benchmarks.synthetic import generate  # noqa: E402
+from ras2cal.columnar import ColumnarSchedule, clock  # noqa: E402
+from ras2cal.lexer import Lexer  # noqa: E402
+from ras2cal.occupancy import OccupancyIndex  # noqa: E402
+from ras2cal.parser import Parser  # noqa: E402
+
+REPEAT = 100
+
+
+def timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def minutes(dt):
+    return dt.hour * 60 + dt.minute
+
+
+def scan_free_rooms(model, day, start, end):
+    """Referentna provjera: prolaz kroz sve evente."""
+    busy = {room.name for ev in model.events
+            if ev.day_name == day and minutes(ev.start_dt) < end and minutes(ev.end_dt) > start
+            for room in ev.rooms}
+    rooms = {room.name for room in model.rooms.values()}
+    rooms.update(room.name for ev in model.events for room in ev.rooms)
+    return sorted(rooms - busy)
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with contextlib.redirect_stderr(io.StringIO()):
+        ast = Parser(Lexer(generate(lines))).parse()
+    model = compile_model(ast)
+    columns = ColumnarSchedule.from_model(model)
+
+    index, build = timed(lambda: OccupancyIndex(model, columns))
+    day = index.days[0]
+    start, end = index.base + 2 * index.unit, index.base + 4 * index.unit
+    rooms, free = timed(lambda: index.free_rooms(day, start, end), REPEAT)
+    names = [model.events[0].teachers[0].name, model.events[0].groups[0].name]
+    intervals, common = timed(lambda: index.common_free(names), REPEAT)
+    _, util = timed(lambda: index.utilization('rooms'), REPEAT)
+    expected, scan = timed(lambda: scan_free_rooms(model, day, start, end))
+
+    print(f"Linija: {lines:,}, evenata: {len(model.events):,}, "
+          f"bita po entitetu: {2 * index.width}")
+    print(f"  gradjenje indeksa:              {build * 1e3:9.2f} ms")
+    print(f"  slobodne prostorije ({day} {clock(start)}-{clock(end)}): "
+          f"{free * 1e3:7.3f} ms  ({len(rooms)} prostorija)")
+    print(f"  zajednicki slobodni termini:    {common * 1e3:9.3f} ms  "
+          f"({len(intervals)} intervala)")
+    print(f"  zauzetost prostorija:           {util * 1e3:9.3f} ms")
+    print(f"  prolaz kroz evente (ref.):      {scan * 1e3:9.2f} ms  "
+          f"({'iste prostorije' if expected == rooms else 'RAZLICITE prostorije'})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+bench_occurrences.py - Razvijanje ponavljanja (ras2cal.occurrences)
+
+Mjeri gradjenje OccurrenceTable, upit za jedan dan, lijeno prolazenje kroz
+cijeli semestar i materijalizaciju svih pojavljivanja u nizove, te
+provjerava broj pojavljivanja naspram razvijanja event po event.
+
+Upotreba (iz korijena repozitorija):
+    python benchmarks/bench_occurrences.py [broj_linija]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.bench_memory import compile_model  # noqa: E402
+from benchmarks.synthetic import generate  # noqa: E402
+from ras2cal import occurrences  # noqa: E402
+from ras2cal.columnar import ColumnarSchedule  # noqa: E402
+from ras2cal.lexer import Lexer  # noqa: E402
+from ras2cal.occurrences import OccurrenceTable  # noqa: E402
+from ras2cal.parser import Parser  # noqa: E402
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def per_event(model):
+    """Referentno razvijanje: petlja po eventima i sedmicama."""
+    total = 0
+    for ev in model.events:
+        day, until = ev.start_dt.date(), date.fromisoformat(ev.until_date)
+        while day <= until:
+            if day.strftime('%Y%m%d') not in ev.exdates:
+                total += 1
+            day += timedelta(days=7 * ev.interval)
+    return total
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with contextlib.redirect_stderr(io.StringIO()):
+        ast = Parser(Lexer(generate(lines))).parse()
+    ast.semester_info['end_date'] = '2026-01-23'
+    model = compile_model(ast)
+    columns = ColumnarSchedule.from_model(model)
+
+    table, build = timed(lambda: OccurrenceTable(model, columns))
+    day = model.events[0].start_dt.date() + timedelta(days=14)
+    one_day, query = timed(lambda: table.on(day))
+    walked, walk = timed(lambda: sum(1 for _ in table))
+    _, arrays = timed(table.arrays)
+    expected, reference = timed(lambda: per_event(model))
+
+    backend = 'numpy' if occurrences.np is not None else 'bez numpy'
+    print(f"Linija: {lines:,}, evenata: {len(model.events):,}, "
+          f"grupa ponavljanja: {len(table.patterns)}, backend: {backend}")
+    print(f"  gradjenje tablice:         {build:7.3f} s")
+    print(f"  jedan dan ({day}):   {query:7.3f} s  ({len(one_day):,} pojavljivanja)")
+    print(f"  cijeli semestar (lijeno):  {walk:7.3f} s  ({walked:,} pojavljivanja)")
+    print(f"  nizovi (indeks, datum):    {arrays:7.3f} s")
+    print(f"  event po event (ref.):     {reference:7.3f} s  "
+          f"({'isti broj' if expected == walked == len(table) else 'RAZLICIT broj'})")
+
+
+if __name__ == '__main__':
+    main()
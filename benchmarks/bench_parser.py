@@ -0,0 +1,57 @@
+"""
+bench_parser.py - Linearnost parsiranja (Lexer + Parser)
+
+Mjeri vrijeme parsiranja sintetickih rasporeda rastuce velicine i
+patoloskog ulaza (dugi iskazi od neprepoznatih tokena bez 'predaje', koji
+su ranije zahtijevali ponovni prolaz do tacke za svaki preskoceni token).
+Vrijeme po tokenu treba ostati priblizno konstantno kako ulaz raste.
+
+Upotreba (iz korijena repozitorija):
+    python benchmarks/bench_parser.py [broj_linija]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.synthetic import generate  # noqa: E402
+from ras2cal.lexer import Lexer  # noqa: E402
+from ras2cal.parser import Parser  # noqa: E402
+
+
+def parse_time(text):
+    """Vraca (broj tokena, sekunde) za lexer + parser; upozorenja se odbacuju."""
+    n_tokens = sum(1 for _ in Lexer(text))
+    start = time.perf_counter()
+    with contextlib.redirect_stderr(io.StringIO()):
+        Parser(Lexer(text)).parse()
+    return n_tokens, time.perf_counter() - start
+
+
+def pathological(tokens_per_statement, statements=4):
+    """Iskazi sa mnogo neprepoznatih rijeci i jednom tackom na kraju."""
+    words = " ".join(f"rijec{i}" for i in range(tokens_per_statement))
+    return "\n".join(f"{words}." for _ in range(statements)) + "\n"
+
+
+def report(title, cases):
+    print(title)
+    for label, text in cases:
+        n_tokens, seconds = parse_time(text)
+        print(f"  {label:>12}: {n_tokens:9,} tokena  {seconds:7.3f} s  "
+              f"{seconds / n_tokens * 1e6:6.2f} us/token")
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    report("Sinteticki raspored:",
+           [(f"{n:,} linija", generate(n)) for n in (lines // 4, lines // 2, lines)])
+    report("Patoloski ulaz (neprepoznati tokeni):",
+           [(f"{n:,}/iskaz", pathological(n)) for n in (5_000, 10_000, 20_000)])
+
+
+if __name__ == '__main__':
+    main()
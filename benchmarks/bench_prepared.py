@@ -0,0 +1,61 @@
+"""
+bench_prepared.py - Zajednicki pripremljeni redovi HTML i grid generatora
+
+Mjeri HTML (-w) i grid (-g) generator posebno i zajedno nad istim
+modelom. Pripremljeni redovi (ScheduleModel.prepared) racunaju se
+jednom, pa oba generatora zajedno treba da kostaju malo vise od sporijeg.
+
+Upotreba (iz korijena repozitorija):
+    python benchmarks/bench_prepared.py [broj_linija]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.bench_memory import compile_model  # noqa: E402
+from benchmarks.synthetic import generate  # noqa: E402
+from ras2cal.generators import GridGenerator, HTMLScheduleGenerator  # noqa: E402
+from ras2cal.lexer import Lexer  # noqa: E402
+from ras2cal.parser import Parser  # noqa: E402
+
+
+def run(model, root, generators):
+    """Vrijeme generisanja sa praznim kesom pripremljenih redova."""
+    model._prepared = None
+    start = time.perf_counter()
+    for cls in generators:
+        cls(model, os.path.join(root, cls.__name__)).generate()
+    return time.perf_counter() - start
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    with contextlib.redirect_stderr(io.StringIO()):
+        ast = Parser(Lexer(generate(lines))).parse()
+    model = compile_model(ast)
+    model.base_time, model.slot_duration, model.slots_per_index = '08:00', 30, 2
+
+    with tempfile.TemporaryDirectory() as root:
+        html = run(model, root, [HTMLScheduleGenerator])
+        grid = run(model, root, [GridGenerator])
+        both = run(model, root, [HTMLScheduleGenerator, GridGenerator])
+        model._prepared = None
+        start = time.perf_counter()
+        prepared = model.prepared()
+        prepared.condensed_raw, prepared.condensed_merged, prepared.event_rows
+        prepare = time.perf_counter() - start
+
+    print(f"Linija: {lines:,}, evenata: {len(model.events):,}")
+    print(f"  priprema redova:   {prepare:7.3f} s")
+    print(f"  HTML (-w):         {html:7.3f} s")
+    print(f"  grid (-g):         {grid:7.3f} s")
+    print(f"  -w i -g zajedno:   {both:7.3f} s  (zbir posebno {html + grid:.3f} s)")
+
+
+if __name__ == '__main__':
+    main()
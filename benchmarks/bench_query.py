@@ -0,0 +1,60 @@
+"""
+bench_query.py - Upiti nad iskazima nastave (ras2cal.query)
+
+Mjeri pravljenje po jednog filtriranog pogleda za N nastavnika:
+ranije (regex nad svim iskazima za svaki pogled) naspram jedne gradnje
+AssignmentIndex-a i upita po nastavniku, te provjerava da oba nacina
+daju iste iskaze.
+
+Upotreba (iz korijena repozitorija):
+    python benchmarks/bench_query.py [broj_linija] [broj_pogleda]
+"""
+import contextlib
+import io
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks.synthetic import generate  # noqa: E402
+from ras2cal.lexer import Lexer  # noqa: E402
+from ras2cal.parser import Parser  # noqa: E402
+from ras2cal.query import AssignmentIndex, Term  # noqa: E402
+
+
+def scan(schedule, pattern):
+    """Referentno filtriranje: regex nad nastavnicima svakog iskaza."""
+    return [node for node in schedule.assignments
+            if any(re.search(pattern, t, re.IGNORECASE) for t in node.teachers)]
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    views = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    with contextlib.redirect_stderr(io.StringIO()):
+        ast = Parser(Lexer(generate(lines))).parse()
+    teachers = sorted({t for node in ast.assignments for t in node.teachers})[:views]
+
+    start = time.perf_counter()
+    expected = [scan(ast, f"^{re.escape(name)}$") for name in teachers]
+    scanned = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = AssignmentIndex(ast)
+    built = time.perf_counter() - start
+    filtered = [index.filter(Term('teacher', (('exact', name),))) for name in teachers]
+    indexed = time.perf_counter() - start
+
+    same = all(view.assignments == nodes for view, nodes in zip(filtered, expected))
+    print(f"Linija: {lines:,}, iskaza: {len(ast.assignments):,}, "
+          f"nastavnika (pogleda): {len(teachers)}")
+    print(f"  regex po pogledu:          {scanned:7.3f} s")
+    print(f"  indeks + upit po pogledu:  {indexed:7.3f} s  (gradnja indeksa {built:.3f} s)")
+    print(f"  ubrzanje: {scanned / indexed:.1f}x  "
+          f"({'isti iskazi' if same else 'RAZLICITI iskazi'})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+synthetic.py - Generator sintetickih .ras rasporeda za benchmarke
+
+Pravi validan raspored sa zadanim brojem linija: semestar, dani, termini,
+nastavnici, predmeti, prostorije, odjeljenja/grupe i nastava koja ih koristi.
+
+Upotreba:
+    python benchmarks/synthetic.py 100000 > /tmp/veliki.ras
+"""
+import random
+import sys
+
+DAYS = ['Ponedjeljak', 'Utorak', 'Srijeda', 'Cetvrtak', 'Petak']
+DAY_CODES = ['PO', 'UT', 'SR', 'CE', 'PE']
+SLOTS_PER_DAY = 12
+
+
+def generate(lines=100_000, seed=42):
+    """Vraca tekst rasporeda sa priblizno `lines` linija."""
+    rnd = random.Random(seed)
+    out = [
+        "ZimskiSemestar je semestar.",
+        "ZimskiSemestar pocinje 06.10.2025.",
+        "ZimskiSemestar traje 15 sedmica.",
+        "ZimskiSemestar ima nenastavne dane 25.11.2025, 01.01.2026.",
+        "/* sinteticki raspored\n   za benchmark */",
+        "L je tip nastave LaboratorijskeVjezbe prioriteta 2.",
+    ]
+    slots = []
+    for d, (day, code) in enumerate(zip(DAYS, DAY_CODES), 1):
+        out.append(f"{day} je dan broj {d}.")
+        for s in range(1, SLOTS_PER_DAY + 1):
+            slot = f"{code}{s}"
+            slots.append(slot)
+            out.append(f"{slot} je termin broj {s} dana {day}.")
+
+    # Otprilike 10% linija su definicije, ostalo nastava
+    n_defs = max(lines // 40, 10)
+    teachers = [f"Nastavnik{i}Prezime{i}" for i in range(n_defs)]
+    subjects = [f"Predmet{i}" for i in range(n_defs)]
+    rooms = [f"S{i}-{i % 7}" for i in range(max(n_defs // 4, 5))]
+    groups = [f"RI{i}" for i in range(max(n_defs // 4, 5))]
+    out += [f"{t} je nastavnik." for t in teachers]
+    for sub in subjects:
+        out += [f"p{sub} je predmet.", f"v{sub} je predmet."]
+    out += [f"{r} je prostorija." for r in rooms]
+    subgroups = []
+    for g in groups:
+        out.append(f"{g} je odjeljenje.")
+        for k in (1, 2):
+            subgroups.append(f"{g}-{k}")
+            out.append(f"{g}-{k} je grupa odjeljenja {g}.")
+
+    while len(out) < lines:
+        teacher = rnd.choice(teachers)
+        if rnd.random() < 0.1:
+            teacher += f" i {rnd.choice(teachers)}"
+        kind = rnd.choice('pv')
+        group = rnd.choice(groups) if kind == 'p' else ", ".join(rnd.sample(subgroups, 2))
+        start = rnd.randrange(len(slots) - 1)
+        freq = " svake 2 sedmice" if rnd.random() < 0.1 else ""
+        comment = " // komentar" if rnd.random() < 0.05 else ""
+        out.append(f"{teacher} predaje {kind}{rnd.choice(subjects)} odjeljenju {group} "
+                   f"u prostoriji {rnd.choice(rooms)}{freq} tacno u terminu "
+                   f"{slots[start]} {slots[start + 1]}.{comment}")
+    return "\n".join(out[:lines]) + "\n"
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    sys.stdout.write(generate(n))
@@ -0,0 +1,226 @@
+"""
+batch.py - Vise filtriranih pogleda iz jednog kompajliranja
+
+Manifest (JSON) opisuje poglede; svaki pogled ima filter i izlaze:
+
+    {
+        "json_format": "compact",
+        "views": [
+            {"name": "RI1", "where": "group:RI1",
+             "json": "out/ri1.json", "html": "out/ri1"},
+            {"each": "teacher", "where": "NOT type:T",
+             "json": "out/nastavnici/{key}.json", "grid": "out/grid/{key}"}
+        ]
+    }
+
+Filter pogleda je izraz upita (where, vidi query.py) i/ili regex filteri
+teacher, room, group, subject (kao na komandnoj liniji). Pogled sa "each"
+se razvija u po jedan pogled za svaku vrijednost te dimenzije (npr. za
+svakog nastavnika); u putanjama {name} je ime, a {key} ime bez razmaka.
+Relativne putanje se racunaju od direktorija manifesta.
+
+Raspored se parsira i kompajlira jednom: filter se razrjesava nad
+AssignmentIndex-om (indeksi iskaza), iskazi se preslikavaju u evente
+(ScheduleModel.event_sources), a generatori dobijaju podskup modela
+(ScheduleModel.subset) koji dijeli evente i entitete sa cijelim modelom.
+Uz jobs > 1 pogledi se generisu u pool-u procesa; model se predaje
+procesu jednom (pri fork-u bez kopiranja).
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from .exporter import Exporter
+from .generators import (
+    JSON_FORMATS,
+    GridGenerator,
+    HTMLScheduleGenerator,
+    JSONScheduleGenerator,
+    MarkdownReportGenerator,
+    write_json_output,
+)
+from .query import DIMENSIONS, And, Term, filters_query, parse_query
+
+# Dozvoljeni kljucevi pogleda u manifestu: izlazi, regex filteri i ostalo
+OUTPUTS = ('json', 'md', 'html', 'grid', 'export')
+FILTERS = ('teacher', 'room', 'group', 'subject')
+VIEW_KEYS = set(OUTPUTS) | set(FILTERS) | {'name', 'where', 'each', 'json_format'}
+
+
+@dataclass
+class View:
+    """Jedan pogled: filter (stablo upita ili None za sve) i izlazi."""
+    name: str
+    query: Optional[object]
+    outputs: Dict[str, str] = field(default_factory=dict)
+    json_format: str = 'pretty'
+
+
+# ---------------------------------------------------------------------------
+# Manifest
+# ---------------------------------------------------------------------------
+
+def load_manifest(manifest, index, base_dir='.'):
+    """Lista View-ova iz manifesta (dict ili lista pogleda).
+
+    Args:
+        manifest: ucitan JSON manifest
+        index: AssignmentIndex rasporeda (za razvijanje "each" pogleda)
+        base_dir: direktorij od kojeg se racunaju relativne putanje
+    Raises:
+        ValueError: neispravan manifest
+    """
+    if isinstance(manifest, list):
+        manifest = {'views': manifest}
+    if not isinstance(manifest, dict) or not isinstance(manifest.get('views'), list):
+        raise ValueError("Manifest mora imati listu 'views'")
+    default_format = manifest.get('json_format', 'pretty')
+
+    views = []
+    for number, spec in enumerate(manifest['views'], 1):
+        if not isinstance(spec, dict):
+            raise ValueError(f"Pogled {number} nije objekat")
+        unknown = set(spec) - VIEW_KEYS
+        if unknown:
+            raise ValueError(f"Pogled {number}: nepoznati kljucevi "
+                             f"{', '.join(sorted(unknown))}")
+        outputs = {key: spec[key] for key in OUTPUTS if spec.get(key)}
+        if not outputs:
+            raise ValueError(f"Pogled {number}: nema izlaza "
+                             f"({', '.join(OUTPUTS)})")
+        json_format = spec.get('json_format', default_format)
+        if json_format not in JSON_FORMATS:
+            raise ValueError(f"Pogled {number}: nepoznat JSON format '{json_format}'")
+
+        clauses = []
+        filters = {key: spec.get(key) for key in FILTERS}
+        if any(filters.values()):
+            clauses.append(filters_query(filters))
+        if spec.get('where'):
+            try:
+                clauses.append(parse_query(spec['where']))
+            except ValueError as e:
+                raise ValueError(f"Pogled {number}: {e}") from None
+
+        each = spec.get('each')
+        if each is None:
+            name = (spec.get('name') or spec.get('where')
+                    or ", ".join(f"{k}={v}" for k, v in filters.items() if v)
+                    or f"pogled {number}")
+            query = And(tuple(clauses)) if clauses else None
+            views.append(View(name, query, _paths(outputs, base_dir), json_format))
+            continue
+
+        if each not in DIMENSIONS:
+            raise ValueError(f"Pogled {number}: nepoznata dimenzija '{each}' "
+                             f"(moguce: {', '.join(DIMENSIONS)})")
+        for value in sorted(index.postings[each]):
+            placeholders = {'name': value, 'key': ''.join(value.split())}
+            try:
+                paths = {key: path.format(**placeholders) for key, path in outputs.items()}
+            except (KeyError, IndexError) as e:
+                raise ValueError(f"Pogled {number}: nepoznato polje {e} u putanji") from None
+            query = And((Term(each, (('exact', value),)),) + tuple(clauses))
+            views.append(View(value, query, _paths(paths, base_dir), json_format))
+    return views
+
+
+def _paths(outputs, base_dir):
+    return {key: os.path.join(base_dir, os.path.expanduser(path))
+            for key, path in outputs.items()}
+
+
+# ---------------------------------------------------------------------------
+# Generisanje
+# ---------------------------------------------------------------------------
+
+def write_outputs(model, ast, outputs, meta, title, json_format='pretty'):
+    """Zapisuje izlaze jednog (filtriranog) modela.
+
+    Args:
+        model: ScheduleModel (IR) pogleda
+        ast: Schedule pogleda (koristi ga samo eksport)
+        outputs: format -> putanja ('json', 'md', 'html', 'grid', 'export')
+        meta: meta-podaci JSON izlaza (naziv kalendara, datumi, nenastavni dani)
+        title: naslov HTML izvjestaja
+    """
+    # Direktoriji fajl-izlaza (shards JSON je i sam direktorij)
+    files = [outputs.get('md')]
+    if json_format != 'shards':
+        files.append(outputs.get('json'))
+    for path in files:
+        if path and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    if outputs.get('json'):
+        events = JSONScheduleGenerator(model).generate()
+        write_json_output(outputs['json'], meta, events, json_format)
+    if outputs.get('md'):
+        with open(outputs['md'], 'w', encoding='utf-8') as f:
+            f.write(MarkdownReportGenerator(model).generate())
+    if outputs.get('html'):
+        HTMLScheduleGenerator(model, outputs['html'], title=title).generate()
+    if outputs.get('grid'):
+        GridGenerator(model, outputs['grid'], title=title).generate()
+    if outputs.get('export'):
+        Exporter(ast, outputs['export']).export()
+
+
+# Stanje procesa koji generise poglede (postavlja ga _init_worker)
+_state = None
+
+
+def _init_worker(state):
+    global _state
+    _state = state
+
+
+def _render(number):
+    """Generise pogled sa datim rednim brojem; vraca (broj evenata, sekunde)."""
+    model, index, views, meta, title, positions = _state
+    view = views[number]
+    start = time.perf_counter()
+
+    if view.query is None:
+        subset, ast = model, index.schedule
+    else:
+        selected = index.select(view.query)
+        subset = model.subset([positions[i] for i in selected if i in positions])
+        ast = index.filter(view.query) if 'export' in view.outputs else None
+
+    write_outputs(subset, ast, view.outputs, meta, title, view.json_format)
+    return len(subset.events), time.perf_counter() - start
+
+
+def run_batch(views, model, index, meta, title, jobs=1):
+    """Generise sve poglede; vraca listu (View, broj evenata, sekunde)
+    redom manifesta.
+
+    Args:
+        views: lista View-ova (load_manifest)
+        model: kompajlirani ScheduleModel cijelog rasporeda
+        index: AssignmentIndex AST-a iz kojeg je model kompajliran
+        meta: meta-podaci JSON izlaza
+        title: naslov HTML izvjestaja
+        jobs: broj procesa (0 = broj jezgara, 1 = bez pool-a)
+    """
+    positions = {source: i for i, source in enumerate(model.event_sources)}
+    state = (model, index, views, meta, title, positions)
+
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(views))
+    if jobs <= 1:
+        _init_worker(state)
+        try:
+            results = [_render(number) for number in range(len(views))]
+        finally:
+            _init_worker(None)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(state,)) as pool:
+            results = list(pool.map(_render, range(len(views)),
+                                    chunksize=max(1, len(views) // (jobs * 4))))
+    return [(view, count, seconds) for view, (count, seconds) in zip(views, results)]
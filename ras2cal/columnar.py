@@ -0,0 +1,263 @@
+"""
+columnar.py - Kolonski prikaz IR evenata (alternativa listi Event objekata)
+
+ColumnarSchedule drzi evente kao paralelne nizove cijelih brojeva:
+    subject, type, day  - kodovi u tablicama entiteta (EntityTable)
+    date                - datum prvog pojavljivanja (ordinal, date.toordinal)
+    start, end          - vrijeme u minutama od ponoci
+    interval            - ponavljanje svake N sedmice
+    recurrence          - kod (frekvencija, datum_kraj, izuzeci)
+te clanstvo nastavnika, grupa i prostorija u CSR obliku (Membership):
+entiteti i-tog eventa su idx[ptr[i]:ptr[i+1]].
+
+Nizovi su array.array (bez zavisnosti); ako je NumPy instaliran, column()
+vraca numpy pogled na isti memorijski blok (bez kopiranja), pa analitika,
+provjera konflikata i grid mogu raditi nad vektorima umjesto petlje po
+objektima.
+
+Konverzija je u oba smjera: from_model(model) i to_model() daju isti IR
+(isti uid-ovi, entiteti i vremena).
+"""
+from array import array
+from dataclasses import fields
+from datetime import date, datetime
+
+from .ir import Event, ScheduleModel
+
+# Opcionalni vektorski backend (ako je instaliran)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Tip elemenata nizova (C int, 32 bita na svim podrzanim platformama)
+INT = 'i'
+
+
+# ---------------------------------------------------------------------------
+# Tablice entiteta i CSR clanstvo
+# ---------------------------------------------------------------------------
+
+class EntityTable:
+    """Entiteti jedne vrste kodirani cijelim brojevima redom prvog pojavljivanja.
+    Kljuc entiteta (npr. Person.id) odredjuje kod; cuva se prvi objekat."""
+
+    def __init__(self, key=None):
+        self.key = key          # entitet -> kljuc (None = sam entitet)
+        self.items = []         # kod -> entitet
+        self.codes = {}         # kljuc -> kod
+
+    def code(self, item):
+        """Vraca kod entiteta, dodaje ga u tablicu ako ga nema."""
+        key = self.key(item) if self.key else item
+        code = self.codes.get(key)
+        if code is None:
+            code = self.codes[key] = len(self.items)
+            self.items.append(item)
+        return code
+
+    def lookup(self, key):
+        """Kod entiteta po kljucu ili None."""
+        return self.codes.get(key)
+
+    def __getitem__(self, code):
+        return self.items[code]
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+class Membership:
+    """CSR clanstvo: entiteti reda i su idx[ptr[i]:ptr[i+1]]."""
+
+    def __init__(self):
+        self.ptr = array(INT, [0])
+        self.idx = array(INT)
+
+    def append(self, codes):
+        """Dodaje red (kodove entiteta jednog eventa)."""
+        self.idx.extend(codes)
+        self.ptr.append(len(self.idx))
+
+    def __getitem__(self, row):
+        return self.idx[self.ptr[row]:self.ptr[row + 1]]
+
+    def __len__(self):
+        return len(self.ptr) - 1
+
+    def transpose(self, n_cols):
+        """Obrnuto clanstvo (entitet -> eventi), counting sort u O(n + m).
+        Eventi svakog entiteta su u rastucem redoslijedu."""
+        if np is not None:
+            return self._transpose_numpy(n_cols)
+
+        counts = [0] * (n_cols + 1)
+        for code in self.idx:
+            counts[code + 1] += 1
+        for i in range(n_cols):
+            counts[i + 1] += counts[i]
+
+        result = Membership()
+        result.ptr = array(INT, counts)
+        idx = [0] * len(self.idx)
+        fill = counts[:-1]
+        ptr = self.ptr
+        for row in range(len(ptr) - 1):
+            for k in range(ptr[row], ptr[row + 1]):
+                code = self.idx[k]
+                idx[fill[code]] = row
+                fill[code] += 1
+        result.idx = array(INT, idx)
+        return result
+
+    def _transpose_numpy(self, n_cols):
+        ptr = np.frombuffer(self.ptr, dtype=np.intc)
+        idx = np.frombuffer(self.idx, dtype=np.intc)
+        rows = np.repeat(np.arange(len(ptr) - 1, dtype=np.intc), np.diff(ptr))
+        order = np.argsort(idx, kind='stable')
+        counts = np.bincount(idx, minlength=n_cols)
+
+        result = Membership()
+        result.ptr = array(INT, np.concatenate(([0], np.cumsum(counts))).astype(np.intc).tobytes())
+        result.idx = array(INT, rows[order].astype(np.intc).tobytes())
+        return result
+
+
+# ---------------------------------------------------------------------------
+# Kolonski raspored
+# ---------------------------------------------------------------------------
+
+class ColumnarSchedule:
+    """Eventi ScheduleModel-a kao paralelni nizovi cijelih brojeva."""
+
+    COLUMNS = ('subject', 'type', 'day', 'date', 'start', 'end', 'interval', 'recurrence')
+    MEMBERSHIPS = ('teachers', 'groups', 'rooms')
+
+    def __init__(self):
+        self.uids = []
+        for name in self.COLUMNS:
+            setattr(self, name, array(INT))
+        self.teachers = Membership()
+        self.groups = Membership()
+        self.rooms = Membership()
+
+        # Tablice entiteta (kod -> objekat iz IR-a)
+        self.subjects = EntityTable(lambda s: s.id)
+        self.types = EntityTable(lambda t: t.code)
+        self.days = EntityTable()
+        self.people = EntityTable(lambda p: p.id)
+        self.group_table = EntityTable(lambda g: g.id)
+        self.room_table = EntityTable(lambda r: r.id)
+        self.recurrences = EntityTable()
+
+        # Ostala polja ScheduleModel-a (meta-podaci, lookup rjecnici)
+        self.model_fields = {}
+
+    def __len__(self):
+        return len(self.uids)
+
+    # --- Konverzija ---
+
+    @classmethod
+    def from_model(cls, model: ScheduleModel) -> 'ColumnarSchedule':
+        """Gradi kolonski prikaz iz IR modela."""
+        cs = cls()
+        cs.model_fields = {
+            f.name: getattr(model, f.name) for f in fields(model) if f.name != 'events'
+        }
+
+        # Lokalne reference (petlja se izvrsava za svaki event)
+        subject_code, type_code = cs.subjects.code, cs.types.code
+        day_code, recurrence_code = cs.days.code, cs.recurrences.code
+        person_code, group_code, room_code = (
+            cs.people.code, cs.group_table.code, cs.room_table.code)
+        subject, type_, day, date_, start, end, interval, recurrence = (
+            getattr(cs, name) for name in cls.COLUMNS)
+        dates = {}
+
+        for ev in model.events:
+            cs.uids.append(ev.uid)
+            subject.append(subject_code(ev.subject))
+            type_.append(type_code(ev.type))
+            day.append(day_code(ev.day_name))
+            first = ev.start_dt.date()
+            ordinal = dates.get(first)
+            if ordinal is None:
+                ordinal = dates[first] = first.toordinal()
+            date_.append(ordinal)
+            start.append(ev.start_dt.hour * 60 + ev.start_dt.minute)
+            end.append(ev.end_dt.hour * 60 + ev.end_dt.minute)
+            interval.append(ev.interval)
+            recurrence.append(recurrence_code((ev.frequency, ev.until_date, ev.exdates)))
+            cs.teachers.append([person_code(p) for p in ev.teachers])
+            cs.groups.append([group_code(g) for g in ev.groups])
+            cs.rooms.append([room_code(r) for r in ev.rooms])
+        return cs
+
+    def event(self, i: int) -> Event:
+        """Rekonstruise i-ti IR Event."""
+        first = date.fromordinal(self.date[i])
+        start, end = self.start[i], self.end[i]
+        frequency, until_date, exdates = self.recurrences[self.recurrence[i]]
+        return Event(
+            uid=self.uids[i],
+            subject=self.subjects[self.subject[i]],
+            type=self.types[self.type[i]],
+            teachers=tuple(self.people[c] for c in self.teachers[i]),
+            groups=tuple(self.group_table[c] for c in self.groups[i]),
+            rooms=tuple(self.room_table[c] for c in self.rooms[i]),
+            day_name=self.days[self.day[i]],
+            start_time_str=clock(start),
+            end_time_str=clock(end),
+            start_dt=datetime(first.year, first.month, first.day, start // 60, start % 60),
+            end_dt=datetime(first.year, first.month, first.day, end // 60, end % 60),
+            frequency=frequency,
+            interval=self.interval[i],
+            until_date=until_date,
+            exdates=exdates,
+        )
+
+    def to_model(self) -> ScheduleModel:
+        """Rekonstruise ScheduleModel (isti meta-podaci i entiteti)."""
+        model = ScheduleModel(**self.model_fields)
+        model.events = [self.event(i) for i in range(len(self))]
+        return model
+
+    def weeks(self):
+        """Sedmica prvog pojavljivanja svakog eventa (0 = sedmica najranijeg
+        datuma, sedmice pocinju ponedjeljkom)."""
+        if not len(self):
+            return []
+        first = min(self.date)
+        monday = first - date.fromordinal(first).weekday()
+        return [(d - monday) // 7 for d in self.date]
+
+    # --- Vektorski pristup ---
+
+    def column(self, name):
+        """Kolona kao numpy niz (pogled bez kopiranja) ili array.array."""
+        col = getattr(self, name)
+        if isinstance(col, Membership):
+            raise ValueError(f"'{name}' je clanstvo; koristi membership('{name}')")
+        return np.frombuffer(col, dtype=np.intc) if np is not None else col
+
+    def membership(self, name):
+        """(ptr, idx) CSR clanstva kao numpy nizovi ili array.array."""
+        m = getattr(self, name)
+        if np is not None:
+            return np.frombuffer(m.ptr, dtype=np.intc), np.frombuffer(m.idx, dtype=np.intc)
+        return m.ptr, m.idx
+
+    def events_by(self, name):
+        """Obrnuto clanstvo (entitet -> eventi) za 'teachers', 'groups' ili 'rooms'."""
+        table = {'teachers': self.people, 'groups': self.group_table,
+                 'rooms': self.room_table}[name]
+        return getattr(self, name).transpose(len(table))
+
+
+def clock(minutes):
+    """Minute od ponoci -> 'HH:MM'."""
+    return f"{minutes // 60 % 24:02d}:{minutes % 60:02d}"
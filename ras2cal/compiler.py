@@ -8,11 +8,22 @@ Koraci kompajliranja:
     1. Izgradnja lookup tablela (nastavnici, prostorije, predmeti, grupe)
     2. Obrada assignmenta (razrjesavanje vremena, datuma, entiteta)
     3. Kreiranje Event objekata u ScheduleModel
+
+UID eventa se racuna iz identiteta nastave (predmet, tip, grupe i redni broj
+medju iskazima istog identiteta), pa ubacivanje ili brisanje jednog iskaza
+ne mijenja UID-ove ostalih. compile_incremental() na osnovu prethodnog
+modela ponovo kompajlira samo izmijenjene iskaze i vraca razliku
+(CompileDelta); iskazi istog identiteta pri tome zadrzavaju UID-ove po
+sadrzaju, a ne po poziciji (vidi _identify).
 """
+import gc
+import hashlib
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from .ir import (
+    CompileDelta,
     Event,
     Group,
     LectureType,
@@ -25,6 +36,20 @@ from .models import AssignmentNode, Schedule
 from .utils import format_camel_case
 
 
+@contextmanager
+def _gc_paused():
+    """Iskljucuje GC tokom kompajliranja: nastaje mnogo objekata odjednom,
+    a svaki ciklus GC-a bi prolazio kroz cijeli (vec veliki) heap, pa bi
+    vrijeme po eventu raslo sa velicinom rasporeda (kao u loader.read_cached)."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
 class ScheduleCompiler:
     """Kompajlira Schedule AST u ScheduleModel IR."""
 
@@ -59,14 +84,78 @@ class ScheduleCompiler:
             days=days_dict,
         )
 
+        # Nenastavni dani su isti za sve evente - jedan dijeljeni tuple
+        self.exdates = tuple(self.model.holidays)
+        # Dijeljeni tuple-ovi entiteta (kljuc su identiteti objekata)
+        self._shared = {}
+
+        self._build_time_tables()
+
     def compile(self) -> ScheduleModel:
         """Glavna metoda: kompajlira AST u IR model."""
         self._build_lookups()
-        self._process_assignments()
+        with _gc_paused():
+            self._process_assignments()
+        self.model.index_groups()
         # Propagiraj tipove nastave u IR (koriste ih html_gen i grid_gen)
         self.model.default_types = self.ast.default_types
         return self.model
 
+    def compile_incremental(self, previous: ScheduleModel) -> Tuple[ScheduleModel, CompileDelta]:
+        """Kompajlira AST koristeci prethodni IR model.
+
+        Eventi iskaza koji se nisu promijenili (isti uid i otisak sadrzaja)
+        preuzimaju se iz prethodnog modela bez ponovnog kompajliranja. Ako su
+        se promijenile definicije (termini, dani, semestar, entiteti...),
+        kompajlira se sve, ali se razlika i dalje racuna po uid-u.
+
+        Vraca (model, CompileDelta); eventi su isti kao iz compile(), a
+        UID-ovi iskaza koji dijele identitet preuzimaju se iz prethodnog
+        modela po sadrzaju (pa se mogu razlikovati od rednih brojeva iz
+        compile()).
+        """
+        self.model.context_key = self._context_key()
+        reuse = previous.context_key == self.model.context_key
+        if reuse:
+            # Preuzeti eventi pokazuju na entitete prethodnog modela
+            self.model.people = previous.people
+            self.model.rooms = previous.rooms
+            self.model.groups = previous.groups
+            self.model.subjects = previous.subjects
+            self.model.group_ancestors = previous.group_ancestors
+            self.model.group_descendants = previous.group_descendants
+        else:
+            self._build_lookups()
+
+        with _gc_paused():
+            delta = self._reuse_events(previous, reuse)
+        self.model.index_groups()
+
+        self.model.default_types = self.ast.default_types
+        return self.model, delta
+
+    def _reuse_events(self, previous: ScheduleModel, reuse: bool) -> CompileDelta:
+        """Preuzima nepromijenjene evente iz prethodnog modela, kompajlira
+        ostale i vraca razliku."""
+        old_events = {ev.uid: ev for ev in previous.events}
+        delta = CompileDelta()
+        for source, node, uid, fingerprint in self._identify(previous):
+            old = old_events.pop(uid, None)
+            if reuse and old is not None and previous.fingerprints.get(uid) == fingerprint:
+                ev = old
+            else:
+                ev = self._compile_assignment(node, uid)
+                delta.recompiled += 1
+                if old is None:
+                    delta.added.append(ev)
+                elif _signature(old) != _signature(ev):
+                    delta.changed.append((old, ev))
+            self.model.events.append(ev)
+            self.model.event_sources.append(source)
+            self.model.fingerprints[uid] = fingerprint
+        delta.removed = list(old_events.values())
+        return delta
+
     # ------------------------------------------------------------------
     # Pomocne metode
     # ------------------------------------------------------------------
@@ -78,6 +167,67 @@ class ScheduleCompiler:
             type_code, LectureType(type_code, type_code, 99)
         )
 
+    def _context_key(self) -> str:
+        """Otisak svih definicija od kojih zavisi kompajliranje iskaza nastave."""
+        ast = self.ast
+        parts = (
+            [(name, node.number) for name, node in ast.days.items()],
+            [(sid, node.day_name, node.number) for sid, node in ast.slots.items()],
+            list(ast.teachers),
+            list(ast.rooms),
+            [(name, sorted(node.types)) for name, node in ast.subjects.items()],
+            list(ast.study_groups),
+            [(name, node.parent) for name, node in ast.subgroups.items()],
+            list(ast.default_types.items()),
+            ast.base_time, self.slot_duration,
+            self.semester_start, self.semester_end, self.model.holidays,
+        )
+        return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()
+
+    def _identify(self, previous: ScheduleModel = None):
+        """Za svaki iskaz nastave sa terminima vraca (indeks iskaza, cvor,
+        uid, otisak).
+
+        Identitet nastave je (predmet, tip, grupe); iskazi istog identiteta
+        (npr. dva termina vjezbi iste grupe) razlikuju se rednim brojem.
+        Otisak pokriva i ostatak sadrzaja (nastavnici, prostorije, termini,
+        interval), pa izmjena termina daje isti uid i drugi otisak.
+
+        Uz prethodni model uid-ovi istog identiteta se dodjeljuju po
+        sadrzaju (vidi _assign_uids), pa dodavanje, brisanje ili
+        premjestanje jednog iskaza ne mijenja uid-ove ostalih.
+
+        I uid i otisak su blake2b, pa su stabilni izmedju procesa i
+        pokretanja (model se moze sacuvati i koristiti kao prethodni)."""
+        items = []
+        groups = {}   # identitet -> (blake2b stanje identiteta, indeksi u items)
+        for source, node in enumerate(self.ast.assignments):
+            if not node.slots:
+                continue
+            identity = (node.subject, node.type, tuple(map(tuple, node.groups)))
+            group = groups.get(identity)
+            if group is None:
+                base = hashlib.blake2b(repr(identity).encode('utf-8'), digest_size=8)
+                group = groups[identity] = (base, [])
+            group[1].append(len(items))
+            h = group[0].copy()
+            h.update(repr((tuple(node.teachers), tuple(node.rooms), tuple(node.slots),
+                           node.recurrence_interval)).encode('utf-8'))
+            fingerprint = h.hexdigest()
+            items.append([source, node, None, fingerprint])
+
+        for base, members in groups.values():
+            key = base.hexdigest()
+            old = previous.uid_groups.get(key, ()) if previous is not None else ()
+            uids = _assign_uids(base, [items[i][3] for i in members], old,
+                                previous.fingerprints if previous is not None else {})
+            for i, uid in zip(members, uids):
+                items[i][2] = uid
+            self.model.uid_groups[key] = uids
+
+        for source, node, uid, fingerprint in items:
+            yield source, node, uid, fingerprint
+
     def _build_lookups(self):
         """Gradi lookup rjecnike iz AST definicija."""
 
@@ -114,109 +264,198 @@ class ScheduleCompiler:
                 child.parent = parent
                 parent.subgroups.append(child)
 
-    def _resolve_time(self, slot_id: str) -> tuple:
-        """Razrijesava ID termina u (start_datetime, duration_minutes).
-        Koristi AST slot definicije za racunanje vremena."""
-        slot_def = self.ast.slots.get(slot_id)
-        if not slot_def:
-            raise ValueError(f"Termin '{slot_id}' nije definisan u AST-u")
-
-        # Svaki slot_number predstavlja jedan slot_duration interval od base_time
-        minutes_offset = (slot_def.number - 1) * self.slot_duration
-        start_dt = self.base_time + timedelta(minutes=minutes_offset)
-
-        return start_dt, self.slot_duration
+        # Treci prolaz: zatvorenje hijerarhije (jednom, umjesto rekurzije po upitu)
+        self._build_group_closure()
+
+    def _build_group_closure(self):
+        """Popunjava model.group_ancestors i model.group_descendants."""
+        ancestors = {}
+        descendants = {group_id: [] for group_id in self.model.groups}
+        for group_id, group in self.model.groups.items():
+            chain = []
+            parent = group.parent
+            while parent is not None and parent.id not in chain and parent.id != group_id:
+                chain.append(parent.id)
+                descendants.setdefault(parent.id, []).append(group_id)
+                parent = parent.parent
+            ancestors[group_id] = tuple(chain)
+        self.model.group_ancestors = ancestors
+        self.model.group_descendants = {
+            group_id: tuple(sorted(ids)) for group_id, ids in descendants.items()
+        }
+
+    def _share(self, items) -> tuple:
+        """Vraca tuple entiteta; evente sa istim nastavnicima (grupama,
+        prostorijama) dijele isti tuple objekat umjesto vlastite liste."""
+        key = tuple(map(id, items))
+        shared = self._shared.get(key)
+        if shared is None:
+            shared = self._shared[key] = tuple(items)
+        return shared
+
+    def _build_time_tables(self):
+        """Precalculira vremena svih termina i datume prvog pojavljivanja dana,
+        pa je razrjesavanje vremena iskaza nastave samo lookup u tablicama.
+
+        _slot_times:  slot_id -> (pocetak, kraj, dan); pocetak i kraj su
+                      minute od ponoci (cijeli brojevi)
+        _first_dates: dan -> datetime prvog pojavljivanja dana u semestru
+        _clock:       minute -> 'HH:MM' za sve pocetke i krajeve termina
+        _moments:     (dan, minute) -> datetime, dijeljen izmedju evenata"""
+        base = self.base_time.hour * 60 + self.base_time.minute
+        self._slot_times = {}
+        self._clock = {}
+        for slot_id, node in self.ast.slots.items():
+            # Svaki slot_number predstavlja jedan slot_duration interval od base_time
+            start = base + (node.number - 1) * self.slot_duration
+            end = start + self.slot_duration
+            self._slot_times[slot_id] = (start, end, node.day_name)
+            for minutes in (start, end):
+                self._clock[minutes] = f"{minutes // 60 % 24:02d}:{minutes % 60:02d}"
+
+        # Indeks dana (0-based, Mon=0) -> datum prvog pojavljivanja u semestru
+        sem_start_weekday = self.semester_start.weekday()
+        self._first_dates = {}
+        for day_name, node in self.ast.days.items():
+            days_diff = (node.number - 1 - sem_start_weekday + 7) % 7
+            self._first_dates[day_name] = self.semester_start + timedelta(days=days_diff)
+
+        self._moments = {}
+
+    def _moment(self, day_name: str, minutes: int) -> datetime:
+        """Datum prvog pojavljivanja dana sa vremenom u minutama od ponoci."""
+        key = (day_name, minutes)
+        moment = self._moments.get(key)
+        if moment is None:
+            moment = self._moments[key] = self._first_dates[day_name].replace(
+                hour=minutes // 60 % 24, minute=minutes % 60)
+        return moment
 
     def _process_assignments(self):
         """Obradjuje sve AssignmentNode-ove i kreira Event objekte."""
-        uid_counter = 1
+        self.model.context_key = self._context_key()
+        for source, node, uid, fingerprint in self._identify():
+            self.model.events.append(self._compile_assignment(node, uid))
+            self.model.event_sources.append(source)
+            self.model.fingerprints[uid] = fingerprint
+
+    def _compile_assignment(self, node: AssignmentNode, uid: str) -> Event:
+        """Kompajlira jedan iskaz nastave (sa terminima) u Event."""
+        # Razrijesi entitete (sa fallback za nedefinirane)
+        teachers = [
+            self.model.people.get(t, Person(t, format_camel_case(t)))
+            for t in node.teachers
+        ]
+        rooms = [
+            self.model.rooms.get(r, Room(r, r))
+            for r in node.rooms
+        ]
+
+        # Razrijesi grupe (preskoci "Svi")
+        event_groups = []
+        for sublist in node.groups:
+            for g_name in sublist:
+                if g_name == "Svi":
+                    continue
+                g = self.model.groups.get(g_name, Group(g_name, g_name))
+                event_groups.append(g)
+
+        # Razrijesi predmet (kreiraj implicitni ako ne postoji)
+        subj = self.model.subjects.get(node.subject)
+        if not subj:
+            l_type = self._resolve_type(node.type)
+            subj = Subject(
+                id=node.subject,
+                name=format_camel_case(node.subject),
+                types={l_type},
+            )
 
-        for node in self.ast.assignments:
-            if not node.slots:
-                continue
+        l_type = self._resolve_type(node.type)
 
-            # Razrijesi entitete (sa fallback za nedefinirane)
-            teachers = [
-                self.model.people.get(t, Person(t, format_camel_case(t)))
-                for t in node.teachers
-            ]
-            rooms = [
-                self.model.rooms.get(r, Room(r, r))
-                for r in node.rooms
-            ]
-
-            # Razrijesi grupe (preskoci "Svi")
-            event_groups = []
-            for sublist in node.groups:
-                for g_name in sublist:
-                    if g_name == "Svi":
-                        continue
-                    g = self.model.groups.get(g_name, Group(g_name, g_name))
-                    event_groups.append(g)
-
-            # Razrijesi predmet (kreiraj implicitni ako ne postoji)
-            subj = self.model.subjects.get(node.subject)
-            if not subj:
-                l_type = self._resolve_type(node.type)
-                subj = Subject(
-                    id=node.subject,
-                    name=format_camel_case(node.subject),
-                    types={l_type},
-                )
+        # Razrijesi vrijeme iz tablice termina (od najranijeg do najkasnijeg)
+        slot_times = self._slot_times
+        try:
+            times = [slot_times[slot_id] for slot_id in node.slots]
+        except KeyError as e:
+            raise ValueError(f"Termin '{e.args[0]}' nije definisan u AST-u") from None
+        if len(times) == 1:
+            start, end, day_name = times[0]
+        else:
+            start = min([t[0] for t in times])
+            end = max([t[1] for t in times])
+            # Dan se uzima iz prvog slota
+            day_name = times[0][2]
+
+        if day_name not in self._first_dates:
+            raise ValueError(f"Dan '{day_name}' nije definisan u AST-u")
+
+        # Kreiraj Event
+        return Event(
+            uid=uid,
+            subject=subj,
+            type=l_type,
+            teachers=self._share(teachers),
+            groups=self._share(event_groups),
+            rooms=self._share(rooms),
+            day_name=day_name,
+            start_time_str=self._clock[start],
+            end_time_str=self._clock[end],
+            start_dt=self._moment(day_name, start),
+            end_dt=self._moment(day_name, end),
+            frequency="WEEKLY",
+            interval=node.recurrence_interval,
+            until_date=self.semester_end,
+            exdates=self.exdates,
+        )
 
-            l_type = self._resolve_type(node.type)
 
-            # Razrijesi vrijeme iz slotova (od najranijeg do najkasnijeg)
-            slot_times = []
-            for slot_id in node.slots:
-                start_dt, duration = self._resolve_time(slot_id)
-                end_dt = start_dt + timedelta(minutes=duration)
-                slot_times.append((start_dt, end_dt))
-
-            start_t = min(st[0] for st in slot_times)
-            end_t = max(st[1] for st in slot_times)
-            start_str = start_t.strftime("%H:%M")
-            end_str = end_t.strftime("%H:%M")
-
-            # Razrijesi dan iz prvog slota
-            first_slot_def = self.ast.slots.get(node.slots[0])
-            if not first_slot_def:
-                raise ValueError(f"Termin '{node.slots[0]}' nije definisan u AST-u")
-            day_name = first_slot_def.day_name
-
-            day_def = self.ast.days.get(day_name)
-            if not day_def:
-                raise ValueError(f"Dan '{day_name}' nije definisan u AST-u")
-
-            # Indeks dana (0-based, Mon=0)
-            day_idx = day_def.number - 1
-
-            # Datum prvog pojavljivanja u semestru
-            sem_start_weekday = self.semester_start.weekday()
-            days_diff = (day_idx - sem_start_weekday + 7) % 7
-            first_date = self.semester_start + timedelta(days=days_diff)
-
-            # Konstruisi kompletne datetime-ove
-            start_dt = first_date.replace(hour=start_t.hour, minute=start_t.minute)
-            end_dt = first_date.replace(hour=end_t.hour, minute=end_t.minute)
-
-            # Kreiraj Event
-            ev = Event(
-                uid=f"EV-{uid_counter}",
-                subject=subj,
-                type=l_type,
-                teachers=teachers,
-                groups=event_groups,
-                rooms=rooms,
-                day_name=day_name,
-                start_time_str=start_str,
-                end_time_str=end_str,
-                start_dt=start_dt,
-                end_dt=end_dt,
-                frequency="WEEKLY",
-                interval=node.recurrence_interval,
-                until_date=self.semester_end,
-                exdates=self.model.holidays,
-            )
-            self.model.events.append(ev)
-            uid_counter += 1
+def _assign_uids(base, fingerprints: List[str], old, old_fingerprints) -> List[str]:
+    """uid-ovi iskaza jednog identiteta (otisci redom iskaza).
+
+    Bez prethodnih uid-ova (old) to su redni brojevi. Inace iskaz prvo
+    dobija prethodni uid sa istim otiskom (nepromijenjen iskaz), zatim
+    preostale prethodne uid-ove redom (izmijenjen iskaz), a tek onda novi
+    redni broj koji nije bio zauzet."""
+    def numbered(n):
+        h = base.copy()
+        h.update(b'#%d' % n)
+        return f"EV-{h.hexdigest()}"
+
+    if not old:
+        return [numbered(n) for n in range(len(fingerprints))]
+
+    uids = [None] * len(fingerprints)
+    free = {}       # otisak -> prethodni uid-ovi sa tim otiskom (redom)
+    for uid in old:
+        free.setdefault(old_fingerprints.get(uid), []).append(uid)
+    taken = set()
+    for i, fingerprint in enumerate(fingerprints):
+        candidates = free.get(fingerprint)
+        if candidates:
+            uids[i] = candidates.pop(0)
+            taken.add(uids[i])
+
+    rest = (uid for uid in old if uid not in taken)
+    used, n = set(old), 0
+    for i, uid in enumerate(uids):
+        if uid is None:
+            uid = next(rest, None)
+            if uid is None:
+                while numbered(n) in used:
+                    n += 1
+                uid = numbered(n)
+                used.add(uid)
+            uids[i] = uid
+    return uids
+
+
+def _signature(ev: Event) -> tuple:
+    """Sadrzaj eventa bez uid-a (za poredjenje starog i novog eventa)."""
+    return (
+        ev.subject.id, ev.subject.name, ev.type,
+        tuple((p.id, p.name) for p in ev.teachers),
+        tuple(g.id for g in ev.groups),
+        tuple(r.id for r in ev.rooms),
+        ev.day_name, ev.start_time_str, ev.end_time_str, ev.start_dt, ev.end_dt,
+        ev.frequency, ev.interval, ev.until_date, ev.exdates,
+    )
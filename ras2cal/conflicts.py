@@ -0,0 +1,170 @@
+"""
+conflicts.py - Detekcija konflikata (dvostruko zauzeti nastavnici, prostorije, grupe)
+
+Radi nad kompajliranim IR-om preko kolonskog prikaza (columnar.py): za
+svaku vrstu entiteta gradi se lista intervala (entitet, dan, pocetak, kraj,
+event), sortira se i prolazi jednom (sweep) po (entitet, dan), uz listu
+aktivnih intervala. Ukupno O(n log n + k), gdje je k broj preklapanja.
+
+Pravila:
+    - grupe: event grupe vazi i za sve njene podgrupe; zato se event
+      upisuje i kod predaka grupe (Group.get_all_ancestors) kao
+      "naslijedjen", a par se prijavljuje samo ako je bar jedan od dva
+      eventa direktno za tu grupu (dvije podgrupe istog odjeljenja u isto
+      vrijeme nisu konflikt)
+    - ponavljanje: event sa intervalom n je u sedmicama w0, w0+n, ...;
+      dva eventa se sijeku samo ako je w0a = w0b (mod nzd(na, nb)), pa npr.
+      vjezbe svake druge sedmice u parnim i neparnim sedmicama nisu konflikt
+    - zajednicka nastava: isti predmet, tip, vrijeme, nastavnici i
+      prostorije (npr. isto predavanje zapisano posebno za vise odjeljenja)
+      nije konflikt; isto predavanje u drugoj prostoriji jeste
+"""
+from dataclasses import dataclass
+from math import gcd
+
+from .columnar import ColumnarSchedule
+from .ir import Event
+
+# Vrste entiteta: (naziv u izvjestaju, clanstvo u ColumnarSchedule, tablica)
+KINDS = {
+    'teachers': ('nastavnik', 'teachers', 'people'),
+    'rooms': ('prostorija', 'rooms', 'room_table'),
+    'groups': ('grupa', 'groups', 'group_table'),
+}
+
+
+@dataclass
+class Conflict:
+    """Dva eventa koja istovremeno zauzimaju isti entitet."""
+    kind: str           # 'nastavnik', 'prostorija' ili 'grupa'
+    entity: str         # naziv entiteta
+    first: Event
+    second: Event
+
+    def __str__(self):
+        a, b = self.first, self.second
+        return (f"Konflikt ({self.kind} {self.entity}), {a.day_name}: "
+                f"{a.start_time_str}-{a.end_time_str} {a.subject.name} ({a.type.code}) / "
+                f"{b.start_time_str}-{b.end_time_str} {b.subject.name} ({b.type.code})")
+
+
+def find_conflicts(model, kinds=tuple(KINDS), columns=None):
+    """Vraca listu Conflict-a u modelu, sortiranu po vrsti, entitetu, danu i vremenu.
+
+    Args:
+        model: ScheduleModel (IR)
+        kinds: vrste entiteta koje se provjeravaju ('teachers', 'rooms', 'groups')
+        columns: vec izgradjen ColumnarSchedule za isti model (opcionalno)
+    """
+    cs = columns if columns is not None else ColumnarSchedule.from_model(model)
+    if not len(cs):
+        return []
+
+    weeks = cs.weeks()
+
+    events = model.events
+    conflicts = []
+    for kind in kinds:
+        _, membership, table = KINDS[kind]
+        table = getattr(cs, table)
+        names = [entity.name for entity in table]
+        ancestors = _ancestor_codes(table, names) if kind == 'groups' else None
+        entries = _entries(cs, getattr(cs, membership), ancestors)
+        for code, i, j in _sweep(cs, entries, weeks):
+            # Raniji event prvi
+            if (cs.start[j], j) < (cs.start[i], i):
+                i, j = j, i
+            conflicts.append((kind, names[code], cs.date[i], cs.start[i], i, j))
+
+    order = {kind: n for n, kind in enumerate(KINDS)}
+    conflicts.sort(key=lambda c: (order[c[0]],) + c[1:])
+    return [Conflict(KINDS[kind][0], entity, events[i], events[j])
+            for kind, entity, _, _, i, j in conflicts]
+
+
+# ---------------------------------------------------------------------------
+# Intervali i sweep
+# ---------------------------------------------------------------------------
+
+def _entries(cs, membership, ancestors=None):
+    """Lista (entitet, dan, pocetak, kraj, event, direktno) za sve evente.
+    Uz ancestors (kod -> kodovi predaka) event se dodaje i svim precima
+    (direktno=False)."""
+    day, start, end = cs.day, cs.start, cs.end
+    entries = []
+    for i in range(len(cs)):
+        codes = membership[i]
+        if not codes:
+            continue
+        d, s, e = day[i], start[i], end[i]
+        seen = set()
+        for code in codes:
+            if code not in seen:
+                seen.add(code)
+                entries.append((code, d, s, e, i, True))
+        if ancestors is not None:
+            for code in codes:
+                for parent in ancestors[code]:
+                    if parent not in seen:
+                        seen.add(parent)
+                        entries.append((parent, d, s, e, i, False))
+    entries.sort()
+    return entries
+
+
+def _sweep(cs, entries, weeks):
+    """Prolazi sortirane intervale i vraca (entitet, i, j) za svaki konflikt."""
+    interval = cs.interval
+    found = set()
+    active = []         # (kraj, event, direktno) za trenutni (entitet, dan)
+    current = None
+    for code, d, s, e, i, direct in entries:
+        if (code, d) != current:
+            current = (code, d)
+            active = []
+        elif active:
+            active = [a for a in active if a[0] > s]
+        for a_end, j, a_direct in active:
+            if not (direct or a_direct) or j == i:
+                continue
+            pair = (j, i) if j < i else (i, j)
+            if pair in found:
+                continue
+            if (weeks[i] - weeks[j]) % gcd(interval[i], interval[j]):
+                continue
+            if _joint(cs, i, j):
+                continue
+            found.add(pair)
+            yield code, pair[0], pair[1]
+        active.append((e, i, direct))
+
+
+def _joint(cs, i, j):
+    """Isti predmet, tip, vrijeme, nastavnici i prostorije - jedna
+    (zajednicka) nastava."""
+    return (cs.subject[i] == cs.subject[j] and cs.type[i] == cs.type[j]
+            and cs.start[i] == cs.start[j] and cs.end[i] == cs.end[j]
+            and cs.teachers[i] == cs.teachers[j]
+            and set(cs.rooms[i]) == set(cs.rooms[j]))
+
+
+# ---------------------------------------------------------------------------
+# Hijerarhija grupa
+# ---------------------------------------------------------------------------
+
+def _ancestor_codes(table, names):
+    """Kod grupe -> kodovi svih predaka. Predci koji se ne pojavljuju u
+    eventima dobijaju nove kodove (iza tablice), a njihovi nazivi se
+    dodaju u names."""
+    codes = {group.id: code for code, group in enumerate(table)}
+    result = []
+    for group in list(table):
+        parents = []
+        for ancestor in sorted(group.get_all_ancestors(), key=lambda g: g.id):
+            code = codes.get(ancestor.id)
+            if code is None:
+                code = codes[ancestor.id] = len(names)
+                names.append(ancestor.name)
+            parents.append(code)
+        result.append(parents)
+    return result
@@ -73,11 +73,17 @@ class Exporter:
             for word in name.split(" ")
         )
 
+    def _to_source_name(self, name):
+        """Vraca ime kako je napisano u izvoru (Schedule.source_names), a za
+        imena kojih tamo nema (npr. dodana programski) PascalCase oblik."""
+        source = self.schedule.source_names.get(name)
+        return source if source is not None else self._to_pascal(name)
+
     def _to_source_subject(self, name, type_code):
         """Pretvara naziv predmeta i kod tipa nazad u source format.
         Primjer: ('Uvod U Programiranje', 'P') -> 'pUvodUProgramiranje'"""
         prefix = type_code.lower()
-        return f"{prefix}{self._to_pascal(name)}"
+        return f"{prefix}{self._to_source_name(name)}"
 
     # ------------------------------------------------------------------
     # Generatori sadrzaja za pojedinacne definicijske fajlove
@@ -136,7 +142,7 @@ class Exporter:
         )
         for lt in sorted_types:
             lines.append(
-                f"{lt.code} je tip nastave {self._to_pascal(lt.name)}"
+                f"{lt.code} je tip nastave {self._to_source_name(lt.name)}"
                 f" prioriteta {lt.priority}."
             )
 
@@ -147,7 +153,7 @@ class Exporter:
         lines = ["// Definicije Nastavnika"]
 
         for node in self.schedule.teachers.values():
-            lines.append(f"{self._to_pascal(node.name)} je nastavnik.")
+            lines.append(f"{self._to_source_name(node.name)} je nastavnik.")
 
         return "\n".join(lines)
 
@@ -157,7 +163,7 @@ class Exporter:
 
         for node in self.schedule.subjects.values():
             if not node.types:
-                lines.append(f"{self._to_pascal(node.name)} je predmet.")
+                lines.append(f"{self._to_source_name(node.name)} je predmet.")
             for t in node.types:
                 lines.append(f"{self._to_source_subject(node.name, t)} je predmet.")
 
@@ -209,7 +215,7 @@ class Exporter:
             ])
 
         for node in assignments:
-            teachers_str = " i ".join(self._to_pascal(t) for t in node.teachers)
+            teachers_str = " i ".join(self._to_source_name(t) for t in node.teachers)
             subject_str = self._to_source_subject(node.subject, node.type)
 
             groups_parts = []
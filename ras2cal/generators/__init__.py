@@ -9,5 +9,5 @@ Dostupni generatori:
 """
 from .grid_gen import GridGenerator
 from .html_gen import HTMLScheduleGenerator
-from .json_gen import JSONScheduleGenerator
+from .json_gen import JSON_FORMATS, JSONScheduleGenerator, write_json_output
 from .md_gen import MarkdownReportGenerator
@@ -6,26 +6,144 @@ kolone su dani, a celije sadrze evente.
 
 Za svakog nastavnika generise zasebnu tabelu sa page-break-om za print.
 Vremenske slots se generisu dinamicki na osnovu evenata u rasporedu.
+
+Sekcije nastavnika se upisuju u fajl redom, jedna po jedna (cijeli
+dokument se ne drzi u memoriji); uz jobs > 1 generisu se u pool-u
+procesa. Uz split se zapisuje i po jedan fajl za svakog nastavnika
+(nastavnici/) sa zajednickim stilovima u grid.css.
 """
 import os
-from datetime import datetime, timedelta
-
-from ..utils import merge_events, prepare_raw_data, condense_teachers
+import textwrap
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# Fajlovi po nastavniku (uz split) i zajednicki stilovi, u output_dir
+TEACHERS_DIR = "nastavnici"
+STYLESHEET = "grid.css"
+
+# Najvise nastavnika u jednom dijelu posla za pool procesa
+CHUNK_SIZE = 32
+
+PAGE_BREAK = '<p style="page-break-after: always;">&nbsp;</p>\n'
+
+# Stilovi grid prikaza (ugradjeni u zaglavlje ili zapisani u grid.css)
+GRID_CSS = """\
+@page {
+    size: A4 landscape;
+    margin: 15mm;
+}
+
+* { box-sizing: border-box; }
+
+body {
+    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+    margin: 0; padding: 15px;
+    background-color: #f5f7fa; color: #333;
+}
+
+.container {
+    max-width: 100%; margin: 0 auto;
+    background: white; border-radius: 8px;
+    box-shadow: 0 2px 10px rgba(0,0,0,0.1); overflow: hidden;
+}
+
+header {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white; padding: 20px; text-align: center;
+}
+
+h1 { margin: 0; font-size: 1.8em; font-weight: 600; }
+
+.teacher-section { margin: 20px 0; padding: 0 15px; }
+
+.teacher-header {
+    background: #4a90e2; color: white;
+    padding: 12px 15px; margin: 0; font-size: 1.2em;
+    border-radius: 4px 4px 0 0;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+}
+
+table {
+    width: 100%; border-collapse: collapse;
+    margin: 10px 0 20px 0; background: white;
+    border-radius: 4px; overflow: hidden;
+    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+}
+
+th {
+    background: #2c3e50; color: white;
+    padding: 12px 8px; text-align: center;
+    font-weight: 600; font-size: 0.9em;
+    border: 1px solid #34495e;
+}
+
+td {
+    padding: 8px; text-align: center;
+    border: 1px solid #e0e0e0; vertical-align: middle;
+    font-size: 0.85em; min-height: 40px;
+}
+
+tr:nth-child(even) { background-color: #f8f9fa; }
+tr:nth-child(odd) { background-color: white; }
+
+.time-cell {
+    background: #ecf0f1; font-weight: 600;
+    text-align: center; min-width: 80px; width: 80px !important;
+}
+
+.event-cell { text-align: left; padding: 5px 8px; }
+
+.event-type {
+    display: inline-block; padding: 2px 6px;
+    border-radius: 3px; font-weight: bold;
+    font-size: 0.8em; margin-bottom: 2px;
+}
+
+/* CSS klase za tipove nastave */
+.tag-P { background-color: #e3f2fd; color: #1976d2; }
+.tag-V { background-color: #e8f5e8; color: #388e3c; }
+.tag-L { background-color: #fff3e0; color: #f57c00; }
+.tag-T { background-color: #f3e5f5; color: #7b1fa2; }
+.tag-N { background-color: #ffebee; color: #d32f2f; }
+
+.event-details { line-height: 1.3; }
+.event-subject { font-weight: 600; color: #2c3e50; display: block; }
+.event-groups { color: #7f8c8d; font-size: 0.8em; display: block; }
+.event-room { color: #95a5a6; font-size: 0.8em; display: block; }
+
+@media print {
+    body { background: white; padding: 0; }
+    .container { box-shadow: none; border-radius: 0; }
+    @page { size: A4 landscape; margin: 10mm; }
+}
+"""
 
 
 class GridGenerator:
     """Generator za tabelarni grid prikaz rasporeda.
 
     Pristup:
-        1. Generise matricu (dani x slotovi) za svakog nastavnika
+        1. Generise matricu (slotovi x dani, ravna lista) za svakog nastavnika
         2. Popunjava matricu eventima
-        3. Renderuje HTML tabelu iz matrice
+        3. Renderuje HTML tabelu iz matrice i upisuje je u fajl
     """
 
-    def __init__(self, model, output_dir, title=None):
+    def __init__(self, model, output_dir, title=None, jobs=1, split=False):
+        """
+        Args:
+            model: ScheduleModel (IR)
+            output_dir: direktorij izlaza
+            title: naslov izvjestaja
+            jobs: broj procesa za generisanje sekcija (0 = broj jezgara)
+            split: zapisi i po jedan fajl za svakog nastavnika (nastavnici/)
+                   sa zajednickim grid.css
+        """
         self.model = model
         self.output_dir = output_dir.rstrip('/')
         self.title = title or f"Raspored - {model.semester_name}"
+        self.jobs = jobs
+        self.split = split
 
         # Konfiguracija vremena iz modela
         self.base_time_str = model.base_time
@@ -43,11 +161,13 @@ class GridGenerator:
 
         # Generirani vremenski slotovi (dinamicki iz evenata)
         self.time_slots = self._generate_time_slots()
+        self._slot_index = {}   # "HH:MM" -> indeks slota (_get_time_slot_index)
 
-        # Sortirani dani
+        # Sortirani dani i indeks dana u matrici
         self.days = sorted(
             self.model.days.keys(), key=lambda d: self.day_order.get(d, 99)
         )
+        self.day_index = {day: i for i, day in enumerate(self.days)}
 
     # ------------------------------------------------------------------
     # Vremenski slotovi
@@ -59,85 +179,73 @@ class GridGenerator:
         if not self.model.events:
             return self._generate_default_slots()
 
-        # Nadje najraniji pocetak i najkasniji kraj
-        min_time = None
-        max_time = None
-        for event in self.model.events:
-            start = datetime.strptime(event.start_time_str, "%H:%M")
-            end = datetime.strptime(event.end_time_str, "%H:%M")
-            if min_time is None or start < min_time:
-                min_time = start
-            if max_time is None or end > max_time:
-                max_time = end
+        # Nadje najraniji pocetak i najkasniji kraj (u minutama od ponoci)
+        min_time = min(_minutes(ev.start_time_str) for ev in self.model.events)
+        max_time = max(_minutes(ev.end_time_str) for ev in self.model.events)
 
         # Padding
-        if min_time:
-            min_time -= timedelta(hours=1)
-        if max_time:
-            max_time += timedelta(hours=1)
-
-        return self._build_slots(
-            min_time or self.base_time,
-            max_time or (self.base_time + timedelta(hours=12)),
-        )
+        return self._build_slots(min_time - 60, max_time + 60)
 
     def _generate_default_slots(self):
         """Generise podrazumijevane slotove (08:00 - 20:00)."""
-        return self._build_slots(
-            self.base_time, self.base_time + timedelta(hours=12)
-        )
+        base = self.base_time.hour * 60 + self.base_time.minute
+        return self._build_slots(base, base + 12 * 60)
 
     def _build_slots(self, start, end):
-        """Gradi listu slot rjecnika od start do end vremena."""
+        """Gradi listu slot rjecnika od start do end (minute od ponoci)."""
         slots = []
-        current = start
-        slot_number = 1
-        while current < end:
+        for slot_number, minutes in enumerate(range(start, end, self.slot_duration), 1):
             slots.append({
                 'number': slot_number,
-                'time': current.strftime("%H:%M"),
-                'datetime': current,
+                'time': f"{minutes // 60 % 24:02d}:{minutes % 60:02d}",
+                'minutes': minutes,
             })
-            current += timedelta(minutes=self.slot_duration)
-            slot_number += 1
         return slots
 
     def _get_time_slot_index(self, time_str):
-        """Vraca indeks slota za dato vrijeme. Vraca -1 ako nije nadjen."""
-        time_obj = datetime.strptime(time_str, "%H:%M")
-        for i, slot in enumerate(self.time_slots):
-            if abs((time_obj - slot['datetime']).total_seconds()) < self.slot_duration * 60:
-                return i
-        return -1
+        """Vraca indeks slota za dato vrijeme. Vraca -1 ako nije nadjen.
+
+        Prvi slot koji je od vremena udaljen manje od trajanja slota;
+        slotovi idu u jednakim koracima, pa je to (t - prvi) // trajanje.
+        Rezultat se pamti po stringu vremena."""
+        index = self._slot_index.get(time_str)
+        if index is None:
+            if not self.time_slots:
+                return -1
+            offset = _minutes(time_str) - self.time_slots[0]['minutes']
+            index = offset // self.slot_duration
+            if index < 0:
+                index = 0 if offset > -self.slot_duration else -1
+            elif index >= len(self.time_slots):
+                index = -1
+            self._slot_index[time_str] = index
+        return index
 
     # ------------------------------------------------------------------
     # Priprema podataka
     # ------------------------------------------------------------------
 
-    # _prepare_raw_data i _condense_teachers su sada u utils.py
-    # kao zajednicke funkcije prepare_raw_data() i condense_teachers()
+    # Redovi (prepare_raw_data, merge_events, condense_teachers iz utils.py)
+    # dolaze iz self.model.prepared() i dijele se sa ostalim generatorima
 
     # ------------------------------------------------------------------
     # Matrica rasporeda
     # ------------------------------------------------------------------
 
     def _build_schedule_matrix(self, events):
-        """Gradi matricu (dani x slotovi) popunjenu eventima.
-        Vraca dict: {(dan_idx, slot_idx): [eventi]}"""
-        matrix = {}
-
-        # Inicijalizacija prazne matrice
-        for day_idx in range(len(self.days)):
-            for slot_idx in range(len(self.time_slots)):
-                matrix[(day_idx, slot_idx)] = []
+        """Gradi matricu (slotovi x dani) popunjenu eventima.
+        Vraca ravnu listu: celija (dan_idx, slot_idx) je na indeksu
+        slot_idx * broj_dana + dan_idx, a sadrzi listu evenata ili None."""
+        n_days = len(self.days)
+        n_slots = len(self.time_slots)
+        matrix = [None] * (n_days * n_slots)
 
         # Popunjavanje eventima
         for event in events:
-            day = event['datum']
-            if day not in self.days:
+            day_idx = self.day_index.get(event['datum'])
+            if day_idx is None:
                 continue
 
-            day_idx = self.days.index(day)
             start_idx = self._get_time_slot_index(event['vrijeme_start'])
             end_idx = self._get_time_slot_index(event['vrijeme_kraj'])
 
@@ -146,8 +254,12 @@ class GridGenerator:
 
             # Popuni sve slotove koje event zauzima
             end_bound = end_idx + 1 if end_idx != -1 else start_idx + 1
-            for idx in range(start_idx, min(end_bound, len(self.time_slots))):
-                matrix.setdefault((day_idx, idx), []).append(event)
+            for idx in range(start_idx, min(end_bound, n_slots)):
+                cell = idx * n_days + day_idx
+                if matrix[cell] is None:
+                    matrix[cell] = [event]
+                else:
+                    matrix[cell].append(event)
 
         return matrix
 
@@ -159,16 +271,17 @@ class GridGenerator:
         """Generise grid HTML fajl sa tabelama za svakog nastavnika."""
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
+        if self.split:
+            os.makedirs(os.path.join(self.output_dir, TEACHERS_DIR), exist_ok=True)
+            with open(os.path.join(self.output_dir, STYLESHEET), "w", encoding="utf-8") as f:
+                f.write(GRID_CSS)
 
-        # Priprema podataka (zajednicke funkcije iz utils)
-        raw_data = prepare_raw_data(self.model.events)
-        merged_data = merge_events(raw_data)
-        condensed_data = condense_teachers(merged_data)
-
-        self._generate_grid_html(condensed_data)
+        # Priprema podataka (dijeli se sa ostalim generatorima istog modela)
+        self._generate_grid_html(self.model.prepared().condensed_merged)
 
     def _generate_grid_html(self, events):
-        """Generise grid HTML sa sekcijama za svakog nastavnika."""
+        """Generise grid HTML sa sekcijama za svakog nastavnika.
+        Sekcije se upisuju u fajl redom, cim su generisane."""
         # Grupisanje po nastavniku
         teachers_events = {}
         for event in events:
@@ -177,24 +290,65 @@ class GridGenerator:
 
         sorted_teachers = sorted(teachers_events.keys())
 
-        # HTML izlaz
-        html = self._generate_html_header()
-
-        for i, teacher in enumerate(sorted_teachers):
-            matrix = self._build_schedule_matrix(teachers_events[teacher])
-            html += self._generate_teacher_section(
-                teacher, matrix, i, len(sorted_teachers)
-            )
-
-        html += self._generate_html_footer()
-
         # Zapis u fajl
         filename = os.path.join(
             self.output_dir,
             f"grid_{self.model.semester_name.replace(' ', '_')}.html",
         )
         with open(filename, "w", encoding="utf-8") as f:
-            f.write(html)
+            f.write(self._generate_html_header())
+            for sections in self._render_sections(teachers_events, sorted_teachers):
+                f.writelines(sections)
+            f.write(self._generate_html_footer())
+
+    def _render_sections(self, teachers_events, sorted_teachers):
+        """Lijeno vraca liste HTML sekcija nastavnika, redom sorted_teachers.
+
+        Uz jobs > 1 dijelovi liste se generisu u pool-u procesa; u toku je
+        najvise 2 * jobs dijelova, pa je u memoriji samo mali broj sekcija."""
+        total = len(sorted_teachers)
+        numbered = list(enumerate(sorted_teachers))
+        state = (self, teachers_events, total)
+
+        jobs = self.jobs if self.jobs > 0 else os.cpu_count() or 1
+        if jobs <= 1 or total < 2:
+            _init_worker(state)
+            try:
+                for item in numbered:
+                    yield _render_chunk([item])
+            finally:
+                _init_worker(None)
+            return
+
+        size = max(1, min(CHUNK_SIZE, total // (jobs * 4)))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(state,)) as pool:
+            pending = deque()
+            for start in range(0, total, size):
+                pending.append(pool.submit(_render_chunk, numbered[start:start + size]))
+                if len(pending) >= 2 * jobs:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _render_teacher(self, teacher, events, index, total):
+        """HTML sekcija nastavnika za zajednicki fajl; uz split zapisuje
+        i zaseban fajl nastavnika (stilovi iz zajednickog grid.css)."""
+        matrix = self._build_schedule_matrix(events)
+        section = self._generate_teacher_section(teacher, matrix, 0, 1)
+
+        if self.split:
+            filename = os.path.join(self.output_dir, TEACHERS_DIR,
+                                    f"{teacher_key(teacher)}.html")
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write(self._generate_html_header(f"../{STYLESHEET}"))
+                f.write(section)
+                f.write(self._generate_html_footer())
+
+        # Page break za print (osim za zadnjeg nastavnika)
+        if index < total - 1:
+            section += PAGE_BREAK
+        return section
 
     def _generate_teacher_section(self, teacher, matrix, index, total):
         """Generise HTML sekciju za jednog nastavnika."""
@@ -218,9 +372,10 @@ class GridGenerator:
             )
 
             # Kolone za svaki dan
+            row = slot_idx * len(self.days)
             for day_idx in range(len(self.days)):
                 cell_content = ""
-                events_in_cell = matrix.get((day_idx, slot_idx), [])
+                events_in_cell = matrix[row + day_idx] or ()
 
                 for event in events_in_cell:
                     subject = event['predmet']
@@ -242,7 +397,7 @@ class GridGenerator:
 
         # Page break za print (osim za zadnjeg nastavnika)
         if index < total - 1:
-            html += '<p style="page-break-after: always;">&nbsp;</p>\n'
+            html += PAGE_BREAK
 
         return html
 
@@ -250,104 +405,20 @@ class GridGenerator:
     # HTML template (header/footer)
     # ------------------------------------------------------------------
 
-    def _generate_html_header(self):
-        """Generise HTML zaglavlje sa stilovima i JavaScript-om."""
+    def _generate_html_header(self, stylesheet=None):
+        """Generise HTML zaglavlje sa stilovima i JavaScript-om.
+        Uz stylesheet stilovi se ucitavaju iz tog fajla umjesto da se ugrade."""
+        if stylesheet:
+            style = f'    <link rel="stylesheet" href="{stylesheet}">'
+        else:
+            style = f"    <style>\n{textwrap.indent(GRID_CSS, ' ' * 8)}    </style>"
         return f"""<!DOCTYPE html>
 <html>
 <head>
     <meta http-equiv="content-type" content="text/html; charset=UTF-8">
     <meta charset="UTF-8">
     <title>{self.title} - Raspored</title>
-    <style>
-        @page {{
-            size: A4 landscape;
-            margin: 15mm;
-        }}
-
-        * {{ box-sizing: border-box; }}
-
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 0; padding: 15px;
-            background-color: #f5f7fa; color: #333;
-        }}
-
-        .container {{
-            max-width: 100%; margin: 0 auto;
-            background: white; border-radius: 8px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1); overflow: hidden;
-        }}
-
-        header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white; padding: 20px; text-align: center;
-        }}
-
-        h1 {{ margin: 0; font-size: 1.8em; font-weight: 600; }}
-
-        .teacher-section {{ margin: 20px 0; padding: 0 15px; }}
-
-        .teacher-header {{
-            background: #4a90e2; color: white;
-            padding: 12px 15px; margin: 0; font-size: 1.2em;
-            border-radius: 4px 4px 0 0;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-
-        table {{
-            width: 100%; border-collapse: collapse;
-            margin: 10px 0 20px 0; background: white;
-            border-radius: 4px; overflow: hidden;
-            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-        }}
-
-        th {{
-            background: #2c3e50; color: white;
-            padding: 12px 8px; text-align: center;
-            font-weight: 600; font-size: 0.9em;
-            border: 1px solid #34495e;
-        }}
-
-        td {{
-            padding: 8px; text-align: center;
-            border: 1px solid #e0e0e0; vertical-align: middle;
-            font-size: 0.85em; min-height: 40px;
-        }}
-
-        tr:nth-child(even) {{ background-color: #f8f9fa; }}
-        tr:nth-child(odd) {{ background-color: white; }}
-
-        .time-cell {{
-            background: #ecf0f1; font-weight: 600;
-            text-align: center; min-width: 80px; width: 80px !important;
-        }}
-
-        .event-cell {{ text-align: left; padding: 5px 8px; }}
-
-        .event-type {{
-            display: inline-block; padding: 2px 6px;
-            border-radius: 3px; font-weight: bold;
-            font-size: 0.8em; margin-bottom: 2px;
-        }}
-
-        /* CSS klase za tipove nastave */
-        .tag-P {{ background-color: #e3f2fd; color: #1976d2; }}
-        .tag-V {{ background-color: #e8f5e8; color: #388e3c; }}
-        .tag-L {{ background-color: #fff3e0; color: #f57c00; }}
-        .tag-T {{ background-color: #f3e5f5; color: #7b1fa2; }}
-        .tag-N {{ background-color: #ffebee; color: #d32f2f; }}
-
-        .event-details {{ line-height: 1.3; }}
-        .event-subject {{ font-weight: 600; color: #2c3e50; display: block; }}
-        .event-groups {{ color: #7f8c8d; font-size: 0.8em; display: block; }}
-        .event-room {{ color: #95a5a6; font-size: 0.8em; display: block; }}
-
-        @media print {{
-            body {{ background: white; padding: 0; }}
-            .container {{ box-shadow: none; border-radius: 0; }}
-            @page {{ size: A4 landscape; margin: 10mm; }}
-        }}
-    </style>
+{style}
     <script>
         document.addEventListener('DOMContentLoaded', function() {{
             const tables = document.querySelectorAll('table');
@@ -371,3 +442,34 @@ class GridGenerator:
     def _generate_html_footer(self):
         """Generise HTML footer."""
         return "</div></body></html>"
+
+
+def _minutes(time_str):
+    """'HH:MM' -> minute od ponoci."""
+    hours, minutes = time_str.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def teacher_key(teacher):
+    """Ime fajla nastavnika: ime bez razmaka i separatora putanje."""
+    return ''.join(teacher.split()).replace(os.sep, '_').replace('/', '_')
+
+
+# ---------------------------------------------------------------------------
+# Pool procesa
+# ---------------------------------------------------------------------------
+
+# Stanje procesa koji generise sekcije (postavlja ga _init_worker)
+_state = None
+
+
+def _init_worker(state):
+    global _state
+    _state = state
+
+
+def _render_chunk(chunk):
+    """Sekcije za dio liste nastavnika [(redni broj, ime)]."""
+    generator, teachers_events, total = _state
+    return [generator._render_teacher(teacher, teachers_events[teacher], index, total)
+            for index, teacher in chunk]
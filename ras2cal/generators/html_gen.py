@@ -11,7 +11,7 @@ Svaki fajl ima navigaciju izmedju pogleda i tabelarni prikaz.
 """
 import os
 
-from ..utils import merge_events, prepare_raw_data, condense_teachers
+from ..utils import merge_events, condense_teachers
 
 
 class HTMLScheduleGenerator:
@@ -39,8 +39,8 @@ class HTMLScheduleGenerator:
     # Priprema podataka
     # ------------------------------------------------------------------
 
-    # _prepare_raw_data i _condense_teachers su sada u utils.py
-    # kao zajednicke funkcije prepare_raw_data() i condense_teachers()
+    # Redovi (prepare_raw_data, merge_events, condense_teachers iz utils.py)
+    # dolaze iz self.model.prepared() i dijele se sa ostalim generatorima
 
     # ------------------------------------------------------------------
     # Grupiranje podataka
@@ -68,9 +68,12 @@ class HTMLScheduleGenerator:
                 grouped.setdefault(v, []).append(item)
         return grouped
 
-    def _generate_groups_view(self, raw_data):
+    def _generate_groups_view(self, prepared):
         """Generise mapu evenata za svaku grupu sa nasljedjivanjem.
-        Podgrupa nasljedjuje evente svog roditelja."""
+        Podgrupa nasljedjuje evente svog roditelja; eventi grupe i predaka
+        se citaju iz obrnutog indeksa modela (model.events_for_group)."""
+        raw_data, rows = prepared.raw, prepared.event_rows
+
         group_events = {}
         all_groups = sorted(self.model.groups.values(), key=lambda g: g.name)
 
@@ -78,26 +81,10 @@ class HTMLScheduleGenerator:
             if group.name == "Svi":
                 continue
 
-            # Skupi nazive grupe i svih roditelja
-            ancestors = group.get_all_ancestors()
-            relevant_names = {group.name} | {a.name for a in ancestors}
-
             my_events = []
-            for item in raw_data:
-                is_relevant = False
-
-                # Provjeri presjecanje grupa eventa sa relevantnim grupama
-                for sublist in item['grupe']:
-                    if not set(sublist).isdisjoint(relevant_names):
-                        is_relevant = True
-                        break
-
-                # Eventi za grupu "Svi" se nasljedjuju svima
-                if item['grupe'] == [["Svi"]]:
-                    is_relevant = True
-
-                if is_relevant:
-                    my_events.append(item)
+            for i in self.model.events_for_group(group.id):
+                first, last = rows[i]
+                my_events.extend(raw_data[first:last])
 
             if my_events:
                 merged = merge_events(my_events)
@@ -115,12 +102,11 @@ class HTMLScheduleGenerator:
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
 
-        # Priprema podataka (zajednicke funkcije iz utils)
-        raw_data = prepare_raw_data(self.model.events)
-        merged_data = merge_events(raw_data)
-        condensed_raw = condense_teachers(raw_data)
-        condensed_merged = condense_teachers(merged_data)
-        groups_data = self._generate_groups_view(raw_data)
+        # Priprema podataka (dijeli se sa ostalim generatorima istog modela)
+        prepared = self.model.prepared()
+        condensed_raw = prepared.condensed_raw
+        condensed_merged = prepared.condensed_merged
+        groups_data = self._generate_groups_view(prepared)
 
         prefix = self.model.semester_name
 
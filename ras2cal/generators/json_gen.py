@@ -6,9 +6,27 @@ za sinhronizaciju sa Google Workspace kalendarom.
 
 Svaki event ima: osobu, predmet, tip, grupe, datum, vrijeme, prostoriju,
 dodatne osobe i podatke o ponavljanju.
+
+Izlazni formati (write_json_output):
+    pretty  - jedan JSON sa uvlacenjem (podrazumijevano)
+    compact - jedan JSON bez razmaka
+    ndjson  - prva linija su meta-podaci, zatim jedan event po liniji
+    shards  - direktorij sa index.json i jednim fajlom po osobi
 """
+import json
+import os
+import re
+
 from ..utils import merge_events
 
+# Opcionalni brzi JSON backend (ako je instaliran)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_FORMATS = ('pretty', 'compact', 'ndjson', 'shards')
+
 
 class JSONScheduleGenerator:
     """Generise JSON evente iz IR modela."""
@@ -45,3 +63,64 @@ class JSONScheduleGenerator:
                 "izuzeci": ev.exdates,
             },
         }
+
+
+# ---------------------------------------------------------------------------
+# Zapis JSON izlaza
+# ---------------------------------------------------------------------------
+
+def dumps_compact(obj):
+    """Kompaktna JSON serijalizacija (orjson ako je dostupan)."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def write_json_output(path, meta, events, fmt='pretty'):
+    """Zapisuje meta-podatke i evente u trazenom formatu.
+
+    Za 'shards' format path je direktorij: index.json sadrzi meta-podatke i
+    mapu osoba -> fajl, a svaki fajl listu evenata te osobe. sync.py tako
+    moze ucitati samo osobe koje obradjuje."""
+    if fmt == 'shards':
+        _write_shards(path, meta, events)
+        return
+
+    with open(path, 'w', encoding='utf-8') as f:
+        if fmt == 'pretty':
+            json.dump({"meta": meta, "events": events}, f, indent=4, ensure_ascii=False)
+        elif fmt == 'compact':
+            f.write(dumps_compact({"meta": meta, "events": events}))
+        elif fmt == 'ndjson':
+            f.write(dumps_compact({"meta": meta}) + "\n")
+            for ev in events:
+                f.write(dumps_compact(ev) + "\n")
+        else:
+            raise ValueError(f"Nepoznat JSON format: '{fmt}'")
+
+
+def _write_shards(out_dir, meta, events):
+    """Zapisuje jedan fajl po osobi i index.json."""
+    if not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+
+    by_person = {}
+    for ev in events:
+        by_person.setdefault(ev['osoba'], []).append(ev)
+
+    shards = {}
+    used = set()
+    for osoba, person_events in by_person.items():
+        base = re.sub(r'[^\w.-]+', '_', osoba).strip('_') or 'osoba'
+        filename, n = f"{base}.json", 1
+        while filename.lower() in used:
+            n += 1
+            filename = f"{base}_{n}.json"
+        used.add(filename.lower())
+
+        with open(os.path.join(out_dir, filename), 'w', encoding='utf-8') as f:
+            f.write(dumps_compact(person_events))
+        shards[osoba] = {"file": filename, "count": len(person_events)}
+
+    with open(os.path.join(out_dir, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump({"meta": meta, "shards": shards}, f, indent=4, ensure_ascii=False)
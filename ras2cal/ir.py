@@ -7,19 +7,25 @@ objekte sa razrijesenim referencama (vremena, datumi, grupe sa hijerarhijom).
 
 Kompajler (compiler.py) pretvara AST u IR.
 Generatori (generators/) citaju iz IR-a.
+
+Entiteti i Event su slotted dataclass-i (bez __dict__ po instanci), a
+liste nastavnika/grupa/prostorija i nenastavnih dana u Event-u su tuple-ovi
+koje kompajler dijeli izmedju evenata sa istim sadrzajem.
 """
+import copy
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 # LectureType je definisan u models.py (AST nivo) ali se koristi i ovdje
 from .models import LectureType
+from .utils import PreparedData
 
 
 # ---------------------------------------------------------------------------
 # Entiteti (osobe, prostorije, grupe, predmeti)
 # ---------------------------------------------------------------------------
-@dataclass
+@dataclass(slots=True)
 class Person:
     """Nastavnik sa originalnim ID-om i formatiranim imenom."""
     id: str             # originalni ID (npr. "ImePrezime")
@@ -27,7 +33,7 @@ class Person:
     email: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Room:
     """Prostorija sa ID-om i opcionalnim kapacitetom."""
     id: str             # "0-01"
@@ -35,7 +41,7 @@ class Room:
     capacity: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Group:
     """Studijska grupa sa hijerarhijom (roditelj/podgrupe).
 
@@ -69,7 +75,7 @@ class Group:
         return f"Group({self.id}, parent={parent_id})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Subject:
     """Predmet sa nazivom i skupom tipova nastave."""
     id: str
@@ -80,16 +86,16 @@ class Subject:
 # ---------------------------------------------------------------------------
 # Event (jedan blok nastave sa svim IR podacima)
 # ---------------------------------------------------------------------------
-@dataclass
+@dataclass(slots=True)
 class Event:
     """Jedan blok nastave sa potpuno razrijesenim podacima.
     Nastaje kompajliranjem AssignmentNode-a iz AST-a."""
-    uid: str                    # jedinstveni ID (npr. "EV-42")
+    uid: str                    # stabilni ID iz identiteta nastave (npr. "EV-3f0c9a1e2b7d4c55")
     subject: Subject
     type: LectureType
-    teachers: List[Person]
-    groups: List[Group]
-    rooms: List[Room]
+    teachers: Tuple[Person, ...]
+    groups: Tuple[Group, ...]
+    rooms: Tuple[Room, ...]
 
     # Vrijeme (razrijeseno iz slot definicija)
     day_name: str               # "Ponedjeljak"
@@ -102,7 +108,7 @@ class Event:
     frequency: str = "WEEKLY"
     interval: int = 1           # svake N sedmice
     until_date: Optional[str] = None    # kraj ponavljanja (YYYY-MM-DD)
-    exdates: List[str] = field(default_factory=list)  # nenastavni dani (YYYYMMDD)
+    exdates: Tuple[str, ...] = ()   # nenastavni dani (YYYYMMDD), dijeljen tuple
 
 
 # ---------------------------------------------------------------------------
@@ -129,3 +135,77 @@ class ScheduleModel:
 
     # Tipovi nastave (koriste ih html_gen i grid_gen za CSS klase i sortiranje)
     default_types: Dict[str, LectureType] = field(default_factory=dict)
+
+    # Za inkrementalno kompajliranje (popunjava ih compiler):
+    # otisak definicija od kojih zavise svi eventi i otisak sadrzaja
+    # iskaza nastave iz kojeg je nastao svaki event (uid -> otisak)
+    context_key: Optional[str] = None
+    fingerprints: Dict[str, str] = field(default_factory=dict)
+    # identitet nastave (blake2b predmeta, tipa i grupa) -> uid-ovi iskaza
+    # tog identiteta, redom iskaza
+    uid_groups: Dict[str, List[str]] = field(default_factory=dict)
+
+    # Hijerarhija grupa (popunjava je compiler u _build_lookups):
+    # id grupe -> id-ovi svih predaka (od najblizeg) / svih podgrupa
+    group_ancestors: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    group_descendants: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    # Obrnuti indeks: id grupe -> indeksi evenata u kojima je grupa navedena
+    group_events: Dict[str, List[int]] = field(default_factory=dict)
+    # Indeks iskaza nastave (u ast.assignments) iz kojeg je nastao svaki event
+    event_sources: List[int] = field(default_factory=list)
+
+    # (lista evenata, PreparedData) - vidi prepared()
+    _prepared = None
+
+    def prepared(self) -> PreparedData:
+        """Redovi za HTML i grid generatore (raw, merged, condensed...),
+        racunaju se lijeno jednom po listi evenata i dijele izmedju svih
+        generatora ovog modela."""
+        if self._prepared is None or self._prepared[0] is not self.events:
+            self._prepared = (self.events, PreparedData(self.events))
+        return self._prepared[1]
+
+    def index_groups(self):
+        """(Ponovo) gradi obrnuti indeks grupa -> eventi (group_events)."""
+        index = {}
+        for i, ev in enumerate(self.events):
+            for group in ev.groups:
+                indices = index.setdefault(group.id, [])
+                if not indices or indices[-1] != i:
+                    indices.append(i)
+        self.group_events = index
+
+    def subset(self, indices) -> 'ScheduleModel':
+        """Model sa istim meta-podacima i entitetima i samo eventima sa
+        datim indeksima (rastuce); eventi i entiteti se dijele, ne kopiraju."""
+        view = copy.copy(self)
+        view.events = [self.events[i] for i in indices]
+        view.event_sources = ([self.event_sources[i] for i in indices]
+                              if self.event_sources else [])
+        view.index_groups()
+        return view
+
+    def events_for_group(self, group_id: str, inherited: bool = True) -> List[int]:
+        """Indeksi evenata grupe (rastuce); uz inherited i evenata predaka."""
+        if not inherited:
+            return list(self.group_events.get(group_id, ()))
+        indices = set(self.group_events.get(group_id, ()))
+        for ancestor in self.group_ancestors.get(group_id, ()):
+            indices.update(self.group_events.get(ancestor, ()))
+        return sorted(indices)
+
+
+# ---------------------------------------------------------------------------
+# Razlika dva kompajliranja (rezultat inkrementalnog kompajliranja)
+# ---------------------------------------------------------------------------
+@dataclass
+class CompileDelta:
+    """Eventi koji su dodani, uklonjeni ili izmijenjeni u odnosu na
+    prethodni ScheduleModel (poredjenje po uid-u)."""
+    added: List[Event] = field(default_factory=list)
+    removed: List[Event] = field(default_factory=list)
+    changed: List[Tuple[Event, Event]] = field(default_factory=list)  # (staro, novo)
+    recompiled: int = 0         # broj ponovo kompajliranih iskaza nastave
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
@@ -2,24 +2,36 @@
 lexer.py - Leksicka analiza RAS jezika
 
 Pretvara sirovi tekst u niz tokena koristeci regularne izraze.
-Tokeni se koriste kao ulaz za Parser.
+Tokeni se generisu lijeno (iteracijom kroz Lexer) i Parser ih cita
+jedan po jedan, pa se cijeli niz tokena nikad ne drzi u memoriji.
+Svaki token nosi liniju i kolonu (obje od 1) u ulaznom tekstu.
 
 Pravila su definisana kao lista (naziv, regex) parova.
 Redoslijed pravila je bitan - duza pravila trebaju biti ispred kracih
 (npr. 'je tip nastave' mora biti ispred 'je').
+
+Skeniranje ne isprobava svaku kljucnu rijec na svakoj poziciji: jedan
+(jednom kompajliran) regex prepoznaje generičke tokene (rijec, broj, datum,
+komentar...), a tek za rijec na pocetku granice se u tabeli kljucnih rijeci
+(po prvoj rijeci fraze) provjerava da li je rijec/fraza kljucna. Rezultat je
+identican nizu tokena koji daje alternacija svih pravila iz Lexer.RULES.
 """
 import re
+import sys
 
 
 class Token:
-    """Jedan token sa tipom, vrijednoscu i brojem linije."""
-    def __init__(self, type, value, line):
+    """Jedan token sa tipom, vrijednoscu, brojem linije i kolonom."""
+    __slots__ = ('type', 'value', 'line', 'column')
+
+    def __init__(self, type, value, line, column=None):
         self.type = type
         self.value = value
         self.line = line
+        self.column = column
 
     def __repr__(self):
-        return f"Token({self.type}, {self.value!r}, line={self.line})"
+        return f"Token({self.type}, {self.value!r}, line={self.line}, column={self.column})"
 
 
 class Lexer:
@@ -27,7 +39,9 @@ class Lexer:
 
     Koristi regex-based tokenizaciju sa definisanim pravilima.
     Komentari (// i /* */) i whitespace se odbacuju.
-    Svi identifikatori se matchuju case-insensitive."""
+    Svi identifikatori se matchuju case-insensitive.
+
+    Iteracija kroz Lexer daje tokene lijeno; `tokens` ih materijalizuje u listu."""
 
     # Pravila tokenizacije (redoslijed je bitan!)
     RULES = [
@@ -85,17 +99,116 @@ class Lexer:
         ('SKIP',          r'[ \t\r,]+'),
     ]
 
-    def __init__(self, text):
-        """Tokenizira ulazni tekst."""
-        self.tokens = []
-        line_num = 1
-
-        # Kompajliraj sva pravila u jedan regex sa imenovanim grupama
-        regex = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in self.RULES)
-
-        for mo in re.finditer(regex, text, re.IGNORECASE):
+    def __init__(self, text, first_line=1):
+        self.text = text
+        self.first_line = first_line  # broj linije prvog reda teksta u fajlu
+
+    @property
+    def tokens(self):
+        """Svi tokeni kao lista (za debug i kompatibilnost)."""
+        return list(self)
+
+    def __iter__(self):
+        """Generise tokene jedan po jedan."""
+        text = self.text
+        line_num = self.first_line
+        line_start = 0  # pozicija pocetka trenutne linije (za kolonu)
+
+        search = _SCANNER.search
+        keywords = _KEYWORDS
+        intern = sys.intern
+        pos = 0
+        while True:
+            mo = search(text, pos)
+            if mo is None:
+                break
             kind = mo.lastgroup
-            if kind == 'NEWLINE':
+            start = mo.start()
+            pos = mo.end()
+            if kind == 'WORD':
+                kind = 'ID'
+                head = mo.group('HEAD')
+                # Kljucna rijec moze poceti samo na granici rijeci (\b)
+                if ((head.lower() in keywords or not head.isascii())
+                        and (start == 0 or not _is_word_char(text[start - 1]))):
+                    keyword = _match_keyword(text, start, head)
+                    if keyword:
+                        kind, pos = keyword
+                # Imena (nastavnici, prostorije, grupe, termini) se ponavljaju
+                # hiljadama puta - intern() drzi jednu kopiju svakog
+                yield Token(kind, intern(text[start:pos]), line_num, start - line_start + 1)
+            elif kind == 'NEWLINE':
                 line_num += 1
-            elif kind not in ('SKIP', 'COMMENT'):
-                self.tokens.append(Token(kind, mo.group(), line_num))
+                line_start = pos
+            elif kind == 'COMMENT':
+                # Viselinijski komentar pomjera brojac linija
+                newlines = text.count('\n', start, pos)
+                if newlines:
+                    line_num += newlines
+                    line_start = text.rindex('\n', start, pos) + 1
+            elif kind != 'SKIP':
+                yield Token(kind, mo.group(), line_num, start - line_start + 1)
+
+
+# --- Skener (kompajlira se jednom, pri importu modula) ---
+
+# Pravila koja nisu kljucne rijeci
+_LITERAL_RULES = ('COMMENT', 'DATE', 'NUMBER', 'ID', 'DOT', 'NEWLINE', 'SKIP')
+
+# Isti redoslijed kao u Lexer.RULES, ali bez kljucnih rijeci. ID je podijeljen
+# na WORD (pocinje \w znakom, HEAD je vodeci \w niz) i ID koji pocinje sa - ili /.
+_SCANNER = re.compile(
+    r'(?P<COMMENT>//.*|/\*[\s\S]*?\*/)'
+    r'|(?P<DATE>\d{2}\.\d{2}\.\d{4})'
+    r'|(?P<NUMBER>\d+)'
+    r'|(?P<WORD>(?P<HEAD>\w+)[\w\-/]*)'
+    r'|(?P<ID>[\-/][\w\-/]*)'
+    r'|(?P<DOT>\.)'
+    r'|(?P<NEWLINE>\n)'
+    r'|(?P<SKIP>[ \t\r,]+)'
+)
+
+
+def _build_keyword_table(rules):
+    """Prva rijec fraze (mala slova) -> lista (tip, regex fraze ili None).
+    Lista zadrzava redoslijed iz RULES, pa 'je dan broj' ide ispred 'je'."""
+    table = {}
+    for name, pattern in rules:
+        if name in _LITERAL_RULES:
+            continue
+        for alternative in pattern.split('|'):
+            phrase = alternative.replace(r'\b', '')
+            head = phrase.split(' ')[0]
+            regex = re.compile(re.escape(phrase) + r'\b', re.IGNORECASE) if ' ' in phrase else None
+            table.setdefault(head, []).append((name, regex))
+    return table
+
+
+_KEYWORDS = _build_keyword_table(Lexer.RULES)
+
+# Za rijeci sa ne-ASCII slovima (npr. 'ſ' koje se case-insensitive poklapa sa 's')
+# koristi se alternacija svih kljucnih rijeci, kao ranije
+_KEYWORD_RE = re.compile(
+    '|'.join(f'(?P<{name}>{pattern})' for name, pattern in Lexer.RULES if name not in _LITERAL_RULES),
+    re.IGNORECASE)
+
+
+def _is_word_char(c):
+    """Isto sto i \\w u Python regexu (alfanumericki znak ili _)."""
+    return c.isalnum() or c == '_'
+
+
+def _match_keyword(text, start, head):
+    """Provjerava da li na poziciji start (granica rijeci) pocinje kljucna
+    rijec/fraza. Vraca (tip, kraj) ili None."""
+    if not head.isascii():
+        mo = _KEYWORD_RE.match(text, start)
+        return (mo.lastgroup, mo.end()) if mo else None
+    for name, regex in _KEYWORDS.get(head.lower(), ()):
+        if regex is None:
+            # Jednorijecna kljucna rijec: HEAD je cijeli \w niz, pa \b slijedi
+            return name, start + len(head)
+        mo = regex.match(text, start)
+        if mo:
+            return name, mo.end()
+    return None
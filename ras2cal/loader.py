@@ -0,0 +1,185 @@
+"""
+loader.py - Ucitavanje .ras izvora sa UVEZI direktivama i kesom parsiranja
+
+Umjesto da se svi uvezeni fajlovi spoje u jedan veliki tekst (kao
+load_source_recursive), svaki dio izvora se parsira zasebno u parcijalni
+Schedule, a dijelovi se spajaju (Schedule.merge) redom kojim bi se pojavili
+u spojenom tekstu.
+
+Dio izvora (SourceChunk) je niz linija jednog fajla izmedju dvije UVEZI
+direktive. Parsirani dijelovi se cuvaju na disku (pickle), sa kljucem koji
+je SHA-256 sadrzaja, pocetne linije i PARSER_VERSION, pa se nakon izmjene
+jednog fajla ponovo parsira samo on; definicije (nastavnici, prostorije,
+vrijeme...) se citaju iz kesa.
+
+Dijelovi kojih nema u kesu su medjusobno nezavisni, pa se mogu parsirati
+paralelno u vise procesa (jobs > 1); spajanje je uvijek redom importa, pa
+redefinicije zadrzavaju semantiku "zadnja pobjedjuje".
+"""
+import gc
+import hashlib
+import os
+import pickle
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from .lexer import Lexer
+from .models import Schedule
+from .parser import PARSER_VERSION, Parser, format_warning
+
+UVEZI_RE = re.compile(r'^\s*UVEZI:\s*(.+)\s*$')
+
+
+@dataclass(frozen=True)
+class SourceChunk:
+    """Dio jednog .ras fajla izmedju UVEZI direktiva."""
+    path: str           # putanja fajla (za upozorenja)
+    first_line: int     # broj linije prvog reda dijela u fajlu
+    text: str
+
+    @property
+    def key(self):
+        """Kljuc kesa: sadrzaj + pocetna linija + verzija parsera."""
+        h = hashlib.sha256(f"{PARSER_VERSION}:{self.first_line}:".encode('utf-8'))
+        h.update(self.text.encode('utf-8'))
+        return h.hexdigest()
+
+
+def default_cache_dir():
+    """~/.cache/tt2cal (ili $XDG_CACHE_HOME/tt2cal)."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'tt2cal')
+
+
+# ---------------------------------------------------------------------------
+# Graf importa
+# ---------------------------------------------------------------------------
+
+def collect_chunks(file_path, seen=None):
+    """Razrjesava UVEZI direktive rekurzivno i vraca listu SourceChunk-ova
+    redom kojim se pojavljuju u spojenom izvoru.
+    Detektuje kruzne importe i zaustavlja se sa upozorenjem (kao
+    load_source_recursive)."""
+    if seen is None:
+        seen = set()
+
+    abs_path = os.path.abspath(file_path)
+
+    # Provjera kruznog importa
+    if abs_path in seen:
+        print(f"Upozorenje: Detektovan kružni import za '{file_path}'. Preskačem.")
+        return []
+    seen.add(abs_path)
+
+    chunks = []
+    base_dir = os.path.dirname(file_path)
+    lines, first_line = [], 1
+
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line_num, line in enumerate(f, 1):
+                match = UVEZI_RE.match(line)
+                if match:
+                    if lines:
+                        chunks.append(SourceChunk(file_path, first_line, "".join(lines)))
+                    lines, first_line = [], line_num + 1
+                    # Razrijesi UVEZI direktivu rekurzivno
+                    import_path = match.group(1).strip().strip('"').strip("'")
+                    chunks.extend(collect_chunks(os.path.join(base_dir, import_path), seen))
+                else:
+                    lines.append(line)
+    except FileNotFoundError:
+        print(f"Greška: Ulazni fajl '{file_path}' nije pronađen.")
+        sys.exit(1)
+
+    if lines:
+        chunks.append(SourceChunk(file_path, first_line, "".join(lines)))
+    return chunks
+
+
+# ---------------------------------------------------------------------------
+# Parsiranje i kes
+# ---------------------------------------------------------------------------
+
+def parse_chunk(chunk):
+    """Parsira jedan dio izvora; vraca (parcijalni Schedule, upozorenja)."""
+    parser = Parser(Lexer(chunk.text, chunk.first_line), source=chunk.path, verbose=False)
+    return parser.parse(), parser.warnings
+
+
+def _cache_path(cache_dir, chunk):
+    return os.path.join(cache_dir, f"{chunk.key}.pickle")
+
+
+def read_cached(cache_dir, chunk):
+    """Vraca (Schedule, upozorenja) iz kesa ili None."""
+    if not cache_dir:
+        return None
+    # GC je iskljucen tokom ucitavanja: pickle pravi mnogo objekata odjednom,
+    # a svaki ciklus GC-a bi prolazio kroz cijeli (vec veliki) heap
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(_cache_path(cache_dir, chunk), 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.PickleError, EOFError, AttributeError, ImportError, TypeError):
+        # Nema u kesu ili je zapis ostecen/zastario - parsira se ponovo
+        return None
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def write_cached(cache_dir, chunk, result):
+    """Atomarno upisuje rezultat parsiranja u kes (greske se ignorisu)."""
+    if not cache_dir:
+        return
+    path = _cache_path(cache_dir, chunk)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Upozorenje: Ne mogu upisati kes '{path}': {e}", file=sys.stderr)
+
+
+def parse_chunks(chunks, jobs=1):
+    """Parsira listu dijelova; uz jobs > 1 u pool-u procesa.
+    Rezultati su u istom redoslijedu kao chunks."""
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(chunks))
+    if jobs <= 1:
+        return [parse_chunk(chunk) for chunk in chunks]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(parse_chunk, chunks))
+
+
+def load_schedule(file_path, cache_dir=None, jobs=1):
+    """Ucitava .ras fajl sa svim importima i vraca spojeni Schedule (AST).
+
+    Args:
+        file_path: putanja do glavnog .ras fajla
+        cache_dir: direktorij kesa parsiranih dijelova (None = bez kesa)
+        jobs: broj procesa za parsiranje dijelova kojih nema u kesu
+              (0 = broj jezgara)
+    """
+    chunks = collect_chunks(file_path)
+    results = [read_cached(cache_dir, chunk) for chunk in chunks]
+
+    missing = [i for i, result in enumerate(results) if result is None]
+    parsed = parse_chunks([chunks[i] for i in missing], jobs)
+    for i, result in zip(missing, parsed):
+        results[i] = result
+        write_cached(cache_dir, chunks[i], result)
+
+    schedule = Schedule()
+    for chunk, (partial, warnings) in zip(chunks, results):
+        for warning in warnings:
+            print(format_warning(warning, chunk.path), file=sys.stderr)
+        schedule.merge(partial)
+    return schedule
@@ -35,9 +35,25 @@ class LectureType:
 # ---------------------------------------------------------------------------
 class ASTNode:
     """Bazna klasa za sve AST cvorove.
-    Pruza standardni __repr__ koji ispisuje sve atribute."""
+    Pruza standardni __repr__ koji ispisuje sve atribute.
+
+    Cvorovi koriste __slots__ (bez __dict__ po instanci), jer ih u velikim
+    rasporedima ima na stotine hiljada."""
+    __slots__ = ()
+
+    def _fields(self):
+        """Atributi cvora redom deklaracije (ekvivalent vars() za slotove)."""
+        fields = {}
+        for cls in reversed(type(self).__mro__):
+            for name in getattr(cls, '__slots__', ()):
+                if hasattr(self, name):
+                    fields[name] = getattr(self, name)
+        if hasattr(self, '__dict__'):
+            fields.update(vars(self))
+        return fields
+
     def __repr__(self):
-        return f"{self.__class__.__name__}({vars(self)})"
+        return f"{self.__class__.__name__}({self._fields()})"
 
 
 # ---------------------------------------------------------------------------
@@ -58,6 +74,8 @@ class SemesterInfo(dict):
 # ---------------------------------------------------------------------------
 class DayDefinitionNode(ASTNode):
     """Dan u sedmici: 'Ponedjeljak je dan broj 1.'"""
+    __slots__ = ('name', 'number')
+
     def __init__(self, name, number):
         self.name = name
         self.number = int(number)
@@ -65,6 +83,8 @@ class DayDefinitionNode(ASTNode):
 
 class SlotDefinitionNode(ASTNode):
     """Termin: 'PO1 je termin broj 1 dana Ponedjeljak.'"""
+    __slots__ = ('slot_id', 'day_name', 'number')
+
     def __init__(self, slot_id, day_name, number):
         self.slot_id = slot_id
         self.day_name = day_name
@@ -73,6 +93,8 @@ class SlotDefinitionNode(ASTNode):
 
 class TeacherDefinitionNode(ASTNode):
     """Nastavnik: 'ImePrezime je nastavnik.'"""
+    __slots__ = ('name',)
+
     def __init__(self, name):
         self.name = name
 
@@ -80,6 +102,8 @@ class TeacherDefinitionNode(ASTNode):
 class SubjectDefinitionNode(ASTNode):
     """Predmet: 'pNazivPredmeta je predmet.'
     Tip (code) je izvucen iz prefiksa (p=P, v=V, l=L, itd.)."""
+    __slots__ = ('name', 'types')
+
     def __init__(self, name, types=None):
         self.name = name
         self.types = types if types else set()
@@ -87,12 +111,16 @@ class SubjectDefinitionNode(ASTNode):
 
 class StudyGroupDefinitionNode(ASTNode):
     """Odjeljenje (studijska grupa): 'RI1 je odjeljenje.'"""
+    __slots__ = ('name',)
+
     def __init__(self, name):
         self.name = name
 
 
 class StudySubGroupDefinitionNode(ASTNode):
     """Podgrupa odjeljenja: 'RI1oop-1 je grupa odjeljenja RI1.'"""
+    __slots__ = ('name', 'parent')
+
     def __init__(self, name, parent=None):
         self.name = name
         self.parent = parent
@@ -100,12 +128,16 @@ class StudySubGroupDefinitionNode(ASTNode):
 
 class RoomDefinitionNode(ASTNode):
     """Prostorija: 'R0-01 je prostorija.'"""
+    __slots__ = ('name',)
+
     def __init__(self, name):
         self.name = name
 
 
 class SemesterDefinitionNode(ASTNode):
     """Deklaracija semestra: 'Semestar2026 je semestar.'"""
+    __slots__ = ('name',)
+
     def __init__(self, name):
         self.name = name
 
@@ -117,6 +149,8 @@ class SemesterAttributeNode(ASTNode):
         'Semestar2026 traje 15 sedmica.'
         'Semestar2026 ima nenastavne dane 01.01.2027, ...'
     """
+    __slots__ = ('semester_name', 'attr_type', 'value')
+
     def __init__(self, semester_name, attr_type, value):
         self.semester_name = semester_name
         self.attr_type = attr_type  # 'start', 'end', 'duration', 'holidays'
@@ -127,6 +161,8 @@ class LectureTypeDefinitionNode(ASTNode):
     """Definicija tipa nastave: 'P je tip nastave Predavanje prioriteta 0.'
     Ovo omogucava override tipova iz .ras fajla umjesto koristenja
     podrazumijevanih vrijednosti iz tt2cal.py."""
+    __slots__ = ('code', 'name', 'priority')
+
     def __init__(self, code, name, priority):
         self.code = code            # "P", "V", "L"
         self.name = name            # "Predavanje" (formatirano iz CamelCase)
@@ -139,6 +175,9 @@ class LectureTypeDefinitionNode(ASTNode):
 class AssignmentNode(ASTNode):
     """Iskaz nastave: 'Nastavnik predaje predmet odjeljenju ...'
     Sadrzi sve informacije o jednom bloku nastave."""
+    __slots__ = ('teachers', 'subject', 'type', 'groups', 'rooms', 'slots',
+                 'frequency_hint', 'unknown_tokens', 'recurrence_interval')
+
     def __init__(self, teachers, subject, type, groups, rooms, slots,
                  frequency_hint=None, unknown_tokens=None,
                  recurrence_interval=None):
@@ -172,6 +211,11 @@ class Schedule(ASTNode):
         self.lecture_types = {}     # code -> LectureTypeDefinitionNode
         self.assignments = []       # lista AssignmentNode-ova
 
+        # Formatirano ime -> ime kako je napisano u izvoru (nastavnici, predmeti
+        # bez prefiksa tipa, tipovi nastave); koristi ga Exporter za povratni
+        # eksport bez gubitaka (npr. 'digitalnaLogika', 'Ime_Prezime')
+        self.source_names = {}
+
         # Semestar info (konsolidiran iz razlicitih SemesterAttributeNode-ova)
         self.semester_info = SemesterInfo({
             'name': None,
@@ -237,6 +281,32 @@ class Schedule(ASTNode):
         elif isinstance(node, LectureTypeDefinitionNode):
             self.lecture_types[node.code] = node
 
+    def merge(self, other):
+        """Dodaje sadrzaj drugog (parcijalnog) Schedule-a, kao da su njegovi
+        iskazi parsirani nakon ovih: kasnije definicije pobjeduju, tipovi
+        predmeta se spajaju, a nastava i nenastavni dani se nadovezuju."""
+        self.days.update(other.days)
+        self.slots.update(other.slots)
+        self.teachers.update(other.teachers)
+        for name, node in other.subjects.items():
+            if name in self.subjects:
+                self.subjects[name].types.update(node.types)
+            else:
+                self.subjects[name] = node
+        self.study_groups.update(other.study_groups)
+        self.subgroups.update(other.subgroups)
+        self.rooms.update(other.rooms)
+        self.lecture_types.update(other.lecture_types)
+        self.assignments.extend(other.assignments)
+        for name, source in other.source_names.items():
+            self.source_names.setdefault(name, source)
+
+        for key in ('name', 'start_date', 'end_date', 'duration_weeks'):
+            if other.semester_info[key] is not None:
+                self.semester_info[key] = other.semester_info[key]
+        self.semester_info['holidays'].extend(other.semester_info['holidays'])
+        return self
+
     def __repr__(self):
         return (
             f"Schedule("
@@ -0,0 +1,218 @@
+"""
+occupancy.py - Bitset indeks zauzetosti (slobodne prostorije, zajednicki slobodni termini)
+
+Za svaku prostoriju, nastavnika i grupu cuva se jedan bitset (Python int)
+nad (paritet sedmice x dan x vremenska jedinica). Vremenska jedinica je
+najveci zajednicki djelilac pocetaka i trajanja svih evenata (obicno
+trajanje jednog slota), a prozor ide od najranijeg pocetka do najkasnijeg
+kraja.
+
+Raspored bita:  bit = paritet * W + dan * S + jedinica,  W = D * S
+    - nastava svake sedmice zauzima oba pariteta
+    - nastava svake 2. sedmice zauzima samo paritet svoje prve sedmice
+    - nastava sa intervalom vecim od 2 se racuna kao zauzeta u oba
+      pariteta (konzervativno - termin nije slobodan svake sedmice)
+
+Grupa je zauzeta kad ima nastavu ona, neki njen predak (cijelo
+odjeljenje) ili neka njena podgrupa (dio studenata).
+
+Upiti su bitske operacije nad cijelim brojevima:
+    free_rooms(dan, od, do)     - prostorije bez nastave u tom intervalu
+    common_free(imena)          - intervali u kojima su svi entiteti slobodni
+    utilization(vrsta)          - udio zauzetih jedinica po entitetu
+"""
+from math import gcd
+
+from .columnar import ColumnarSchedule, clock
+from .query import _fold
+
+KINDS = ('rooms', 'teachers', 'groups')
+
+# Oznake pariteta; sedmice se broje od 1 (prva sedmica semestra je neparna)
+PARITY_LABELS = {
+    None: "svake sedmice",
+    0: "neparne sedmice",
+    1: "parne sedmice",
+}
+
+
+class OccupancyIndex:
+    """Bitseti zauzetosti prostorija, nastavnika i grupa."""
+
+    def __init__(self, model, columns=None):
+        cs = columns if columns is not None else ColumnarSchedule.from_model(model)
+
+        # Dani redom broja iz definicije (pa dani koji se javljaju samo u eventima)
+        days = sorted(model.days, key=lambda name: int(model.days[name]))
+        for name in cs.days:
+            if name not in days:
+                days.append(name)
+        self.days = days
+        self.day_index = {name: i for i, name in enumerate(days)}
+
+        if len(cs):
+            self.base = min(cs.start)
+            unit = 0
+            for value in set(cs.start) | set(cs.end):
+                unit = gcd(unit, value - self.base)
+            self.unit = unit or 30
+            self.n_units = -(-(max(cs.end) - self.base) // self.unit)
+        else:
+            self.base, self.unit, self.n_units = 0, 30, 0
+        self.width = len(days) * self.n_units          # bita po paritetu
+        self.full = (1 << (2 * self.width)) - 1
+
+        self.bits = {kind: {} for kind in KINDS}       # vrsta -> ime -> bitset
+        self._build(model, cs)
+
+        # Ime bez razmaka i velikih slova -> (vrsta, ime), kao u query.py
+        self._folded = {}
+        for kind in KINDS:
+            for name in self.bits[kind]:
+                self._folded.setdefault(_fold(name), (kind, name))
+
+    # --- Gradjenje ---
+
+    def _build(self, model, cs):
+        weeks = cs.weeks()
+        masks = {}
+        day_codes = [self.day_index[name] for name in cs.days]
+        tables = {'rooms': cs.room_table, 'teachers': cs.people, 'groups': cs.group_table}
+        own = {kind: [0] * len(tables[kind]) for kind in KINDS}
+
+        for i in range(len(cs)):
+            interval = cs.interval[i]
+            parity = weeks[i] % 2 if interval == 2 else None
+            key = (cs.day[i], cs.start[i], cs.end[i], parity)
+            mask = masks.get(key)
+            if mask is None:
+                mask = masks[key] = self._event_mask(
+                    day_codes[cs.day[i]], cs.start[i], cs.end[i], parity)
+            for kind, membership in (('rooms', cs.rooms), ('teachers', cs.teachers),
+                                     ('groups', cs.groups)):
+                bits = own[kind]
+                for code in membership[i]:
+                    bits[code] |= mask
+
+        for kind in ('rooms', 'teachers'):
+            target = self.bits[kind]
+            for code, entity in enumerate(tables[kind]):
+                target[entity.name] = target.get(entity.name, 0) | own[kind][code]
+        for room in model.rooms.values():
+            self.bits['rooms'].setdefault(room.name, 0)
+        for person in model.people.values():
+            self.bits['teachers'].setdefault(person.name, 0)
+        self._build_groups(model, cs.group_table, own['groups'])
+
+    def _build_groups(self, model, table, own_bits):
+        """Grupa je zauzeta svojim terminima, terminima predaka i podgrupa
+        (zatvorenje hijerarhije iz model.group_ancestors/group_descendants)."""
+        own = {}
+        groups = {}
+        for code, group in enumerate(table):
+            own[group.id] = own.get(group.id, 0) | own_bits[code]
+            groups.setdefault(group.id, group)
+        for group in model.groups.values():
+            groups.setdefault(group.id, group)
+
+        target = self.bits['groups']
+        ancestors, descendants = model.group_ancestors, model.group_descendants
+        for group in groups.values():
+            bits = own.get(group.id, 0)
+            for other in ancestors.get(group.id, ()) + descendants.get(group.id, ()):
+                bits |= own.get(other, 0)
+            target[group.name] = target.get(group.name, 0) | bits
+
+    def _event_mask(self, day, start, end, parity=None):
+        """Bitset jednog intervala (start/end u minutama) u danu."""
+        first = (start - self.base) // self.unit
+        last = -(-(end - self.base) // self.unit)
+        run = ((1 << (last - first)) - 1) << (day * self.n_units + first)
+        if parity is None:
+            return run | (run << self.width)
+        return run << (parity * self.width)
+
+    # --- Upiti ---
+
+    def mask(self, day_name, start, end, parity=None):
+        """Bitset intervala; start/end su 'HH:MM' ili minute od ponoci."""
+        start, end = _minutes(start), _minutes(end)
+        if day_name not in self.day_index:
+            raise ValueError(f"Nepoznat dan: '{day_name}'")
+        start = max(start, self.base)
+        end = min(end, self.base + self.n_units * self.unit)
+        if end <= start:
+            return 0
+        return self._event_mask(self.day_index[day_name], start, end, parity)
+
+    def lookup(self, name):
+        """(vrsta, bitset) entiteta po imenu; prostorije, nastavnici pa grupe.
+        Ime bez tacnog pogotka se trazi bez obzira na razmake i velika slova
+        ("nastavnik1prezime1" = "Nastavnik1 Prezime1")."""
+        for kind in KINDS:
+            if name in self.bits[kind]:
+                return kind, self.bits[kind][name]
+        kind, name = self._folded.get(_fold(name), (None, name))
+        if kind is None:
+            raise KeyError(name)
+        return kind, self.bits[kind][name]
+
+    def free_rooms(self, day_name, start, end, parity=None):
+        """Prostorije slobodne u cijelom intervalu (svake sedmice ili u paritetu)."""
+        mask = self.mask(day_name, start, end, parity)
+        return sorted(name for name, bits in self.bits['rooms'].items() if not bits & mask)
+
+    def common_free(self, names, min_minutes=0):
+        """Intervali u kojima su svi navedeni entiteti slobodni.
+        Vraca listu (dan, pocetak, kraj, paritet) sa minutama od ponoci;
+        paritet None znaci svake sedmice."""
+        busy = 0
+        for name in names:
+            busy |= self.lookup(name)[1]
+        free = ~busy & self.full
+        low = (1 << self.width) - 1
+        even, odd = free & low, (free >> self.width) & low
+        result = []
+        for parity, bits in ((None, even & odd), (0, even & ~odd), (1, odd & ~even)):
+            result.extend((day, start, end, parity)
+                          for day, start, end in self._runs(bits)
+                          if end - start >= min_minutes)
+        result.sort(key=lambda r: (self.day_index[r[0]], r[1], r[3] is not None, r[3] or 0))
+        return result
+
+    def utilization(self, kind):
+        """Lista (ime, udio zauzetih jedinica) sortirana opadajuce."""
+        total = 2 * self.width or 1
+        rows = [(name, bits.bit_count() / total) for name, bits in self.bits[kind].items()]
+        rows.sort(key=lambda r: (-r[1], r[0]))
+        return rows
+
+    def _runs(self, bits):
+        """Uzastopni postavljeni biti jednog pariteta -> (dan, pocetak, kraj)."""
+        runs = []
+        for day, name in enumerate(self.days):
+            row = (bits >> (day * self.n_units)) & ((1 << self.n_units) - 1)
+            unit = 0
+            while row:
+                # preskoci nule, pa izmjeri niz jedinica
+                skip = (row & -row).bit_length() - 1
+                row >>= skip
+                unit += skip
+                length = (~row & (row + 1)).bit_length() - 1
+                runs.append((name, self.base + unit * self.unit,
+                             self.base + (unit + length) * self.unit))
+                row >>= length
+                unit += length
+        return runs
+
+
+def format_interval(day, start, end, parity=None):
+    """'Ponedjeljak 10:00-12:00, svake sedmice'."""
+    return f"{day} {clock(start)}-{clock(end)}, {PARITY_LABELS[parity]}"
+
+
+def _minutes(value):
+    if isinstance(value, int):
+        return value
+    hours, minutes = value.split(':')
+    return int(hours) * 60 + int(minutes)
@@ -0,0 +1,196 @@
+"""
+occurrences.py - Konkretna pojavljivanja evenata (razvijanje ponavljanja)
+
+IR Event ima samo datum prvog pojavljivanja, interval, datum kraja i
+nenastavne dane (izuzeke) - isto kao RRULE koji sync.py salje u kalendar.
+OccurrenceTable razvija ta pravila u konkretne datume za cijeli semestar,
+sa istom semantikom kao Google Calendar (UNTIL ukljucivo, EXDATE po datumu).
+
+Razvijanje je grupno: eventi sa istim datumom prvog pojavljivanja,
+intervalom i pravilom ponavljanja (kolone date, interval i recurrence u
+ColumnarSchedule) dijele isti niz datuma, koji se racuna jednom po grupi
+(sa NumPy datetime64 nizovima ako je NumPy instaliran). U tipicnom
+rasporedu grupa je tek nekoliko desetina, bez obzira na broj evenata.
+
+Upotreba:
+    table = OccurrenceTable(model)
+    table.on(date(2026, 11, 12))        # eventi tog dana, po vremenu
+    for occ in table.between(od, do):   # lijeno, dan po dan
+        ...
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from .columnar import ColumnarSchedule
+from .ir import Event
+
+# Opcionalni vektorski backend (ako je instaliran)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Korak ponavljanja u danima za podrzane RRULE frekvencije (kao u sync.py)
+FREQ_DAYS = {'DAILY': 1, 'WEEKLY': 7}
+
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+@dataclass(slots=True)
+class Occurrence:
+    """Jedno konkretno pojavljivanje eventa."""
+    date: date
+    event: Event
+
+    @property
+    def start_dt(self) -> datetime:
+        return datetime.combine(self.date, self.event.start_dt.time())
+
+    @property
+    def end_dt(self) -> datetime:
+        return datetime.combine(self.date, self.event.end_dt.time())
+
+    def __str__(self):
+        ev = self.event
+        parts = [f"{ev.start_time_str}-{ev.end_time_str} {ev.subject.name} ({ev.type.code})"]
+        if ev.teachers:
+            parts.append(", ".join(t.name for t in ev.teachers))
+        if ev.groups:
+            parts.append(", ".join(g.name for g in ev.groups))
+        if ev.rooms:
+            parts.append(", ".join(r.name for r in ev.rooms))
+        return " | ".join(parts)
+
+
+class OccurrenceTable:
+    """Datumi pojavljivanja svih evenata modela, razvijeni po grupama."""
+
+    def __init__(self, model, columns=None, until=None):
+        """
+        Args:
+            model: ScheduleModel (IR)
+            columns: vec izgradjen ColumnarSchedule za isti model (opcionalno)
+            until: kraj razvijanja za evente bez datuma kraja
+                   (default: kraj semestra iz modela)
+        """
+        self.model = model
+        self.columns = columns if columns is not None else ColumnarSchedule.from_model(model)
+        self.default_until = until or _parse_date(model.end_date)
+
+        # (prvi datum, interval, pravilo) -> [eventi]; datumi se racunaju jednom
+        cs = self.columns
+        groups = {}
+        for i, key in enumerate(zip(cs.date, cs.interval, cs.recurrence)):
+            groups.setdefault(key, []).append(i)
+
+        # Rang eventa po vremenu (pocetak, kraj); eventi svake grupe su
+        # sortirani po rangu, pa je dan samo spajanje sortiranih nizova
+        order = sorted(range(len(cs)), key=lambda i: (cs.start[i], cs.end[i], i))
+        self._rank = [0] * len(cs)
+        for rank, i in enumerate(order):
+            self._rank[i] = rank
+
+        self.patterns = []      # (datumi kao ordinali, set datuma, eventi)
+        self._pattern_of = [0] * len(cs)
+        for (first, interval, recurrence), events in groups.items():
+            events.sort(key=self._rank.__getitem__)
+            dates = self._expand(first, interval, cs.recurrences[recurrence])
+            for i in events:
+                self._pattern_of[i] = len(self.patterns)
+            self.patterns.append((dates, set(dates), events))
+
+    def _expand(self, first, interval, recurrence):
+        """Datumi (ordinali) jednog pravila ponavljanja."""
+        frequency, until_date, exdates = recurrence
+        step = FREQ_DAYS.get(frequency)
+        if step is None:
+            return (first,)     # nepodrzana frekvencija: samo prvo pojavljivanje
+        step *= max(interval, 1)
+
+        until = _parse_date(until_date) or self.default_until
+        if until is None:
+            raise ValueError("Ponavljanje bez datuma kraja: proslijedite 'until'")
+        last = until.toordinal()
+        if last < first:
+            return ()
+        excluded = [date(int(d[:4]), int(d[4:6]), int(d[6:8])).toordinal()
+                    for d in (str(x).replace('-', '') for x in exdates)]
+
+        if np is not None:
+            days = np.arange(np.datetime64(date.fromordinal(first), 'D'),
+                             np.datetime64(until, 'D') + 1, step)
+            if excluded:
+                holidays = np.array([date.fromordinal(d) for d in excluded],
+                                    dtype='datetime64[D]')
+                days = days[~np.isin(days, holidays)]
+            return tuple((days.astype(np.int64) + _EPOCH).tolist())
+
+        excluded = set(excluded)
+        return tuple(d for d in range(first, last + 1, step) if d not in excluded)
+
+    # --- Upiti ---
+
+    def dates(self, index):
+        """Datumi pojavljivanja eventa sa datim indeksom u model.events."""
+        dates = self.patterns[self._pattern_of[index]][0]
+        return [date.fromordinal(d) for d in dates]
+
+    def on(self, day):
+        """Pojavljivanja na dati datum, sortirana po vremenu pocetka."""
+        ordinal = day.toordinal()
+        indices = []
+        for _, date_set, events in self.patterns:
+            if ordinal in date_set:
+                indices.extend(events)
+        indices.sort(key=self._rank.__getitem__)
+        events = self.model.events
+        return [Occurrence(day, events[i]) for i in indices]
+
+    def between(self, start, end):
+        """Lijeno vraca pojavljivanja od start do end (ukljucivo), dan po dan."""
+        day = start
+        while day <= end:
+            yield from self.on(day)
+            day += timedelta(days=1)
+
+    def __iter__(self):
+        """Sva pojavljivanja u semestru, po datumu i vremenu."""
+        if not self.patterns:
+            return iter(())
+        first = min(dates[0] for dates, _, _ in self.patterns if dates)
+        last = max(dates[-1] for dates, _, _ in self.patterns if dates)
+        return self.between(date.fromordinal(first), date.fromordinal(last))
+
+    def __len__(self):
+        """Ukupan broj pojavljivanja (bez materijalizacije)."""
+        return sum(len(dates) * len(events) for dates, _, events in self.patterns)
+
+    def arrays(self):
+        """Sva pojavljivanja kao dva paralelna niza (indeks eventa, datum),
+        sortirana po datumu: numpy (int64, datetime64[D]) ili liste
+        (int, ordinal)."""
+        if np is not None:
+            idx, days = [], []
+            for dates, _, events in self.patterns:
+                ev = np.asarray(events, dtype=np.int64)
+                ds = np.asarray(dates, dtype=np.int64) - _EPOCH
+                idx.append(np.tile(ev, len(ds)))
+                days.append(np.repeat(ds, len(ev)))
+            if not idx:
+                return np.empty(0, np.int64), np.empty(0, 'datetime64[D]')
+            idx, days = np.concatenate(idx), np.concatenate(days)
+            order = np.lexsort((idx, days))
+            return idx[order], days[order].astype('datetime64[D]')
+
+        pairs = sorted((d, i) for dates, _, events in self.patterns
+                       for d in dates for i in events)
+        return [i for _, i in pairs], [d for d, _ in pairs]
+
+
+def _parse_date(value):
+    """'YYYY-MM-DD' -> date (None ostaje None)."""
+    if not value:
+        return None
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
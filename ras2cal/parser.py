@@ -29,21 +29,92 @@ from .models import (
 )
 from .utils import format_camel_case, format_subject_name
 
+# Verzija parsera: povecati kad se promijeni lexer, gramatika ili AST cvorovi
+# (kljuc je kesa parsiranih fajlova, vidi loader.py)
+PARSER_VERSION = 3
+
+
+def format_warning(warning, source=None):
+    """Poruka za neprepoznat token; warning je (linija, kolona, vrijednost, tip)."""
+    line, column, value, kind = warning
+    where = f"{source}, " if source else ""
+    return (f"Upozorenje ({where}linija {line}, kolona {column}): Neprepoznat token "
+            f"'{value}' (tip: {kind}). Preskačem.")
+
 
 class Parser:
     """Rekurzivni parser za RAS jezik.
 
     Koristi peek/consume mehanizam za citanje tokena.
-    Svaki parse_statement() poziv pokusava prepoznati jedan iskaz."""
-
-    def __init__(self, tokens):
-        self.tokens = tokens
-        self.pos = 0
+    Svaki parse_statement() poziv pokusava prepoznati jedan iskaz.
+
+    Tokeni se citaju lijeno iz bilo kojeg iterable-a (npr. Lexer-a) i dijele
+    na iskaze (sve do tacke) u jednom prolazu. U memoriji je samo trenutni
+    iskaz, a peek()/consume() ne vide dalje od njegove tacke. Vrsta iskaza
+    se bira iz tabele STATEMENTS po kljucnoj rijeci iza imena, pa je
+    parsiranje linearno i za neprepoznate tokene."""
+
+    # Tip tokena iza imena -> (dozvoljeni tipovi imena, metoda iskaza).
+    # Metoda vraca None ako iskaz ipak nije tog oblika (npr. 'X je Y.').
+    STATEMENTS = {
+        'JE':             (('ID',), '_parse_semester'),
+        'POCINJE':        (('ID', 'SEMESTAR'), '_parse_semester_start'),
+        'ZAVRSAVA':       (('ID', 'SEMESTAR'), '_parse_semester_end'),
+        'TRAJE':          (('ID', 'SEMESTAR'), '_parse_semester_duration'),
+        'IMA':            (('ID', 'SEMESTAR'), '_parse_semester_holidays'),
+        'JE_DAN':         (('ID',), '_parse_day'),
+        'JE_TERMIN':      (('ID',), '_parse_slot'),
+        'JE_NASTAVNIK':   (('ID',), '_parse_teacher'),
+        'JE_PREDMET':     (('ID',), '_parse_subject'),
+        'JE_GRUPA':       (('ID',), '_parse_subgroup'),
+        'JE_ODJELJENJE':  (('ID',), '_parse_group'),
+        'JE_PROSTORIJA':  (('ID',), '_parse_room'),
+        'JE_TIP_NASTAVE': (('ID',), '_parse_lecture_type'),
+    }
+
+    def __init__(self, tokens, source=None, verbose=True):
+        self.source = source    # naziv fajla za upozorenja
+        self.verbose = verbose  # ispisuj upozorenja odmah na stderr
+        self.warnings = []      # (linija, kolona, vrijednost, tip) neprepoznatih tokena
+        self._stream = iter(tokens)
+        self._tokens = []       # tokeni trenutnog iskaza (zakljucno sa tackom)
+        self._pos = 0
+        self._last_predaje = -1  # pozicija zadnjeg 'predaje' u iskazu
+        self.source_names = {}   # formatirano ime -> ime iz izvora (prvo pojavljivanje)
+
+    def _statements(self):
+        """Dijeli niz tokena na iskaze; svaki zavrsava tackom (osim zadnjeg)."""
+        statement = []
+        for token in self._stream:
+            statement.append(token)
+            if token.type == 'DOT':
+                yield statement
+                statement = []
+        if statement:
+            yield statement
+
+    def _load(self, statement):
+        self._tokens = statement
+        self._pos = 0
+        self._last_predaje = max(
+            (i for i, tok in enumerate(statement) if tok.type == 'PREDAJE'), default=-1)
+
+    def _name(self, raw):
+        """CamelCase ime iz izvora -> formatirano (internirano) ime."""
+        name = format_camel_case(raw)
+        self.source_names.setdefault(name, raw)
+        return name
+
+    def _subject(self, raw):
+        """Predmet sa prefiksom tipa -> (formatirano ime, kod tipa)."""
+        name, tipo = format_subject_name(raw)
+        self.source_names.setdefault(name, raw[1:])
+        return name, tipo
 
     def peek(self, offset=0):
         """Vraca token na trenutnoj poziciji + offset, bez pomjeranja."""
-        idx = self.pos + offset
-        return self.tokens[idx] if idx < len(self.tokens) else None
+        idx = self._pos + offset
+        return self._tokens[idx] if idx < len(self._tokens) else None
 
     def consume(self, expected=None):
         """Konzumira sljedeci token. Ako je dat expected tip, vraca None
@@ -53,23 +124,27 @@ class Parser:
             return None
         if expected and token.type != expected:
             return None
-        self.pos += 1
+        self._pos += 1
         return token
 
     def parse(self):
         """Parsira cijeli niz tokena i vraca Schedule (korijenski AST cvor)."""
         schedule = Schedule()
-        while self.peek():
-            node = self.parse_statement()
-            if node:
-                schedule.add(node)
-            else:
-                # Token koji nije prepoznat - ispisi upozorenje
-                bad = self.peek()
-                print(f"Upozorenje (linija {bad.line}): Neprepoznat token "
-                      f"'{bad.value}' (tip: {bad.type}). Preskačem.",
-                      file=sys.stderr)
-                self.pos += 1
+        schedule.source_names = self.source_names
+        for statement in self._statements():
+            self._load(statement)
+            # Ako iskaz ne potrosi sve tokene, ostatak se parsira kao novi iskaz
+            while self.peek():
+                node = self.parse_statement()
+                if node:
+                    schedule.add(node)
+                else:
+                    # Token koji nije prepoznat - ispisi upozorenje
+                    bad = self.consume()
+                    warning = (bad.line, bad.column, bad.value, bad.type)
+                    self.warnings.append(warning)
+                    if self.verbose:
+                        print(format_warning(warning, self.source), file=sys.stderr)
         return schedule
 
     def parse_statement(self):
@@ -79,167 +154,159 @@ class Parser:
         if not t:
             return None
 
-        # --- Semestar: deklaracija ---
-        # Format: {Naziv} je semestar.
-        if t.type == 'ID' and self.peek(1) and self.peek(1).type == 'JE':
-            if self.peek(2) and self.peek(2).type == 'SEMESTAR':
-                name = self.consume('ID').value
-                self.consume('JE')
-                self.consume('SEMESTAR')
-                self.consume('DOT')
-                return SemesterDefinitionNode(name)
-
-        # --- Semestar: atributi ---
-        # Format: {Naziv} pocinje/zavrsava/traje/ima ...
-        if t.type in ('ID', 'SEMESTAR'):
-            nxt = self.peek(1)
-            if nxt:
-                name = t.value if t.type == 'ID' else "Semestar"
-
-                # Pocetak semestra: {Naziv} pocinje DD.MM.YYYY.
-                if nxt.type == 'POCINJE':
-                    self.consume(t.type)
-                    self.consume('POCINJE')
-                    val_str = self.consume('DATE').value
-                    val = datetime.strptime(val_str, "%d.%m.%Y").strftime("%Y-%m-%d")
-                    self.consume('DOT')
-                    return SemesterAttributeNode(name, 'start', val)
-
-                # Kraj semestra: {Naziv} zavrsava DD.MM.YYYY.
-                elif nxt.type == 'ZAVRSAVA':
-                    self.consume(t.type)
-                    self.consume('ZAVRSAVA')
-                    val_str = self.consume('DATE').value
-                    val = datetime.strptime(val_str, "%d.%m.%Y").strftime("%Y-%m-%d")
-                    self.consume('DOT')
-                    return SemesterAttributeNode(name, 'end', val)
-
-                # Trajanje: {Naziv} traje N sedmica.
-                elif nxt.type == 'TRAJE':
-                    self.consume(t.type)
-                    self.consume('TRAJE')
-                    val = int(self.consume('NUMBER').value)
-                    # Prihvati i 'sedmica' i 'sedmice'
-                    if self.peek() and self.peek().type in ('SEDMICA', 'SEDMICE'):
-                        self.consume()
-                    self.consume('DOT')
-                    return SemesterAttributeNode(name, 'duration', val)
-
-                # Nenastavni dani: {Naziv} ima nenastavne dane DD.MM.YYYY, ...
-                elif nxt.type == 'IMA':
-                    if self.peek(2) and self.peek(2).type == 'NENASTAVNE':
-                        self.consume(t.type)
-                        self.consume('IMA')
-                        self.consume('NENASTAVNE')
-                        if self.peek().type in ('DANA', 'DANE'):
-                            self.consume()
-
-                        holidays = []
-                        while self.peek() and self.peek().type != 'DOT':
-                            h_str = self.consume('DATE').value
-                            holidays.append(
-                                datetime.strptime(h_str, "%d.%m.%Y").strftime("%Y%m%d")
-                            )
-                        self.consume('DOT')
-                        return SemesterAttributeNode(name, 'holidays', holidays)
-
-        # --- Definicija dana ---
-        # Format: {Naziv} je dan broj {N}.
-        if t.type == 'ID' and self.peek(1) and self.peek(1).type == 'JE_DAN':
-            name = self.consume().value
-            self.consume('JE_DAN')
-            num = self.consume('NUMBER').value
-            self.consume('DOT')
-            return DayDefinitionNode(name, num)
-
-        # --- Definicija termina ---
-        # Format: {SlotID} je termin broj {N} dana {DanNaziv}.
-        if t.type == 'ID' and self.peek(1) and self.peek(1).type == 'JE_TERMIN':
-            slot_id = self.consume().value
-            self.consume('JE_TERMIN')
-            num = self.consume('NUMBER').value
-            self.consume('DANA')
-            day_name = self.consume('ID').value
-            self.consume('DOT')
-            return SlotDefinitionNode(slot_id, day_name, num)
-
-        # --- Definicija nastavnika ---
-        # Format: {ImePrezime} je nastavnik.
-        if t.type == 'ID' and self.peek(1) and self.peek(1).type == 'JE_NASTAVNIK':
-            raw_name = self.consume().value
-            self.consume('JE_NASTAVNIK')
-            self.consume('DOT')
-            return TeacherDefinitionNode(format_camel_case(raw_name))
-
-        # --- Definicija predmeta ---
-        # Format: {tipNaziv} je predmet.  (npr. pUvodUProgramiranje)
-        if t.type == 'ID' and self.peek(1) and self.peek(1).type == 'JE_PREDMET':
-            raw_name = self.consume().value
-            self.consume('JE_PREDMET')
-            self.consume('DOT')
-            subject, tipo = format_subject_name(raw_name)
-            return SubjectDefinitionNode(subject, {tipo})
-
-        # --- Definicija podgrupe (grupa odjeljenja) ---
-        # Format: {Naziv} je grupa odjeljenja {Roditelj}.
-        if t.type == 'ID' and self.peek(1) and self.peek(1).type == 'JE_GRUPA':
-            name = self.consume().value
-            self.consume('JE_GRUPA')
-            parent = self.consume('ID').value
-            self.consume('DOT')
-            return StudySubGroupDefinitionNode(name, parent)
-
-        # --- Definicija odjeljenja ---
-        # Format: {Naziv} je odjeljenje.
-        if t.type == 'ID' and self.peek(1) and self.peek(1).type == 'JE_ODJELJENJE':
-            name = self.consume().value
-            self.consume('JE_ODJELJENJE')
-            self.consume('DOT')
-            return StudyGroupDefinitionNode(name)
-
-        # --- Definicija prostorije ---
-        # Format: {Naziv} je prostorija.
-        if t.type == 'ID' and self.peek(1) and self.peek(1).type == 'JE_PROSTORIJA':
-            name = self.consume().value.replace("_", "")
-            self.consume('JE_PROSTORIJA')
-            self.consume('DOT')
-            return RoomDefinitionNode(name)
-
-        # --- Definicija tipa nastave ---
-        # Format: {Kod} je tip nastave {Naziv} prioriteta {N}.
-        if t.type == 'ID' and self.peek(1) and self.peek(1).type == 'JE_TIP_NASTAVE':
-            code = self.consume().value
-            self.consume('JE_TIP_NASTAVE')
-            raw_name = self.consume('ID').value
-            name = format_camel_case(raw_name)  # CamelCase -> razmak-odvojeno
-            self.consume('PRIORITETA')
-            priority = self.consume('NUMBER').value
-            self.consume('DOT')
-            return LectureTypeDefinitionNode(code, name, priority)
+        nxt = self.peek(1)
+        if nxt and nxt.type in self.STATEMENTS:
+            name_types, method = self.STATEMENTS[nxt.type]
+            if t.type in name_types:
+                node = getattr(self, method)(t)
+                if node:
+                    return node
 
         # --- Iskaz nastave ---
         # Format: {Nastavnik} [i {Nastavnik2}] predaje {predmet}
         #         odjeljenju {Grupa} u prostoriji {Prostorija}
         #         [N puta sedmicno] [svake N sedmice]
         #         tacno u terminu {Slot1} {Slot2} ...
-        if t.type == 'ID':
-            # Provjeri da li se negdje ispred pojavljuje 'predaje'
-            is_teaching = False
-            i = 1
-            while True:
-                future = self.peek(i)
-                if not future or future.type == 'DOT':
-                    break
-                if future.type == 'PREDAJE':
-                    is_teaching = True
-                    break
-                i += 1
-
-            if is_teaching:
-                return self._parse_assignment()
+        # Iskaz je nastava ako se 'predaje' pojavljuje negdje ispred (do tacke)
+        if t.type == 'ID' and self._last_predaje > self._pos:
+            return self._parse_assignment()
 
         return None
 
+    # --- Semestar ---
+
+    def _parse_semester(self, t):
+        """{Naziv} je semestar."""
+        if self.peek(2) and self.peek(2).type == 'SEMESTAR':
+            name = self.consume('ID').value
+            self.consume('JE')
+            self.consume('SEMESTAR')
+            self.consume('DOT')
+            return SemesterDefinitionNode(name)
+        return None
+
+    @staticmethod
+    def _semester_name(t):
+        return t.value if t.type == 'ID' else "Semestar"
+
+    def _parse_semester_start(self, t):
+        """{Naziv} pocinje DD.MM.YYYY."""
+        self.consume(t.type)
+        self.consume('POCINJE')
+        val_str = self.consume('DATE').value
+        val = datetime.strptime(val_str, "%d.%m.%Y").strftime("%Y-%m-%d")
+        self.consume('DOT')
+        return SemesterAttributeNode(self._semester_name(t), 'start', val)
+
+    def _parse_semester_end(self, t):
+        """{Naziv} zavrsava DD.MM.YYYY."""
+        self.consume(t.type)
+        self.consume('ZAVRSAVA')
+        val_str = self.consume('DATE').value
+        val = datetime.strptime(val_str, "%d.%m.%Y").strftime("%Y-%m-%d")
+        self.consume('DOT')
+        return SemesterAttributeNode(self._semester_name(t), 'end', val)
+
+    def _parse_semester_duration(self, t):
+        """{Naziv} traje N sedmica."""
+        self.consume(t.type)
+        self.consume('TRAJE')
+        val = int(self.consume('NUMBER').value)
+        # Prihvati i 'sedmica' i 'sedmice'
+        if self.peek() and self.peek().type in ('SEDMICA', 'SEDMICE'):
+            self.consume()
+        self.consume('DOT')
+        return SemesterAttributeNode(self._semester_name(t), 'duration', val)
+
+    def _parse_semester_holidays(self, t):
+        """{Naziv} ima nenastavne dane DD.MM.YYYY, ..."""
+        if not (self.peek(2) and self.peek(2).type == 'NENASTAVNE'):
+            return None
+        self.consume(t.type)
+        self.consume('IMA')
+        self.consume('NENASTAVNE')
+        if self.peek().type in ('DANA', 'DANE'):
+            self.consume()
+
+        holidays = []
+        while self.peek() and self.peek().type != 'DOT':
+            h_str = self.consume('DATE').value
+            holidays.append(
+                datetime.strptime(h_str, "%d.%m.%Y").strftime("%Y%m%d")
+            )
+        self.consume('DOT')
+        return SemesterAttributeNode(self._semester_name(t), 'holidays', holidays)
+
+    # --- Definicije ---
+
+    def _parse_day(self, t):
+        """{Naziv} je dan broj {N}."""
+        name = self.consume().value
+        self.consume('JE_DAN')
+        num = self.consume('NUMBER').value
+        self.consume('DOT')
+        return DayDefinitionNode(name, num)
+
+    def _parse_slot(self, t):
+        """{SlotID} je termin broj {N} dana {DanNaziv}."""
+        slot_id = self.consume().value
+        self.consume('JE_TERMIN')
+        num = self.consume('NUMBER').value
+        self.consume('DANA')
+        day_name = self.consume('ID').value
+        self.consume('DOT')
+        return SlotDefinitionNode(slot_id, day_name, num)
+
+    def _parse_teacher(self, t):
+        """{ImePrezime} je nastavnik."""
+        raw_name = self.consume().value
+        self.consume('JE_NASTAVNIK')
+        self.consume('DOT')
+        return TeacherDefinitionNode(self._name(raw_name))
+
+    def _parse_subject(self, t):
+        """{tipNaziv} je predmet.  (npr. pUvodUProgramiranje)"""
+        raw_name = self.consume().value
+        self.consume('JE_PREDMET')
+        self.consume('DOT')
+        subject, tipo = self._subject(raw_name)
+        return SubjectDefinitionNode(subject, {tipo})
+
+    def _parse_subgroup(self, t):
+        """{Naziv} je grupa odjeljenja {Roditelj}."""
+        name = self.consume().value
+        self.consume('JE_GRUPA')
+        parent = self.consume('ID').value
+        self.consume('DOT')
+        return StudySubGroupDefinitionNode(name, parent)
+
+    def _parse_group(self, t):
+        """{Naziv} je odjeljenje."""
+        name = self.consume().value
+        self.consume('JE_ODJELJENJE')
+        self.consume('DOT')
+        return StudyGroupDefinitionNode(name)
+
+    def _parse_room(self, t):
+        """{Naziv} je prostorija."""
+        name = sys.intern(self.consume().value.replace("_", ""))
+        self.consume('JE_PROSTORIJA')
+        self.consume('DOT')
+        return RoomDefinitionNode(name)
+
+    def _parse_lecture_type(self, t):
+        """{Kod} je tip nastave {Naziv} prioriteta {N}."""
+        code = self.consume().value
+        self.consume('JE_TIP_NASTAVE')
+        raw_name = self.consume('ID').value
+        name = self._name(raw_name)  # CamelCase -> razmak-odvojeno
+        self.consume('PRIORITETA')
+        priority = self.consume('NUMBER').value
+        self.consume('DOT')
+        return LectureTypeDefinitionNode(code, name, priority)
+
+    # --- Nastava ---
+
     def _parse_assignment(self):
         """Parsira iskaz nastave (sve do tacke)."""
         # Nastavnici (prije 'predaje')
@@ -247,13 +314,13 @@ class Parser:
         while self.peek() and self.peek().type != 'PREDAJE':
             tok = self.consume()
             if tok.value != 'i':
-                teachers.append(format_camel_case(tok.value))
+                teachers.append(self._name(tok.value))
 
         self.consume('PREDAJE')
 
         # Predmet (jedan token sa prefiksom tipa)
         raw_subject = self.consume('ID').value
-        subject, tipo = format_subject_name(raw_subject)
+        subject, tipo = self._subject(raw_subject)
 
         # Meta-podaci (grupe, prostorije, termini, frekvencija, ...)
         meta = {
@@ -275,7 +342,7 @@ class Parser:
                     meta['grupa'].append(self.consume().value)
 
             elif curr.type == 'PROSTORIJI':
-                meta['rooms'].append(self.consume('ID').value.replace("_", ""))
+                meta['rooms'].append(sys.intern(self.consume('ID').value.replace("_", "")))
 
             elif curr.type == 'TERMIN':
                 # Svi slotovi nakon 'tacno u terminu'
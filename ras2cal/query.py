@@ -0,0 +1,330 @@
+"""
+query.py - Upiti nad iskazima nastave (filtriranje rasporeda)
+
+Izraz upita se sastoji od uslova oblika dimenzija:vrijednost, povezanih
+sa AND, OR, NOT i zagradama (AND je podrazumijevan izmedju uslova):
+
+    teacher:VedranLjubovic                  tacno ime (bez obzira na velika slova i razmake)
+    teacher:Vedran*                         prefiks
+    subject:/^Razvoj/                       regex (re.search)
+    group:RI1,RI2                           vise vrijednosti (bilo koja)
+    room:"A 1"                              vrijednost sa razmacima
+    (group:RI1 OR group:RI2) AND NOT type:T
+
+Dimenzije: teacher, room, group, subject, type. Kljucevi indeksa su imena
+kako ih parser cuva u AST-u i kako se ispisuju u izlazima (CamelCase je
+rastavljen na rijeci: "Vedran Ljubovic", cifre se ne odvajaju:
+"Nastavnik1Prezime1"). Tacno i prefiks poredjenje ignorisu velika slova i
+razmake, pa vazi i ime iz izvornog .ras koda (VedranLjubovic). Regex
+(bez obzira na velika slova) pogadja ime ako pogadja ispisano ime ili
+isto ime bez razmaka (kao u .ras kodu).
+
+AssignmentIndex se gradi jednom po AST-u: za svaku dimenziju i vrijednost
+cuva listu iskaza (obrnuti indeks). Uslov se razrjesava nad razlicitim
+vrijednostima (kojih je malo), a rezultat je bitset (Python int) nad
+iskazima, pa su AND/OR/NOT bitske operacije. Stotine filtriranih pogleda
+(npr. po jedan za svakog nastavnika) kostaju jednu gradnju indeksa i po
+jedan jeftin upit.
+"""
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import List, Tuple
+
+# Dimenzija -> funkcija koja vraca vrijednosti iskaza u toj dimenziji
+DIMENSIONS = {
+    'teacher': lambda node: node.teachers,
+    'room': lambda node: node.rooms,
+    'group': lambda node: [g for sublist in node.groups for g in sublist],
+    'subject': lambda node: (node.subject,),
+    'type': lambda node: (node.type,),
+}
+
+
+# ---------------------------------------------------------------------------
+# Izraz upita
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Term:
+    """Uslov nad jednom dimenzijom; matchers su parovi (vrsta, vrijednost),
+    vrsta je 'exact', 'prefix' ili 'regex'. Ispunjen je ako bilo koji
+    matcher pogadja bilo koju vrijednost iskaza."""
+    dimension: str
+    matchers: Tuple[Tuple[str, str], ...]
+
+    def evaluate(self, index):
+        bits = 0
+        for kind, value in self.matchers:
+            bits |= index.match(self.dimension, kind, value)
+        return bits
+
+
+@dataclass(frozen=True)
+class And:
+    parts: Tuple
+
+    def evaluate(self, index):
+        bits = index.all
+        for part in self.parts:
+            bits &= part.evaluate(index)
+            if not bits:
+                break
+        return bits
+
+
+@dataclass(frozen=True)
+class Or:
+    parts: Tuple
+
+    def evaluate(self, index):
+        bits = 0
+        for part in self.parts:
+            bits |= part.evaluate(index)
+        return bits
+
+
+@dataclass(frozen=True)
+class Not:
+    part: object
+
+    def evaluate(self, index):
+        return index.all & ~self.part.evaluate(index)
+
+
+def filters_query(filters):
+    """Upit iz rjecnika filtera komandne linije ({'teacher': regex, ...});
+    svaki zadani filter je regex uslov, svi moraju biti ispunjeni."""
+    return And(tuple(Term(dimension, (('regex', pattern),))
+                     for dimension, pattern in filters.items() if pattern))
+
+
+# ---------------------------------------------------------------------------
+# Parsiranje izraza
+# ---------------------------------------------------------------------------
+
+_KEYWORDS = ('AND', 'OR', 'NOT')
+
+
+def parse_query(text):
+    """Parsira izraz upita u stablo (Term/And/Or/Not). ValueError za gresku."""
+    tokens = _tokenize(text)
+    if not tokens:
+        raise ValueError("Prazan upit")
+    node, pos = _parse_or(tokens, 0)
+    if pos != len(tokens):
+        raise ValueError(f"Neocekivano '{_show(tokens[pos])}' u upitu")
+    return node
+
+
+def _tokenize(text):
+    """Tokeni: '(', ')', kljucne rijeci i uslovi ('term', dimenzija, matcheri)."""
+    tokens = []
+    pos, length = 0, len(text)
+    while pos < length:
+        char = text[pos]
+        if char.isspace():
+            pos += 1
+        elif char in '()':
+            tokens.append(char)
+            pos += 1
+        else:
+            start = pos
+            while pos < length and (text[pos].isalnum() or text[pos] == '_'):
+                pos += 1
+            word = text[start:pos]
+            if pos < length and text[pos] == ':' and word:
+                dimension = word.lower()
+                if dimension not in DIMENSIONS:
+                    raise ValueError(f"Nepoznata dimenzija '{word}' "
+                                     f"(moguce: {', '.join(DIMENSIONS)})")
+                matchers, pos = _scan_values(text, pos + 1)
+                tokens.append(('term', dimension, matchers))
+            elif word.upper() in _KEYWORDS and (pos == length or text[pos].isspace()
+                                                or text[pos] in '()'):
+                tokens.append(word.upper())
+            else:
+                raise ValueError(f"Ocekivan uslov 'dimenzija:vrijednost' "
+                                 f"na poziciji {start + 1}")
+    return tokens
+
+
+def _scan_values(text, pos):
+    """Zarezom odvojene vrijednosti jednog uslova -> (matcheri, nova pozicija)."""
+    matchers = []
+    length = len(text)
+    while True:
+        if pos < length and text[pos] in '"/':
+            quote = text[pos]
+            end = pos + 1
+            while end < length and text[end] != quote:
+                end += 2 if text[end] == '\\' and quote == '/' else 1
+            if end >= length:
+                raise ValueError(f"Nezatvoren {quote} u upitu")
+            value = text[pos + 1:end]
+            if quote == '/':
+                try:
+                    re.compile(value)
+                except re.error as e:
+                    raise ValueError(f"Neispravan regex /{value}/: {e}") from None
+                matchers.append(('regex', value))
+            else:
+                matchers.append(('exact', value))
+            pos = end + 1
+        else:
+            start = pos
+            while pos < length and not text[pos].isspace() and text[pos] not in '(),':
+                pos += 1
+            value = text[start:pos]
+            if not value:
+                raise ValueError(f"Nedostaje vrijednost na poziciji {start + 1}")
+            if value.endswith('*'):
+                matchers.append(('prefix', value[:-1]))
+            else:
+                matchers.append(('exact', value))
+        if pos < length and text[pos] == ',':
+            pos += 1
+            continue
+        return tuple(matchers), pos
+
+
+def _parse_or(tokens, pos):
+    parts = []
+    node, pos = _parse_and(tokens, pos)
+    parts.append(node)
+    while pos < len(tokens) and tokens[pos] == 'OR':
+        node, pos = _parse_and(tokens, pos + 1)
+        parts.append(node)
+    return (parts[0] if len(parts) == 1 else Or(tuple(parts))), pos
+
+
+def _parse_and(tokens, pos):
+    parts = []
+    node, pos = _parse_not(tokens, pos)
+    parts.append(node)
+    while pos < len(tokens) and tokens[pos] not in ('OR', ')'):
+        if tokens[pos] == 'AND':
+            pos += 1
+        node, pos = _parse_not(tokens, pos)
+        parts.append(node)
+    return (parts[0] if len(parts) == 1 else And(tuple(parts))), pos
+
+
+def _parse_not(tokens, pos):
+    if pos >= len(tokens):
+        raise ValueError("Nepotpun upit")
+    token = tokens[pos]
+    if token == 'NOT':
+        node, pos = _parse_not(tokens, pos + 1)
+        return Not(node), pos
+    if token == '(':
+        node, pos = _parse_or(tokens, pos + 1)
+        if pos >= len(tokens) or tokens[pos] != ')':
+            raise ValueError("Nedostaje ')' u upitu")
+        return node, pos + 1
+    if isinstance(token, tuple):
+        _, dimension, matchers = token
+        return Term(dimension, matchers), pos + 1
+    raise ValueError(f"Neocekivano '{_show(token)}' u upitu")
+
+
+def _show(token):
+    return f"{token[1]}:..." if isinstance(token, tuple) else token
+
+
+# ---------------------------------------------------------------------------
+# Indeks iskaza
+# ---------------------------------------------------------------------------
+
+class AssignmentIndex:
+    """Obrnuti indeks iskaza nastave po dimenzijama (gradi se jednom po AST-u)."""
+
+    def __init__(self, schedule):
+        self.schedule = schedule
+        self.assignments = schedule.assignments
+        self.all = (1 << len(self.assignments)) - 1
+
+        # dimenzija -> vrijednost -> indeksi iskaza (rastuce, bez ponavljanja)
+        self.postings = {dimension: {} for dimension in DIMENSIONS}
+        for dimension, values_of in DIMENSIONS.items():
+            postings = self.postings[dimension]
+            for i, node in enumerate(self.assignments):
+                for value in values_of(node):
+                    indices = postings.get(value)
+                    if indices is None:
+                        postings[value] = [i]
+                    elif indices[-1] != i:
+                        indices.append(i)
+
+        # Za tacno i prefiks poredjenje (sortirano, za binarnu pretragu)
+        self._folded = {}       # dimenzija -> [(_fold(vrijednost), vrijednost)]
+        for dimension, postings in self.postings.items():
+            self._folded[dimension] = sorted((_fold(value), value) for value in postings)
+
+        self._bitsets = {}      # (dimenzija, vrijednost) -> bitset
+        self._matches = {}      # (dimenzija, vrsta, vrijednost) -> bitset
+
+    # --- Razrjesavanje uslova ---
+
+    def values(self, dimension, kind, value):
+        """Razlicite vrijednosti dimenzije koje pogadja matcher."""
+        folded = self._folded[dimension]
+        if kind == 'regex':
+            pattern = re.compile(value, re.IGNORECASE)
+            return [original for _, original in folded
+                    if pattern.search(original) or pattern.search(''.join(original.split()))]
+        key = _fold(value)
+        found = []
+        for pos in range(bisect_left(folded, (key,)), len(folded)):
+            name, original = folded[pos]
+            if name == key or (kind == 'prefix' and name.startswith(key)):
+                found.append(original)
+            else:
+                break
+        return found
+
+    def match(self, dimension, kind, value):
+        """Bitset iskaza ciji neki element dimenzije pogadja matcher."""
+        cache_key = (dimension, kind, value)
+        bits = self._matches.get(cache_key)
+        if bits is None:
+            bits = 0
+            for original in self.values(dimension, kind, value):
+                bits |= self._bitset(dimension, original)
+            self._matches[cache_key] = bits
+        return bits
+
+    def _bitset(self, dimension, value):
+        key = (dimension, value)
+        bits = self._bitsets.get(key)
+        if bits is None:
+            buffer = bytearray((len(self.assignments) + 7) // 8)
+            for i in self.postings[dimension][value]:
+                buffer[i >> 3] |= 1 << (i & 7)
+            bits = self._bitsets[key] = int.from_bytes(buffer, 'little')
+        return bits
+
+    # --- Rezultati ---
+
+    def select(self, query) -> List[int]:
+        """Indeksi iskaza (rastuce) koji zadovoljavaju upit (tekst ili stablo)."""
+        if isinstance(query, str):
+            query = parse_query(query)
+        bits = query.evaluate(self)
+        data = bits.to_bytes((len(self.assignments) + 7) // 8, 'little')
+        return [pos * 8 + bit for pos, byte in enumerate(data) if byte
+                for bit in range(8) if byte >> bit & 1]
+
+    def filter(self, query):
+        """Novi Schedule sa svim definicijama i samo iskazima iz upita."""
+        from .utils import copy_definitions
+
+        filtered = copy_definitions(self.schedule)
+        assignments = self.assignments
+        filtered.assignments = [assignments[i] for i in self.select(query)]
+        return filtered
+
+
+def _fold(value):
+    """Kljuc za poredjenje: bez razmaka i bez obzira na velika slova."""
+    return ''.join(value.split()).casefold()
@@ -2,32 +2,58 @@
 utils.py - Pomocne funkcije za ras2cal modul
 
 Sadrzi:
-    - format_camel_case: CamelCase -> razmak-odvojeno ime
+    - format_camel_case: CamelCase -> razmak-odvojeno ime (memoizovano)
     - format_subject_name: tip-prefixed naziv -> (ime, kod_tipa)
     - merge_events: spajanje dupliciranih evenata u JSON izlazu
+    - PreparedData: lijeno pripremljeni redovi za HTML i grid generatore
     - load_source_recursive: ucitavanje .ras fajlova sa UVEZI direktivama
+    - copy_definitions: kopija rasporeda sa definicijama, bez assignmenta
     - filter_schedule: filtriranje rasporeda po nastavniku/grupi/prostoriji/predmetu
 """
 import os
 import re
 import sys
+from functools import cached_property, lru_cache
 
 
 # ---------------------------------------------------------------------------
 # Formatiranje imena
 # ---------------------------------------------------------------------------
 
+# Ista imena (nastavnici, predmeti, tipovi) ponavljaju se u hiljadama iskaza,
+# pa se rezultat formatiranja pamti u ogranicenom LRU kesu i internira: svi
+# cvorovi i eventi dijele jedan string po imenu, a regex se izvrsava jednom
+# po razlicitom imenu umjesto jednom po pojavljivanju.
+NAME_CACHE_SIZE = 65536
+
+_CAMEL_RE = re.compile(r'([a-z])([A-Z])')
+_SUBJECT_RES = (
+    re.compile(r'([a-z0-9])([A-Z])'),
+    re.compile(r'([A-Z])([A-Z][a-z])'),
+    re.compile(r'([a-zA-Z])(\d)'),
+)
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def format_camel_case(n):
     """Pretvara CamelCase u razmak-odvojeno ime.
     Primjer: 'ImePrezime' -> 'Ime Prezime'
              'LaboratorijskeVjezbe' -> 'Laboratorijske Vjezbe'"""
-    return re.sub(r'([a-z])([A-Z])', r'\1 \2', n.replace("_", "")).strip()
+    return sys.intern(_CAMEL_RE.sub(r'\1 \2', n.replace("_", "")).strip())
 
 
 # Alias za kompatibilnost (koristi se u tt2cal.py i drugdje)
 format_person_name = format_camel_case
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def _split_subject_words(name):
+    """Razdvaja CamelCase naziv predmeta (bez prefiksa tipa) u rijeci."""
+    for pattern in _SUBJECT_RES:
+        name = pattern.sub(r'\1 \2', name)
+    return sys.intern(name.strip())
+
+
 def format_subject_name(s, valid_types=None):
     """Razdvaja naziv predmeta na (ime, tip_kod).
 
@@ -56,12 +82,7 @@ def format_subject_name(s, valid_types=None):
         tipo = first_char
 
     # Ukloni prefix tipa i razdvoji CamelCase u rijeci
-    name = s[1:]
-    name = re.sub(r'([a-z0-9])([A-Z])', r'\1 \2', name)
-    name = re.sub(r'([A-Z])([A-Z][a-z])', r'\1 \2', name)
-    name = re.sub(r'([a-zA-Z])(\d)', r'\1 \2', name)
-
-    return name.strip(), tipo
+    return _split_subject_words(s[1:]), tipo
 
 
 # ---------------------------------------------------------------------------
@@ -70,39 +91,42 @@ def format_subject_name(s, valid_types=None):
 
 def merge_events(events):
     """Spaja evente koji imaju isti datum, vrijeme i osobu.
-    Koristi se u JSON i HTML generatorima za konsolidaciju izlaza."""
-    merged_map = {}
+    Koristi se u JSON i HTML generatorima za konsolidaciju izlaza.
 
+    Predmeti (" / "), tipovi ("/") i grupe spojenog eventa su razliciti,
+    redom prvog pojavljivanja; prostorije su unija, sortirana ako je bilo
+    spajanja. Redovi se prvo grupisu po kljucu (dict), a vrijednosti se
+    spajaju preko dict-a kao uredjenog skupa - linearno u broju redova."""
+    merged_map = {}
     for e in events:
         key = (e['datum'], e['vrijeme_start'], e['vrijeme_kraj'], e['osoba'])
-
-        if key in merged_map:
-            existing = merged_map[key]
-
-            # Spoji predmete ako su razliciti
-            if e['predmet'] not in existing['predmet']:
-                existing['predmet'] += " / " + e['predmet']
-
-            # Spoji grupe
-            for sublist in e['grupe']:
-                if sublist not in existing['grupe']:
-                    existing['grupe'].append(sublist)
-
-            # Spoji tipove
-            if e['tip'] not in existing['tip']:
-                existing['tip'] += "/" + e['tip']
-
-            # Spoji prostorije (unikatne, sortirane)
-            existing_rooms = set(existing['prostorija'])
-            new_rooms = set(e['prostorija'])
-            existing['prostorija'] = sorted(existing_rooms | new_rooms)
+        rows = merged_map.get(key)
+        if rows is None:
+            merged_map[key] = [e]
         else:
-            merged_map[key] = e.copy()
+            rows.append(e)
+
+    result = []
+    for rows in merged_map.values():
+        merged = rows[0].copy()
+        if len(rows) == 1:
+            # Vlastita lista grupa (izlaz ne smije dijeliti listu sa ulazom)
+            merged['grupe'] = list(merged['grupe'])
             # Osiguraj da prostorija bude lista
-            if not isinstance(merged_map[key]['prostorija'], list):
-                merged_map[key]['prostorija'] = [merged_map[key]['prostorija']]
-
-    return list(merged_map.values())
+            if not isinstance(merged['prostorija'], list):
+                merged['prostorija'] = [merged['prostorija']]
+        else:
+            merged['predmet'] = " / ".join(dict.fromkeys(e['predmet'] for e in rows))
+            merged['tip'] = "/".join(dict.fromkeys(e['tip'] for e in rows))
+            groups = dict.fromkeys(tuple(sub) for e in rows for sub in e['grupe'])
+            merged['grupe'] = [list(sub) for sub in groups]
+            rooms = set()
+            for e in rows:
+                room = e['prostorija']
+                rooms.update(room if isinstance(room, list) else (room,))
+            merged['prostorija'] = sorted(rooms)
+        result.append(merged)
+    return result
 
 
 # ---------------------------------------------------------------------------
@@ -159,9 +183,10 @@ def condense_teachers(data):
         data: lista dict-ova (izlaz iz prepare_raw_data ili merge_events)
 
     Returns:
-        lista konsolidiranih dict-ova.
+        lista konsolidiranih dict-ova; nastavnici su razliciti, redom
+        prvog pojavljivanja.
     """
-    grouped = {}
+    grouped = {}    # kljuc -> (zapis, nastavnici kao uredjen skup)
     for item in data:
         rooms_tuple = tuple(sorted(item.get('prostorija', [])))
         groups_tuple = tuple(tuple(sub) for sub in item.get('grupe', []))
@@ -171,17 +196,60 @@ def condense_teachers(data):
             item['predmet'], groups_tuple, rooms_tuple, item['tip'],
         )
 
-        if key not in grouped:
-            grouped[key] = item.copy()
-            grouped[key]['teachers'] = list(item['teachers'])
+        entry = grouped.get(key)
+        if entry is None:
+            grouped[key] = (item.copy(), dict.fromkeys(item['teachers']))
         else:
-            # Dodaj nastavnike kojih nema u listi
-            current = grouped[key]['teachers']
-            for t in item['teachers']:
-                if t not in current:
-                    current.append(t)
-
-    return list(grouped.values())
+            entry[1].update(dict.fromkeys(item['teachers']))
+
+    result = []
+    for item, teachers in grouped.values():
+        item['teachers'] = list(teachers)
+        result.append(item)
+    return result
+
+
+class PreparedData:
+    """Redovi za HTML i grid generatore, racunati lijeno i najvise jednom.
+
+    Dobija se preko ScheduleModel.prepared(), pa svi generatori istog
+    modela (npr. -w i -g u jednom pokretanju) dijele iste redove.
+    Redovi se dijele izmedju pogleda i ne smiju se mijenjati."""
+
+    def __init__(self, events):
+        self.events = events
+
+    @cached_property
+    def raw(self):
+        """prepare_raw_data: jedan red po nastavniku eventa."""
+        return prepare_raw_data(self.events)
+
+    @cached_property
+    def merged(self):
+        """merge_events(raw)"""
+        return merge_events(self.raw)
+
+    @cached_property
+    def condensed_raw(self):
+        """condense_teachers(raw)"""
+        return condense_teachers(self.raw)
+
+    @cached_property
+    def condensed_merged(self):
+        """condense_teachers(merged)"""
+        return condense_teachers(self.merged)
+
+    @cached_property
+    def event_rows(self):
+        """(prvi, iza zadnjeg) red u raw za svaki event: po jedan red za
+        svakog nastavnika, jedan ako event nema nastavnika."""
+        rows = []
+        first = 0
+        for ev in self.events:
+            last = first + (len(ev.teachers) or 1)
+            rows.append((first, last))
+            first = last
+        return rows
 
 
 # ---------------------------------------------------------------------------
@@ -238,18 +306,10 @@ def load_source_recursive(file_path, seen=None):
 # Filtriranje rasporeda
 # ---------------------------------------------------------------------------
 
-def filter_schedule(schedule, filters):
-    """Filtrira assignments po nastavniku, prostoriji, grupi ili predmetu.
-    Vraca novi Schedule sa svim definicijama ali samo filtriranim assignmentima.
-
-    Kopira sve definicije (dani, termini, nastavnici, itd.) i konfiguraciju
-    (semester_info, base_time, default_types) na novi Schedule objekat.
-
-    Args:
-        schedule: Schedule AST objekat
-        filters: dict sa kljucevima 'teacher', 'room', 'group', 'subject'
-                 (vrijednosti su regex obrasci ili None)
-    """
+def copy_definitions(schedule):
+    """Vraca novi Schedule sa svim definicijama (dani, termini, nastavnici,
+    itd.) i konfiguracijom (semester_info, base_time, default_types), ali
+    bez assignmenta."""
     from .models import Schedule
 
     new_schedule = Schedule()
@@ -263,6 +323,7 @@ def filter_schedule(schedule, filters):
     new_schedule.subgroups = schedule.subgroups
     new_schedule.rooms = schedule.rooms
     new_schedule.lecture_types = schedule.lecture_types
+    new_schedule.source_names = schedule.source_names
 
     # Kopiraj semester info i konfiguraciju
     new_schedule.semester_info = type(schedule.semester_info)(schedule.semester_info)
@@ -270,31 +331,22 @@ def filter_schedule(schedule, filters):
     new_schedule.slot_duration = schedule.slot_duration
     new_schedule.slots_per_index = schedule.slots_per_index
     new_schedule.default_types = schedule.default_types
+    return new_schedule
 
-    # Filtriraj assignments
-    for node in schedule.assignments:
-        match = True
-
-        if filters.get('teacher'):
-            if not any(re.search(filters['teacher'], t, re.IGNORECASE)
-                       for t in node.teachers):
-                match = False
-
-        if match and filters.get('room'):
-            if not any(re.search(filters['room'], r, re.IGNORECASE)
-                       for r in node.rooms):
-                match = False
 
-        if match and filters.get('group'):
-            flat_groups = ", ".join(", ".join(sub) for sub in node.groups)
-            if not re.search(filters['group'], flat_groups, re.IGNORECASE):
-                match = False
+def filter_schedule(schedule, filters):
+    """Filtrira assignments po nastavniku, prostoriji, grupi ili predmetu.
+    Vraca novi Schedule sa svim definicijama ali samo filtriranim assignmentima.
 
-        if match and filters.get('subject'):
-            if not re.search(filters['subject'], node.subject, re.IGNORECASE):
-                match = False
+    Svaki filter je regex (bez obzira na velika slova) koji mora pogoditi
+    bar jedno ime u toj dimenziji; zadani filteri moraju vaziti svi. Za
+    slozenije upite i vise pogleda nad istim AST-om vidi query.py.
 
-        if match:
-            new_schedule.assignments.append(node)
+    Args:
+        schedule: Schedule AST objekat
+        filters: dict sa kljucevima 'teacher', 'room', 'group', 'subject'
+                 (vrijednosti su regex obrasci ili None)
+    """
+    from .query import AssignmentIndex, filters_query
 
-    return new_schedule
+    return AssignmentIndex(schedule).filter(filters_query(filters))
@@ -6,20 +6,36 @@
 
 import argparse
 import csv
+import difflib
+import hashlib
+import heapq
 import json
 import logging
 import os
+import random
+import re
 import sys
-from datetime import datetime
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+
+# Opcionalni brzi JSON backend (ako je instaliran)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # --- KONFIGURACIJA PUTANJA ---
 CSV_DIR  = 'csv'
 LOG_DIR  = 'logs'
 AUTH_DIR = 'auth'
 JSON_DIR = 'data'
+STATE_DIR = 'state'
 
 SERVICE_ACCOUNT_FILE = os.path.join(AUTH_DIR, 'service_account.json')
 SCOPES = ['https://www.googleapis.com/auth/calendar']
@@ -29,6 +45,29 @@ FILE_CALENDARS = os.path.join(CSV_DIR, 'person_calendars.csv')
 FILE_ROOMS     = os.path.join(CSV_DIR, 'rooms.csv')
 FILE_TYPES     = os.path.join(CSV_DIR, 'lecture_type.csv')
 
+# Korak ponavljanja u danima za podržane RRULE frekvencije
+FREQ_DAYS = {'DAILY': 1, 'WEEKLY': 7}
+
+# Maksimalan broj zahtjeva u jednom batch-u (limit Google API-ja je 50)
+BATCH_SIZE = 50
+
+# Ponavljanje privremeno neuspjelih zahtjeva (rate limit, 5xx) sa eksponencijalnim backoff-om
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0  # sekunde, udvostručuje se u svakom pokušaju
+TRANSIENT_STATUS = {429, 500, 502, 503, 504}
+
+# Privatno svojstvo događaja u kojem čuvamo otisak termina (za verifikaciju)
+FP_PROPERTY = 'tt2cal_fp'
+
+# Opcionalna kolona sa alternativnim imenima u person.csv / rooms.csv (odvojena sa ';')
+ALIAS_COLUMN = 'aliases'
+
+# Prijedlozi za nepoznato ime: difflib rangira samo ovoliko ključeva sa najviše zajedničkih trigrama
+SUGGEST_CANDIDATES = 50
+
+# Polja koja verifikacija čita sa Google-a (field mask umjesto punih događaja)
+VERIFY_FIELDS = 'items(id,summary,location,description,start,end,extendedProperties/private),nextPageToken'
+
 def setup_logging(calendar_name):
     if not os.path.exists(LOG_DIR): os.makedirs(LOG_DIR)
     timestamp = datetime.now().strftime('%Y-%m-%d-%H-%M')
@@ -52,23 +91,174 @@ def batch_callback(request_id, response, exception):
     if exception is not None:
         logging.error(f"   [BATCH ERROR] Zahtjev {request_id} neuspješan: {exception}")
 
-def load_csv_to_dict(filename, key_col):
+def is_transient(exception):
+    """Da li je greška privremena (vrijedi ponoviti zahtjev nakon pauze)."""
+    if not isinstance(exception, HttpError): return False
+    if exception.resp.status in TRANSIENT_STATUS: return True
+    return exception.resp.status == 403 and 'ratelimitexceeded' in str(exception).lower()
+
+def is_gone(exception):
+    """Događaj je već obrisan - brisanje se smatra uspješnim."""
+    return isinstance(exception, HttpError) and exception.resp.status in (404, 410)
+
+def execute_batched(service, requests, dead_letters=None):
+    """Izvršava listu (request_id, zahtjev, opis) trojki u batch-evima po BATCH_SIZE.
+
+    Privremeno neuspjeli zahtjevi se ponavljaju do MAX_RETRIES puta sa
+    eksponencijalnim backoff-om. Trajno neuspjeli se loguju i (ako je dat
+    dead_letters) dodaju u listu kao opis zahtjeva + greška.
+    Vraća rječnik request_id -> (response, exception)."""
+    results = {}
+    def callback(request_id, response, exception):
+        results[request_id] = (response, exception)
+
+    pending = requests
+    for attempt in range(MAX_RETRIES + 1):
+        for i in range(0, len(pending), BATCH_SIZE):
+            batch = service.new_batch_http_request(callback=callback)
+            for request_id, request, _ in pending[i:i + BATCH_SIZE]:
+                batch.add(request, request_id=request_id)
+            batch.execute()
+
+        pending = [r for r in pending if is_transient(results[r[0]][1])]
+        if not pending or attempt == MAX_RETRIES: break
+        time.sleep(BACKOFF_BASE * 2 ** attempt + random.random())
+
+    for request_id, _, record in requests:
+        response, exception = results[request_id]
+        if exception is None: continue
+        if record.get('operacija') == 'delete' and is_gone(exception):
+            results[request_id] = (response, None)
+            continue
+        batch_callback(request_id, response, exception)
+        if dead_letters is not None:
+            dead_letters.append(dict(record, greska=str(exception), vrijeme=datetime.now().isoformat(timespec='seconds')))
+    return results
+
+def calendar_service(user_google_id):
+    creds = service_account.Credentials.from_service_account_file(
+        SERVICE_ACCOUNT_FILE, scopes=SCOPES, subject=user_google_id)
+    return build('calendar', 'v3', credentials=creds)
+
+def json_loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def open_csv_checked(filename):
     if not os.path.exists(filename):
         logging.error(f"Nedostaje fajl: {filename}")
         sys.exit(1)
-    with open(filename, mode='r', encoding='utf-8') as f:
-        return {row[key_col]: row for row in csv.DictReader(f, quotechar='"')}
-
-def transform_event(termin, tipovi, prostorije, osobe_map):
+    return open(filename, mode='r', encoding='utf-8')
+
+# --- INDEKS OSOBA I PROSTORIJA ---
+
+# Slova koja NFKD ne rastavlja na osnovno slovo + dijakritik
+_TRANSLIT = str.maketrans({'đ': 'dj', 'Đ': 'Dj', 'ß': 'ss', 'ø': 'o', 'Ø': 'O', 'ł': 'l', 'Ł': 'L'})
+_CAMEL_RE = re.compile(r'(?<=[^\W\d_])(?=[A-ZČĆŽŠĐ][a-zčćžšđ])')
+_SEP_RE = re.compile(r'[\s_.]+')
+
+def normalize_name(name):
+    """Normalizuje ime za poređenje: 'VedranLjubović', 'vedran_ljubovic' i
+    ' Vedran  Ljubovic ' daju isti ključ ('vedran ljubovic')."""
+    s = _CAMEL_RE.sub(' ', name.strip().translate(_TRANSLIT))
+    s = ''.join(c for c in unicodedata.normalize('NFKD', s) if not unicodedata.combining(c))
+    return _SEP_RE.sub(' ', s).strip().casefold()
+
+def trigrams(norm):
+    """Skup trigrama normalizovanog imena (sa razmakom na krajevima)."""
+    padded = f" {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class NameIndex:
+    """Indeks redova CSV fajla (osobe ili prostorije) po normalizovanom imenu.
+
+    Lookup je O(1): prvo tačan ključ, zatim normalizovano ime, alias, google_id
+    i na kraju ime sa sortiranim riječima ('Ljubovic Vedran'). Dvosmisleni
+    normalizovani ključevi (dvije osobe sa istim imenom) se ne razrješavaju."""
+
+    def __init__(self, rows, key_col):
+        self.rows = {row[key_col]: row for row in rows if row.get(key_col)}
+        self._index = {}
+        self._ambiguous = set()
+        self._grams = None  # trigram -> normalizovani ključevi (gradi se pri prvom suggest)
+        for key, row in self.rows.items():
+            names = [key] + [a for a in (row.get(ALIAS_COLUMN) or '').split(';') if a.strip()]
+            for name in names:
+                norm = normalize_name(name)
+                self._add(norm, key)
+                self._add(' '.join(sorted(norm.split())), key)
+            if row.get('google_id'):
+                self._add(normalize_name(row['google_id']), key)
+
+    def _add(self, norm, key):
+        if self._index.setdefault(norm, key) != key:
+            self._ambiguous.add(norm)
+
+    def resolve(self, name):
+        """Vraća ključ (firstName_lastName / room) za dato ime ili None."""
+        if name in self.rows:
+            return name
+        norm = normalize_name(name)
+        for candidate in (norm, ' '.join(sorted(norm.split()))):
+            if candidate in self._index and candidate not in self._ambiguous:
+                return self._index[candidate]
+        return None
+
+    def get(self, name, default=None):
+        key = self.resolve(name)
+        return self.rows[key] if key is not None else default
+
+    def suggest(self, name, n=3):
+        """Najsličniji poznati ključevi (za poruke o nepoznatim imenima).
+
+        Kandidati se biraju preko indeksa trigrama (samo ključevi sa zajedničkim
+        trigramima, najviše SUGGEST_CANDIDATES), a difflib rangira samo njih."""
+        if self._grams is None:
+            self._grams = {}
+            for norm in self._index:
+                for gram in trigrams(norm):
+                    self._grams.setdefault(gram, []).append(norm)
+
+        norm = normalize_name(name)
+        shared = {}
+        for gram in trigrams(norm):
+            for candidate in self._grams.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        candidates = heapq.nlargest(SUGGEST_CANDIDATES, shared, key=shared.get)
+        matches = difflib.get_close_matches(norm, candidates, n=n * 2, cutoff=0.75)
+        return list(dict.fromkeys(self._index[m] for m in matches))[:n]
+
+    def __getitem__(self, key):
+        return self.rows[key]
+
+    def __contains__(self, name):
+        return self.resolve(name) is not None
+
+    def __len__(self):
+        return len(self.rows)
+
+def unknown_name(kind, name, index):
+    """Poruka za ime koje nije nađeno, sa prijedlozima ako postoje."""
+    msg = f"Nepoznata {kind} '{name}'"
+    suggestions = index.suggest(name)
+    if suggestions:
+        msg += f" (da li ste mislili: {', '.join(suggestions)}?)"
+    return msg
+
+def load_persons():
+    with open_csv_checked(FILE_PERSONS) as f:
+        return NameIndex(csv.DictReader(f, quotechar='"'), 'firstName_lastName')
+
+def transform_event(termin, tipovi, prostorije, osobe):
     tip = tipovi.get(termin['tip'], {"title": "Nastava", "color": "8", "label": "INFO"})
     attendees = []
 
     # Sale
-    lista_sala = termin.get('prostorije', [])
+    # tt2cal upisuje 'prostorija', stariji JSON-ovi 'prostorije'
+    lista_sala = termin.get('prostorije', termin.get('prostorija', []))
     if isinstance(lista_sala, str): lista_sala = [lista_sala]
     for sala_naziv in lista_sala:
-        sala_id = prostorije.get(sala_naziv)
-        if sala_id: attendees.append({'email': sala_id, 'resource': True})
+        sala = prostorije.get(sala_naziv)
+        if sala and sala.get('google_id'): attendees.append({'email': sala['google_id'], 'resource': True})
 
     location_str = ", ".join(lista_sala)
 
@@ -76,8 +266,9 @@ def transform_event(termin, tipovi, prostorije, osobe_map):
     if termin.get('dodatne_osobe'):
         for osoba_input in termin['dodatne_osobe']:
             osoba_input = osoba_input.strip()
-            if osoba_input in osobe_map:
-                attendees.append({'email': osobe_map[osoba_input]['google_id']})
+            osoba = osobe.get(osoba_input)
+            if osoba:
+                attendees.append({'email': osoba['google_id']})
             elif "@" in osoba_input:
                 attendees.append({'email': osoba_input})
 
@@ -136,11 +327,394 @@ def transform_event(termin, tipovi, prostorije, osobe_map):
                 ev['recurrence'].append(f"EXDATE;VALUE=DATE:{','.join(exdates)}")
     return ev
 
+# --- STANJE ZADNJE SINHRONIZACIJE ---
+
+def state_path(calendar_name):
+    """Putanja do fajla sa stanjem zadnje sinhronizacije za dati kalendar."""
+    safe_name = re.sub(r'[^\w.-]+', '_', calendar_name)
+    return os.path.join(STATE_DIR, f"sync.{safe_name}.json")
+
+def load_state(calendar_name):
+    path = state_path(calendar_name)
+    if not os.path.exists(path): return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_state(calendar_name, state):
+    if not os.path.exists(STATE_DIR): os.makedirs(STATE_DIR)
+    path = state_path(calendar_name)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(path + '.tmp', path)
+
+def termin_fingerprint(termin):
+    """Stabilan otisak (hash) jednog termina iz JSON-a."""
+    raw = json.dumps(termin, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def termin_schedule(termin):
+    """Minimalni podaci o terminu potrebni za računanje sljedećeg pojavljivanja."""
+    return {'datum': termin['datum'], 'ponavljanje': termin.get('ponavljanje')}
+
+# --- PRIORITETNI RED ---
+
+def next_occurrence(termin, today):
+    """Vraća datum prvog pojavljivanja termina na ili nakon `today` (None ako su sva prošla)."""
+    first = date.fromisoformat(termin['datum'])
+    rec = termin.get('ponavljanje')
+    if first >= today or not rec:
+        return first if first >= today else None
+
+    step = FREQ_DAYS.get(rec.get('frekvencija'))
+    if not step: return None
+    step *= max(int(rec.get('interval') or 1), 1)
+
+    k = -(-(today - first).days // step) # ceil
+    candidate = first + timedelta(days=k * step)
+    until = date.fromisoformat(rec['datum_kraj']) if rec.get('datum_kraj') else None
+    exdates = {str(d).replace('-', '') for d in rec.get('izuzeci') or []}
+    while until is None or candidate <= until:
+        if candidate.strftime('%Y%m%d') not in exdates:
+            return candidate
+        candidate += timedelta(days=step)
+    return None
+
+def pending_changes(termini, previous):
+    """Razlika između trenutnih termina i zadnje sinhronizovanog stanja osobe.
+
+    Vraća (trenutno_stanje, promjene) gdje su promjene rasporedi (datum + ponavljanje)
+    dodanih i uklonjenih termina. Bez prethodnog stanja svi termini su promjene.
+    Termini čiji upis nije uspio (označeni sa 'pending') se i dalje broje kao promjene."""
+    current = {termin_fingerprint(t): termin_schedule(t) for t in termini}
+    changes = [sched for fp, sched in current.items()
+               if fp not in previous or previous[fp].get('pending')]
+    changes.extend(sched for fp, sched in previous.items() if fp not in current)
+    return current, changes
+
+def sync_priority(changes, today):
+    """Ključ za sortiranje: najraniji pogođeni termin prvi, pa veći skup promjena."""
+    upcoming = [d for d in (next_occurrence(c, today) for c in changes) if d]
+    days_until = (min(upcoming) - today).days if upcoming else float('inf')
+    return (days_until, -len(changes))
+
+def record_inserted(current_state, fp, response):
+    """Bilježi ID upisanog događaja u stanje osobe."""
+    entry = current_state.setdefault(fp, {})
+    entry['id'] = response['id']
+    entry.pop('etag', None)     # ranije verzije su pamtile i etag
+    entry.pop('pending', None)
+
+def record_failed(current_state, fp):
+    """Označava termin čiji upis nije uspio; ostaje promjena dok ga
+    --replay-failures ili sljedeća sinhronizacija ne upišu."""
+    current_state.setdefault(fp, {})['pending'] = True
+
+def insert_termini(service, target_id, termini, types, rooms, persons, current_state,
+                   dead_letters=None, origin=None):
+    """Upisuje termine u kalendar i bilježi ID upisanih događaja u current_state.
+
+    Svaki događaj nosi svoj otisak u extendedProperties.private, što omogućava
+    kasniju verifikaciju bez poređenja punog sadržaja. Neuspjeli upisi idu u
+    dead_letters (origin su podaci o osobi i kalendaru) i u current_state se
+    označavaju kao 'pending'."""
+    requests, fps = [], {}
+    for i, t in enumerate(termini):
+        fp = termin_fingerprint(t)
+        body = transform_event(t, types, rooms, persons)
+        body['extendedProperties'] = {'private': {FP_PROPERTY: fp}}
+        record = dict(origin or {}, operacija='insert', fp=fp, body=body)
+        requests.append((str(i), service.events().insert(calendarId=target_id, body=body), record))
+        fps[str(i)] = fp
+
+    for request_id, (response, exception) in execute_batched(service, requests, dead_letters).items():
+        if exception is None and response:
+            record_inserted(current_state, fps[request_id], response)
+        else:
+            record_failed(current_state, fps[request_id])
+    return current_state
+
+def delete_events(service, target_id, events, dead_letters=None, origin=None):
+    """Briše date događaje (liste sa 'id' ključem) u batch-evima."""
+    execute_batched(service, [
+        (ev['id'], service.events().delete(calendarId=target_id, eventId=ev['id']),
+         dict(origin or {}, operacija='delete', event_id=ev['id']))
+        for ev in events], dead_letters)
+
+# --- DEAD-LETTER RED (neuspjeli zahtjevi) ---
+
+def dead_letter_path(calendar_name):
+    safe_name = re.sub(r'[^\w.-]+', '_', calendar_name)
+    return os.path.join(STATE_DIR, f"failed.{safe_name}.jsonl")
+
+def append_dead_letters(calendar_name, records):
+    """Dodaje neuspjele zahtjeve (jedan JSON po liniji) u dead-letter fajl kalendara."""
+    if not records: return
+    if not os.path.exists(STATE_DIR): os.makedirs(STATE_DIR)
+    with open(dead_letter_path(calendar_name), 'a', encoding='utf-8') as f:
+        for r in records:
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    logging.warning(f"   {len(records)} neuspjelih zahtjeva sačuvano za --replay-failures.")
+
+def load_dead_letters(calendar_name):
+    path = dead_letter_path(calendar_name)
+    if not os.path.exists(path): return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def drop_dead_letters(calendar_name, google_id, target_id):
+    """Uklanja zapise jedne osobe i ciljnog kalendara iz dead-letter fajla
+    (nakon pune sinhronizacije oni više ne važe)."""
+    records = load_dead_letters(calendar_name)
+    kept = [r for r in records if (r.get('google_id'), r.get('kalendar')) != (google_id, target_id)]
+    if len(kept) == len(records): return 0
+    path = dead_letter_path(calendar_name)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        for r in kept:
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    os.replace(path + '.tmp', path)
+    return len(records) - len(kept)
+
+def replay_failures(args):
+    """Ponovo šalje samo sačuvane neuspjele zahtjeve, grupisane po osobi i kalendaru."""
+    logger = setup_logging(f"replay.{args.calendar}")
+    records = load_dead_letters(args.calendar)
+    if not records:
+        logger.info(f"Nema neuspjelih zahtjeva za kalendar '{args.calendar}'.")
+        return
+
+    by_target = {}
+    for r in records:
+        by_target.setdefault((r['google_id'], r['kalendar']), []).append(r)
+    logger.info(f"Ponavljanje {len(records)} neuspjelih zahtjeva za {len(by_target)} kalendara...")
+
+    state = load_state(args.calendar)
+    remaining = []
+    for (gid, target_id), items in by_target.items():
+        logger.info(f"Replay: {items[0].get('osoba', gid)} ({len(items)} zahtjeva)")
+        if args.dry_run:
+            for r in items:
+                logger.info(f"   [DRY-RUN] {r['operacija']} {r.get('event_id') or r['body']['summary']} - {r['greska']}")
+            remaining.extend(items)
+            continue
+        try:
+            service = calendar_service(gid)
+            requests = []
+            for i, r in enumerate(items):
+                base = {k: v for k, v in r.items() if k not in ('greska', 'vrijeme')}
+                if r['operacija'] == 'insert':
+                    req = service.events().insert(calendarId=target_id, body=r['body'])
+                else:
+                    req = service.events().delete(calendarId=target_id, eventId=r['event_id'])
+                requests.append((str(i), req, base))
+
+            results = execute_batched(service, requests, remaining)
+            person_state = state.setdefault(gid, {})
+            for i, r in enumerate(items):
+                response, exception = results[str(i)]
+                if exception is None and r['operacija'] == 'insert' and response:
+                    record_inserted(person_state, r['fp'], response)
+        except Exception as e:
+            logger.error(f"   Greska za {gid}: {e}")
+            remaining.extend(items)
+
+    if args.dry_run: return
+    os.remove(dead_letter_path(args.calendar))
+    append_dead_letters(args.calendar, remaining)
+    save_state(args.calendar, state)
+    logger.info(f"Uspješno ponovljeno: {len(records) - len(remaining)}, i dalje neuspješno: {len(remaining)}")
+
+# --- VERIFIKACIJA ---
+
+def list_remote_events(service, target_id):
+    """Lista događaja u kalendaru sa minimalnim skupom polja (VERIFY_FIELDS).
+    Vremena se traže u zoni Europe/Sarajevo (kao u upisanim događajima), pa se
+    porede i kad je kalendar kreiran u drugoj zoni."""
+    items, page_token = [], None
+    while True:
+        res = service.events().list(calendarId=target_id, pageToken=page_token,
+                                    fields=VERIFY_FIELDS, timeZone='Europe/Sarajevo').execute()
+        items.extend(res.get('items', []))
+        page_token = res.get('nextPageToken')
+        if not page_token: return items
+
+def compare_remote(expected, remote):
+    """Poredi očekivane termine (fp -> tijelo događaja) sa stanjem na Google-u.
+
+    Događaj je izmijenjen (drift) ako se naslov, vrijeme, lokacija ili opis
+    razlikuju od očekivanog tijela. Etag se ne koristi: Google ga mijenja i kad
+    prostorija (resource attendee) odgovori na poziv.
+    Vraća (nedostaju, višak, izmijenjeni) - prvi je lista otisaka, ostali liste događaja."""
+    extra, drifted, seen = [], [], set()
+    for ev in remote:
+        fp = ev.get('extendedProperties', {}).get('private', {}).get(FP_PROPERTY)
+        if fp not in expected or fp in seen:
+            extra.append(ev)
+            continue
+        seen.add(fp)
+
+        body = expected[fp]
+        if (ev.get('summary', '') != body['summary']
+                or ev.get('location', '') != body['location']
+                or ev.get('description', '') != body['description']
+                or ev.get('start', {}).get('dateTime', '')[:19] != body['start']['dateTime']
+                or ev.get('end', {}).get('dateTime', '')[:19] != body['end']['dateTime']):
+            drifted.append(ev)
+
+    missing = [fp for fp in expected if fp not in seen]
+    return missing, extra, drifted
+
+def verify_person(ime_prezime, user_google_id, target_id, load_termini, ctx, previous, repair):
+    """Verifikuje (i opcionalno popravlja) kalendar jedne osobe.
+    Vraća (nedostaju, višak, izmijenjeni, novo_stanje ili None, neuspjeli_zahtjevi)."""
+    types, rooms, persons = ctx
+    by_fp = {termin_fingerprint(t): t for t in load_termini()}
+    expected = {fp: transform_event(t, types, rooms, persons) for fp, t in by_fp.items()}
+
+    service = calendar_service(user_google_id)
+    remote = list_remote_events(service, target_id)
+    missing, extra, drifted = compare_remote(expected, remote)
+    logging.info(f"Verifikacija: {ime_prezime} - nedostaje {len(missing)}, višak {len(extra)}, izmijenjeno {len(drifted)}")
+
+    if not repair or not (missing or extra or drifted):
+        return missing, extra, drifted, None, []
+
+    # Popravka: brišu se samo suvišni i izmijenjeni, upisuju samo nedostajući i izmijenjeni
+    dead_letters = []
+    origin = {'osoba': ime_prezime, 'google_id': user_google_id, 'kalendar': target_id}
+    delete_events(service, target_id, extra + drifted, dead_letters, origin)
+    rewrite = missing + [ev['extendedProperties']['private'][FP_PROPERTY] for ev in drifted]
+    new_state = {fp: dict(previous.get(fp) or termin_schedule(by_fp[fp])) for fp in by_fp}
+    insert_termini(service, target_id, [by_fp[fp] for fp in rewrite], types, rooms, persons,
+                   new_state, dead_letters, origin)
+    return missing, extra, drifted, new_state, dead_letters
+
+def verify_calendar(args):
+    """Poredi stanje na Google-u sa lokalnim terminima paralelno po osobama."""
+    logger = setup_logging(f"verify.{args.calendar or 'meta'}")
+    persons = load_persons()
+    rooms, types = load_rooms_and_types()
+    sources = load_events(args, logger)
+    grouped = group_by_person(sources, persons, logger, args.person)
+
+    with open(FILE_CALENDARS, mode='r', encoding='utf-8') as f:
+        cal_map = {row['google_id']: row for row in csv.DictReader(f, quotechar='"')}
+
+    state = load_state(args.calendar)
+    jobs = {}
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        for ime_prezime, load_termini in grouped.items():
+            gid = persons[ime_prezime]['google_id']
+            target_id = cal_map.get(gid, {}).get(args.calendar, '').strip()
+            if not target_id:
+                logger.warning(f"Verifikacija: {ime_prezime} nema kalendar '{args.calendar}'")
+                continue
+            jobs[gid] = pool.submit(verify_person, ime_prezime, gid, target_id, load_termini,
+                                    (types, rooms, persons), state.get(gid, {}), args.repair)
+
+    totals = [0, 0, 0]
+    for gid, job in jobs.items():
+        try:
+            missing, extra, drifted, new_state, dead_letters = job.result()
+        except Exception as e:
+            logger.error(f"   Greska pri verifikaciji za {gid}: {e}")
+            continue
+        for i, n in enumerate((missing, extra, drifted)): totals[i] += len(n)
+        if new_state is not None: state[gid] = new_state
+        append_dead_letters(args.calendar, dead_letters)
+
+    logger.info(f"Ukupno: nedostaje {totals[0]}, višak {totals[1]}, izmijenjeno {totals[2]}")
+    if args.repair: save_state(args.calendar, state)
+
+def load_rooms_and_types():
+    with open(FILE_ROOMS, encoding='utf-8') as f:
+        rooms = NameIndex((row for row in csv.DictReader(f, quotechar='"') if not (row.get('room') or '').startswith('//')), 'room')
+    with open(FILE_TYPES, encoding='utf-8') as f:
+        types = {row['mark']: row for row in csv.DictReader(f, quotechar='"')}
+    return rooms, types
+
+def load_events(args, logger):
+    """Učitava termine iz data/ direktorija; naziv kalendara može doći iz metapodataka.
+
+    Podržani ulazi (izlazi tt2cal.py --json-format):
+        fajl.json   - {"meta": ..., "events": [...]} ili samo lista termina
+        fajl.ndjson - meta-podaci u prvoj liniji, zatim jedan termin po liniji
+        direktorij  - index.json + jedan fajl po osobi (učitava se tek kad zatreba)
+
+    Vraća rječnik osoba (iz JSON-a) -> funkcija koja vraća listu njenih termina."""
+    json_path = os.path.join(JSON_DIR, args.events)
+    if not os.path.exists(json_path):
+        logger.error(f"GRESKA: Fajl sa dogadjajima nije pronadjen: {json_path}")
+        sys.exit(1)
+
+    meta, sources = {}, {}
+    if os.path.isdir(json_path):
+        with open(os.path.join(json_path, 'index.json'), 'rb') as f:
+            index = json_loads(f.read())
+        meta = index.get('meta', {})
+        for osoba, shard in index['shards'].items():
+            shard_path = os.path.join(json_path, shard['file'])
+            sources[osoba] = lambda p=shard_path: load_shard(p)
+    else:
+        if json_path.endswith('.ndjson'):
+            events_data = []
+            with open(json_path, 'rb') as f:
+                for line in f:
+                    if not line.strip(): continue
+                    item = json_loads(line)
+                    if 'meta' in item and 'osoba' not in item: meta = item['meta']
+                    else: events_data.append(item)
+        else:
+            with open(json_path, 'rb') as f:
+                loaded = json_loads(f.read())
+            if isinstance(loaded, dict) and 'events' in loaded:
+                events_data, meta = loaded['events'], loaded.get('meta', {})
+            else:
+                events_data = loaded
+
+        by_osoba = {}
+        for t in events_data:
+            by_osoba.setdefault(t['osoba'], []).append(t)
+        sources = {osoba: (lambda lst=lst: lst) for osoba, lst in by_osoba.items()}
+
+    if not args.calendar and meta.get('calendar_name'):
+         args.calendar = meta['calendar_name']
+         logger.info(f"Koristim naziv kalendara iz metapodataka: {args.calendar}")
+
+    if not args.calendar:
+        logger.error("Kalendar nije specificiran (ni preko CLI, ni u JSON meta).")
+        sys.exit(1)
+    return sources
+
+def load_shard(path):
+    with open(path, 'rb') as f:
+        return json_loads(f.read())
+
+def group_by_person(sources, persons, logger, only=None):
+    """Grupiše izvore termina po osobi (ključ je firstName_lastName iz person.csv).
+    Ako je dat `only`, zadržava samo navedene osobe (po imenu ili emailu).
+
+    Vraća rječnik osoba -> funkcija koja učitava sve termine te osobe."""
+    grouped = {}
+    for osoba, loader in sources.items():
+        # Ime iz tt2cal-a (npr. 'VedranLjubović'), alias ili email
+        key = persons.resolve(osoba)
+        if key is None:
+            logger.warning(f"Preskačem događaje: {unknown_name('osoba', osoba.strip(), persons)} (nije nađena u person.csv ni po imenu ni po ID-u)")
+            continue
+
+        grouped.setdefault(key, []).append(loader)
+
+    if only:
+        wanted = {persons.resolve(o) or o.strip() for o in only}
+        grouped = {k: v for k, v in grouped.items() if k in wanted}
+    return {k: (lambda loaders=loaders: [t for load in loaders for t in load()])
+            for k, loaders in grouped.items()}
+
 def sync_category(args):
     logger = setup_logging(args.calendar)
 
     # Učitavanje CSV podataka
-    persons = load_csv_to_dict(FILE_PERSONS, 'firstName_lastName')
+    persons = load_persons()
 
     # Za delete mode nam ne trebaju rooms/types ni events.json nužno, ali učitavamo persons i calendars
     with open(FILE_CALENDARS, mode='r', encoding='utf-8') as f:
@@ -173,9 +747,7 @@ def sync_category(args):
                 continue
 
             try:
-                creds = service_account.Credentials.from_service_account_file(
-                    SERVICE_ACCOUNT_FILE, scopes=SCOPES, subject=user_google_id)
-                service = build('calendar', 'v3', credentials=creds)
+                service = calendar_service(user_google_id)
 
                 service.calendars().delete(calendarId=cal_id).execute()
                 # row[args.calendar] = '' -> Ne samo prazniti, nego ćemo ukloniti kolonu skroz kasnije
@@ -201,59 +773,41 @@ def sync_category(args):
 
         return # Kraj za delete mode
     # --- Nastavak standardne sync logike ---
-    rooms = {row['room']: row['google_id'] for row in csv.DictReader(open(FILE_ROOMS, encoding='utf-8'), quotechar='"') if row.get('room') and not row['room'].startswith('//')}
-    types = {row['mark']: row for row in csv.DictReader(open(FILE_TYPES, encoding='utf-8'), quotechar='"')}
+    rooms, types = load_rooms_and_types()
 
     with open(FILE_CALENDARS, mode='r', encoding='utf-8') as f:
         reader = csv.DictReader(f, quotechar='"')
         cal_rows = list(reader)
         fieldnames = reader.fieldnames
 
+    sources = load_events(args, logger)
     if args.calendar not in fieldnames:
         fieldnames.append(args.calendar)
 
-    json_path = os.path.join(JSON_DIR, args.events)
-    if not os.path.exists(json_path):
-        logger.error(f"GRESKA: Fajl sa dogadjajima nije pronadjen: {json_path}")
-        sys.exit(1)
-
-    with open(json_path, 'r', encoding='utf-8') as f:
-        loaded = json.load(f)
-
-    if isinstance(loaded, dict) and 'events' in loaded:
-        events_data = loaded['events']
-        if not args.calendar and loaded.get('meta', {}).get('calendar_name'):
-             args.calendar = loaded['meta']['calendar_name']
-             logger.info(f"Koristim naziv kalendara iz metapodataka: {args.calendar}")
-    else:
-        events_data = loaded
-
-    if not args.calendar:
-        logger.error("Kalendar nije specificiran (ni preko CLI, ni u JSON meta).")
-        sys.exit(1)
-
-    # Mapa email -> Ime za lookup po Google ID-u
-    email_to_name = {v['google_id']: k for k, v in persons.items()}
-
-    grouped = {}
-    for t in events_data:
-        raw_osoba = t['osoba'].strip()
-        # Pokušaj naći po imenu
-        if raw_osoba in persons:
-            key = raw_osoba
-        # Pokušaj naći po emailu
-        elif raw_osoba in email_to_name:
-            key = email_to_name[raw_osoba]
-        else:
-            logger.warning(f"Preskačem događaj: Nepoznata osoba '{raw_osoba}' (nije nađena u person.csv ni po imenu ni po ID-u)")
-            continue
-
-        grouped.setdefault(key, []).append(t)
+    grouped = group_by_person(sources, persons, logger, args.person)
 
     # Indeksiramo postojeće unose u person_calendars.csv radi bržeg pristupa
     cal_map = {row['google_id']: row for row in cal_rows}
 
-    for ime_prezime, lista_termina in grouped.items():
+    # Prioritetni red: osobe čiji se najskoriji termin mijenja idu prve, osobe
+    # bez promjena se preskaču (osim uz --full). Termini se učitavaju po osobi
+    # i ne drže se u memoriji između koraka; čuvaju se samo otisci.
+    state = load_state(args.calendar)
+    today = date.today()
+    queue, skipped = [], 0
+    for ime_prezime, load_termini in grouped.items():
+        gid = persons[ime_prezime]['google_id']
+        current_state, changes = pending_changes(load_termini(), state.get(gid, {}))
+        if not changes and not args.full:
+            skipped += 1
+            continue
+        queue.append((sync_priority(changes, today), ime_prezime, len(changes), current_state))
+    queue.sort(key=lambda q: (q[0], q[1]))
+    if skipped:
+        logger.info(f"Preskočeno osoba bez promjena: {skipped} (--full za punu sinhronizaciju).")
+
+    for (days_until, _), ime_prezime, n_changes, current_state in queue:
+        lista_termina = grouped[ime_prezime]()
         # ime_prezime je sigurno u persons jer smo gore filtrirali
         user_google_id = persons[ime_prezime]['google_id']
 
@@ -265,7 +819,8 @@ def sync_category(args):
 
         row = cal_map[user_google_id]
 
-        logger.info(f"Sync: {ime_prezime}")
+        hitnost = f"za {days_until} d." if days_until != float('inf') else "bez nadolazećih"
+        logger.info(f"Sync: {ime_prezime} (promjena: {n_changes}, {hitnost})")
         if args.dry_run:
             logger.info(f"   [DRY-RUN] Pronađeno {len(lista_termina)} događaja za obradu:")
             for t in lista_termina:
@@ -278,9 +833,7 @@ def sync_category(args):
             continue
 
         try:
-            creds = service_account.Credentials.from_service_account_file(
-                SERVICE_ACCOUNT_FILE, scopes=SCOPES, subject=user_google_id)
-            service = build('calendar', 'v3', credentials=creds)
+            service = calendar_service(user_google_id)
 
             target_id = row.get(args.calendar, '').strip()
             if not target_id:
@@ -299,30 +852,27 @@ def sync_category(args):
                 page_token = events_res.get('nextPageToken')
                 if not page_token: break
 
+            dead_letters = []
+            origin = {'osoba': ime_prezime, 'google_id': user_google_id, 'kalendar': target_id}
             if all_events_to_delete:
                 logger.info(f"   Brisanje {len(all_events_to_delete)} starih događaja...")
-                for i in range(0, len(all_events_to_delete), 50):
-                    chunk = all_events_to_delete[i:i+50]
-                    batch_del = service.new_batch_http_request(callback=batch_callback)
-                    for ev in chunk:
-                        batch_del.add(service.events().delete(calendarId=target_id, eventId=ev['id']))
-                    batch_del.execute()
+                delete_events(service, target_id, all_events_to_delete, dead_letters, origin)
             else:
                 logger.info("   Nema starih događaja za brisanje.")
 
-            # 2. Batch Insert (u paketima po 50)
-            # lista_termina je već dostupna iz outer loop-a
-            for i in range(0, len(lista_termina), 50):
-                chunk = lista_termina[i:i+50]
-                batch = service.new_batch_http_request(callback=batch_callback)
-
-                for t in chunk:
-                    body = transform_event(t, types, rooms, persons)
-                    batch.add(service.events().insert(calendarId=target_id, body=body))
+            # 2. Batch Insert (u paketima po BATCH_SIZE), bilježi ID upisanih
+            insert_termini(service, target_id, lista_termina, types, rooms, persons,
+                           current_state, dead_letters, origin)
 
-                batch.execute()
+            # Kalendar je ispražnjen i ponovo upisan: raniji neuspjeli zahtjevi
+            # za njega više ne važe (replay bi upisao duplikate)
+            dropped = drop_dead_letters(args.calendar, user_google_id, target_id)
+            if dropped:
+                logger.info(f"   Uklonjeno {dropped} zastarjelih neuspjelih zahtjeva.")
+            append_dead_letters(args.calendar, dead_letters)
 
             logger.info(f"   Sinhronizovano: {len(lista_termina)} dogadjaja preko Batch API-ja.")
+            state[user_google_id] = current_state
 
         except Exception as e:
             logger.error(f"   Greska za {user_google_id}: {e}")
@@ -332,17 +882,24 @@ def sync_category(args):
             writer = csv.DictWriter(f, fieldnames=fieldnames, quotechar='"', quoting=csv.QUOTE_MINIMAL)
             writer.writeheader()
             writer.writerows(cal_rows)
+        save_state(args.calendar, state)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument('--calendar', required=False, help="Naziv kalendara (kolona u CSV-u).")
-    parser.add_argument('--events', required=False, help="JSON fajl sa događajima.")
+    parser.add_argument('--events', required=False, help="JSON/NDJSON fajl ili direktorij sa fajlom po osobi (tt2cal --json-format shards).")
+    parser.add_argument('--person', action='append', help="Sinhronizuj samo navedenu osobu (ime ili email, može se ponoviti).")
     parser.add_argument('--dry-run', action='store_true')
+    parser.add_argument('--full', action='store_true', help="Sinhronizuj i osobe bez promjena od zadnje sinhronizacije (puna ponovna sinhronizacija).")
     parser.add_argument('--delete-calendar', action='store_true', help="Trajno briše navedeni kalendar za sve korisnike.")
     parser.add_argument('--force', action='store_true', help="Preskace sigurnosnu provjeru za brisanje (koristiti oprezno).")
     parser.add_argument('--list-calendars', action='store_true', help="Izlistava sve aktivne kalendare u CSV fajlu.")
     parser.add_argument('--verbose', action='store_true', help="Prikazuje detaljne informacije (npr. listu korisnika uz --list-calendars).")
     parser.add_argument('--init', action='store_true', help="Inicijalizuje strukturu direktorija i prazne CSV fajlove.")
+    parser.add_argument('--verify', action='store_true', help="Poredi događaje na Google-u sa lokalnim terminima (nedostaju, višak, izmijenjeni).")
+    parser.add_argument('--repair', action='store_true', help="Uz --verify: ponovo upisuje samo neispravne događaje.")
+    parser.add_argument('--replay-failures', action='store_true', help="Ponovo šalje samo zahtjeve koji su ranije bili neuspješni (state/failed.*.jsonl).")
+    parser.add_argument('--workers', type=int, default=4, help="Broj paralelnih korisnika pri verifikaciji (default: 4).")
 
     if len(sys.argv) == 1:
         parser.print_help(sys.stderr)
@@ -355,7 +912,7 @@ if __name__ == "__main__":
         print("--- Inicijalizacija GWS Sync Projekta ---")
 
         # 1. Kreiranje direktorija
-        dirs_to_create = [CSV_DIR, LOG_DIR, AUTH_DIR, JSON_DIR]
+        dirs_to_create = [CSV_DIR, LOG_DIR, AUTH_DIR, JSON_DIR, STATE_DIR]
         for d in dirs_to_create:
             if not os.path.exists(d):
                 os.makedirs(d)
@@ -414,12 +971,11 @@ if __name__ == "__main__":
             print(f"Pronađeno {len(target_calendars)} kalendara:")
 
             # Učitavamo i imena ljudi radi ljepšeg ispisa
-            persons = {}
-            if show_details:
+            persons = NameIndex([], 'firstName_lastName')
+            if show_details and os.path.exists(FILE_PERSONS):
                 try:
-                    persons = load_csv_to_dict(FILE_PERSONS, 'google_id') # Učitaj mapu po Google ID-u
-                    # persons je sad: {'email': {firstName_lastName: '...', ...}}
-                except:
+                    persons = load_persons() # Indeks pokriva i lookup po Google ID-u
+                except Exception:
                     pass # Ako faila person.csv, prikazaćemo samo emailove
 
             for cal in target_calendars:
@@ -430,12 +986,7 @@ if __name__ == "__main__":
                     for i, u in enumerate(active_users, 1):
                         gid = u['google_id']
                         # Pokušaj naći ime
-                        ime = "Nepoznato ime"
-                        if gid in persons:
-                            ime = persons[gid].get('firstName_lastName', ime)
-                        elif persons: # Ako imamo persons dict ali nismo našli po ID, probaj naći po value['google_id'] (sporije)
-                             found = next((v['firstName_lastName'] for k, v in persons.items() if v['google_id'] == gid), None)
-                             if found: ime = found
+                        ime = persons.resolve(gid) or "Nepoznato ime"
 
                         print(f"   {i}. {ime} ({gid})")
 
@@ -452,8 +1003,20 @@ if __name__ == "__main__":
         logging.error("GRESKA: Naziv kalendara ne smije sadržavati zarez (',') jer to narušava CSV format.")
         sys.exit(1)
 
-    # Ako nije delete mode, events je obavezan
+    if args.replay_failures:
+        if not args.calendar:
+            parser.error("Argument --calendar je obavezan za --replay-failures.")
+        replay_failures(args)
+        sys.exit(0)
+
+    # Ako nije delete mode (ili replay), events je obavezan
     if not args.delete_calendar and not args.events:
         parser.error("Argument --events je obavezan osim ako se koristi --delete-calendar")
 
+    if args.verify:
+        if not args.events:
+            parser.error("Argument --events je obavezan za --verify.")
+        verify_calendar(args)
+        sys.exit(0)
+
     sync_category(args)
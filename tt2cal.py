@@ -16,23 +16,31 @@ Autor: Ernedin Zajko <ezajko@root.ba>
 
 import argparse
 import json
+import os
 import re
 import signal
 import sys
+import time
 from datetime import datetime, timedelta
 
+from ras2cal.batch import load_manifest, run_batch
 from ras2cal.compiler import ScheduleCompiler
+from ras2cal.conflicts import find_conflicts
 from ras2cal.exporter import Exporter
 from ras2cal.generators import (
+    JSON_FORMATS,
     GridGenerator,
     HTMLScheduleGenerator,
     JSONScheduleGenerator,
     MarkdownReportGenerator,
+    write_json_output,
 )
-from ras2cal.lexer import Lexer
+from ras2cal.loader import default_cache_dir, load_schedule
 from ras2cal.models import LectureType
-from ras2cal.parser import Parser
-from ras2cal.utils import filter_schedule, load_source_recursive
+from ras2cal.occupancy import KINDS as OCCUPANCY_KINDS
+from ras2cal.occupancy import OccupancyIndex, format_interval
+from ras2cal.occurrences import OccurrenceTable
+from ras2cal.query import AssignmentIndex, And, filters_query, parse_query
 
 # Omogucava cist izlaz pri pipe-anju (npr. | head, | grep)
 signal.signal(signal.SIGPIPE, signal.SIG_DFL)
@@ -66,25 +74,65 @@ def main():
 
     # Izlazni formati
     parser.add_argument("-j", "--json", help="Putanja za JSON izlaz")
+    parser.add_argument("--json-format", choices=JSON_FORMATS, default="pretty",
+                        help="Format JSON izlaza: pretty, compact, ndjson ili shards "
+                             "(direktorij sa fajlom po osobi, default: pretty)")
     parser.add_argument("-m", "--md", help="Putanja za Markdown izvjestaj")
     parser.add_argument("-w", "--html",
                         help="Direktorij za HTML izvjestaj (po nastavnicima/prostorima)")
     parser.add_argument("-g", "--grid",
                         help="Direktorij za tradicionalni grid HTML izvjestaj")
+    parser.add_argument("--grid-split", action="store_true",
+                        help="Uz -g zapisi i po jedan fajl za svakog nastavnika "
+                             "(nastavnici/) sa zajednickim grid.css")
     parser.add_argument("-e", "--export",
                         help="Direktorij za eksport refaktorisanog RAS koda")
+    parser.add_argument("--batch", metavar="MANIFEST",
+                        help="JSON manifest sa vise filtriranih pogleda (izlaza); "
+                             "raspored se kompajlira jednom (vidi tt2cal.md)")
 
     # Debug i inspekcija
     parser.add_argument("-s", "--stdout", action="store_true",
                         help="Ispisi JSON na standardni izlaz (stdout)")
     parser.add_argument("-a", "--ast", action="store_true",
                         help="Ispisi AST strukturu na stdout (za debug/inspekciju)")
+    parser.add_argument("--conflicts", action="store_true",
+                        help="Ispisi konflikte (dvostruko zauzeti nastavnici, "
+                             "prostorije, grupe) na stdout")
+    parser.add_argument("--on-date",
+                        help="Ispisi nastavu koja se odrzava na dati datum "
+                             "(YYYY-MM-DD ili DD.MM.YYYY) na stdout")
+
+    # Upiti nad zauzetoscu (bitset indeks)
+    parser.add_argument("--free-rooms", nargs=3, metavar=("DAN", "OD", "DO"),
+                        help="Ispisi prostorije slobodne svake sedmice u intervalu "
+                             "(npr. Ponedjeljak 10:00 12:00)")
+    parser.add_argument("--common-free", nargs="+", metavar="IME",
+                        help="Ispisi intervale u kojima su svi navedeni nastavnici, "
+                             "grupe ili prostorije slobodni")
+    parser.add_argument("--utilization", choices=OCCUPANCY_KINDS,
+                        help="Ispisi zauzetost prostorija, nastavnika ili grupa (%%)")
+
+    # Kes parsiranih fajlova
+    parser.add_argument("--cache-dir",
+                        help="Direktorij kesa parsiranih .ras fajlova "
+                             "(default: ~/.cache/tt2cal)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ne koristi kes; svaki fajl se parsira ponovo")
+    parser.add_argument("-J", "--jobs", type=int, default=1,
+                        help="Broj procesa za paralelno parsiranje uvezenih "
+                             "fajlova, generisanje --batch pogleda i grid "
+                             "sekcija (-g) "
+                             "(0 = broj jezgara, default: 1)")
 
     # Filteri za suzavanje izlaza
     parser.add_argument("--teacher", help="Filtriraj po nastavniku (regex)")
     parser.add_argument("--room", help="Filtriraj po prostoriji (regex)")
     parser.add_argument("--group", help="Filtriraj po grupi/odjeljenju (regex)")
     parser.add_argument("--subject", help="Filtriraj po predmetu (regex)")
+    parser.add_argument("--where", metavar="UPIT",
+                        help="Filtriraj izrazom upita, npr. "
+                             "'teacher:Vedran* AND NOT type:T' (vidi tt2cal.md)")
 
     # Konfiguracija semestra
     parser.add_argument("--semestar-start",
@@ -108,25 +156,25 @@ def main():
 
     # Provjera da je specificiran barem jedan izlazni format
     has_output = any([args.json, args.md, args.html, args.grid,
-                      args.stdout, args.ast, args.export])
+                      args.stdout, args.ast, args.export, args.conflicts,
+                      args.on_date, args.free_rooms, args.common_free,
+                      args.utilization, args.batch])
     if not has_output:
         parser.print_help(sys.stderr)
         print("\nGreska: nije specificiran izlazni format."
-              " Koristite -j, -m, -w, -g, -s, -a ili -e.", file=sys.stderr)
+              " Koristite -j, -m, -w, -g, -s, -a, -e, --batch, --conflicts, --on-date,"
+              " --free-rooms, --common-free ili --utilization.", file=sys.stderr)
         sys.exit(1)
 
     # -------------------------------------------------------------------
-    # 1. Ucitavanje izvornog koda
+    # 1-2. Ucitavanje izvora, leksicka i sintaksna analiza (-> AST)
     # -------------------------------------------------------------------
-    # load_source_recursive obraduje UVEZI direktive rekurzivno
-    full_text = load_source_recursive(args.input)
-
-    # -------------------------------------------------------------------
-    # 2. Leksicka i sintaksna analiza (Lexer -> Parser -> AST)
-    # -------------------------------------------------------------------
-    lexer = Lexer(full_text)
-    ast_parser = Parser(lexer.tokens)
-    ast = ast_parser.parse()
+    # load_schedule razrjesava UVEZI direktive i parsira svaki fajl zasebno
+    # (Lexer -> Parser -> parcijalni AST); nepromijenjeni fajlovi se citaju
+    # iz kesa (ostali paralelno uz -J), a parcijalni AST-ovi se spajaju
+    # redom importa.
+    cache_dir = None if args.no_cache else (args.cache_dir or default_cache_dir())
+    ast = load_schedule(args.input, cache_dir, args.jobs)
 
     # -------------------------------------------------------------------
     # 3. Razrjesavanje semesterskih parametara
@@ -182,9 +230,19 @@ def main():
         'subject': args.subject,
     }
     active_filters = {k: v for k, v in filters.items() if v}
+    clauses = []
     if active_filters:
-        ast = filter_schedule(ast, filters)
+        clauses.append(filters_query(filters))
         print(f"Primijenjeni filteri: {active_filters}", file=sys.stderr)
+    if args.where:
+        try:
+            clauses.append(parse_query(args.where))
+        except ValueError as e:
+            print(f"Greska u upitu: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Upit: {args.where}", file=sys.stderr)
+    if clauses:
+        ast = AssignmentIndex(ast).filter(And(tuple(clauses)))
 
     # -------------------------------------------------------------------
     # 5. Postavljanje konfiguracije na AST
@@ -239,24 +297,26 @@ def main():
     # 8. Generisanje izlaza
     # -------------------------------------------------------------------
 
+    meta = {
+        "calendar_name": semester_title,
+        "start": semester_start,
+        "end": semester_end,
+        "holidays": ast.holidays,
+    }
+
     # JSON
     if args.json or args.stdout:
         json_gen = JSONScheduleGenerator(ir_model)
         events = json_gen.generate()
 
         output_data = {
-            "meta": {
-                "calendar_name": semester_title,
-                "start": semester_start,
-                "end": semester_end,
-                "holidays": ast.holidays,
-            },
+            "meta": meta,
             "events": events,
         }
 
         if args.json:
-            with open(args.json, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=4, ensure_ascii=False)
+            write_json_output(args.json, output_data["meta"], events,
+                              args.json_format)
             if not args.stdout:
                 print(f"Generisan JSON: {args.json}", file=sys.stderr)
 
@@ -279,15 +339,83 @@ def main():
 
     # Grid HTML (tradicionalni tabelarni prikaz)
     if args.grid:
-        grid_gen = GridGenerator(ir_model, args.grid, title=semester_title)
+        grid_gen = GridGenerator(ir_model, args.grid, title=semester_title,
+                                 jobs=args.jobs, split=args.grid_split)
         grid_gen.generate()
         print(f"Generisan grid HTML: {args.grid}/", file=sys.stderr)
 
+    # Konflikti (nastavnici, prostorije, grupe)
+    if args.conflicts:
+        conflicts = find_conflicts(ir_model)
+        for conflict in conflicts:
+            print(conflict)
+        print(f"Pronađeno konflikata: {len(conflicts)}", file=sys.stderr)
+
+    # Nastava na dati datum (razvijeno ponavljanje, bez nenastavnih dana)
+    if args.on_date:
+        day = datetime.strptime(_resolve_date(args.on_date), "%Y-%m-%d").date()
+        occurrences = OccurrenceTable(ir_model).on(day)
+        note = " (nenastavni dan)" if day.strftime("%Y%m%d") in ir_model.holidays else ""
+        print(f"{day.strftime('%d.%m.%Y')}{note}: {len(occurrences)} termina")
+        for occ in occurrences:
+            print(occ)
+
+    # Upiti nad zauzetoscu (slobodne prostorije, zajednicki slobodni termini)
+    if args.free_rooms or args.common_free or args.utilization:
+        occupancy = OccupancyIndex(ir_model)
+
+        if args.free_rooms:
+            day_name, start, end = args.free_rooms
+            try:
+                rooms = occupancy.free_rooms(day_name, start, end)
+            except ValueError as e:
+                print(f"Greska: {e}", file=sys.stderr)
+                sys.exit(1)
+            print(f"Slobodne prostorije, {day_name} {start}-{end}: {len(rooms)}")
+            for name in rooms:
+                print(name)
+
+        if args.common_free:
+            try:
+                intervals = occupancy.common_free(args.common_free)
+            except KeyError as e:
+                print(f"Greska: nepoznat nastavnik, grupa ili prostorija: {e}",
+                      file=sys.stderr)
+                sys.exit(1)
+            print(f"Zajednicki slobodni termini ({', '.join(args.common_free)}):")
+            for interval in intervals:
+                print(format_interval(*interval))
+
+        if args.utilization:
+            for name, share in occupancy.utilization(args.utilization):
+                print(f"{share * 100:5.1f}%  {name}")
+
     # Eksport refaktorisanog RAS koda
     if args.export:
         exporter = Exporter(ast, args.export)
         exporter.export()
 
+    # -------------------------------------------------------------------
+    # 9. Batch: vise filtriranih pogleda iz istog IR modela
+    # -------------------------------------------------------------------
+    if args.batch:
+        index = AssignmentIndex(ast)
+        try:
+            with open(args.batch, encoding='utf-8') as f:
+                manifest = json.load(f)
+            views = load_manifest(manifest, index,
+                                  os.path.dirname(os.path.abspath(args.batch)))
+        except (OSError, ValueError) as e:
+            print(f"Greska u manifestu {args.batch}: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        start = time.perf_counter()
+        results = run_batch(views, ir_model, index, meta, semester_title, args.jobs)
+        for view, count, seconds in results:
+            print(f"Pogled {view.name}: {count} evenata ({seconds:.2f} s)", file=sys.stderr)
+        print(f"Generisano pogleda: {len(results)} za "
+              f"{time.perf_counter() - start:.2f} s", file=sys.stderr)
+
 
 # ---------------------------------------------------------------------------
 # Pomocne funkcije